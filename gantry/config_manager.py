@@ -9,13 +9,20 @@ legacy formats, and privacy profile management.
 import os
 import logging
 import copy
+import functools
 from typing import Dict, Any, List
 import json
 import re
 import yaml
+import numpy as np
 
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .profiles import PRIVACY_PROFILES
 
 CONFIG_VERSION = "2.0"
@@ -23,6 +30,63 @@ CONFIG_VERSION = "2.0"
 # Load environment variables
 load_dotenv()
 
+# libyaml-backed loader when PyYAML was built with it, pure-Python otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_default_phi_tags() -> Dict[str, Any]:
+    """Reads the packaged default PHI tags (resources/phi_tags.json). Cached: do not mutate."""
+    filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "phi_tags.json")
+    if not os.path.exists(filepath):
+        return {}
+    # Internal resources stay JSON; only user config files are YAML
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    return (orjson.loads(raw) if orjson is not None else json.loads(raw)).get("phi_tags", {})
+
+
+@functools.lru_cache(maxsize=32)
+def _load_custom_profile(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parses an external privacy profile. Keyed on mtime so edits are re-read. Cached: do not mutate."""
+    return ConfigLoader.load_phi_config(path)
+
+
+_ROI_NEGATIVE = "ROI values must be non-negative."
+_ROI_INVERTED = "Invalid ROI logic (Start > End)."
+
+# Zone count from which ROI value checks are vectorized with NumPy
+_ROI_VECTORIZE_MIN = 32
+
+
+def _first_invalid_roi(rois: List[list]):
+    """
+    Returns (zone_index, reason) for the first ROI [r1, r2, c1, c2] with a negative
+    value or start > end, or None if all are valid.
+    """
+    if len(rois) >= _ROI_VECTORIZE_MIN:
+        try:
+            arr = np.asarray(rois)
+        except (ValueError, TypeError):  # Ragged/nested entries
+            arr = None
+        # Non-numeric entries keep the scalar path (and its TypeError)
+        if arr is not None and arr.ndim == 2 and arr.dtype.kind in "iuf":
+            negative = (arr < 0).any(axis=1)
+            inverted = (arr[:, 0] > arr[:, 1]) | (arr[:, 2] > arr[:, 3])
+            bad = np.flatnonzero(negative | inverted)
+            if bad.size == 0:
+                return None
+            z_idx = int(bad[0])
+            return z_idx, _ROI_NEGATIVE if negative[z_idx] else _ROI_INVERTED
+
+    for z_idx, roi in enumerate(rois):
+        r1, r2, c1, c2 = roi
+        if any(x < 0 for x in roi):
+            return z_idx, _ROI_NEGATIVE
+        if r1 > r2 or c1 > c2:
+            return z_idx, _ROI_INVERTED
+    return None
+
 
 def get_logger() -> logging.Logger:
     """
@@ -54,7 +118,7 @@ def load_unified_config(path: str) -> Dict[str, Any]:
         raise ValueError("Configuration file must be a YAML file (.yaml or .yml)")
 
     with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=_YAML_LOADER)
 
     # Handle Standard Config
     config = data
@@ -74,7 +138,9 @@ def load_unified_config(path: str) -> Dict[str, Any]:
         elif os.path.exists(profile_name):
             try:
                 # We reuse load_phi_config logic to parse just the tags
-                profile_rules = ConfigLoader.load_phi_config(profile_name)
+                profile_path = os.path.abspath(profile_name)
+                profile_rules = copy.deepcopy(
+                    _load_custom_profile(profile_path, os.stat(profile_path).st_mtime_ns))
                 get_logger().info("Loaded custom privacy profile from '%s' with %d rules.", profile_name, len(profile_rules))
             except (ValueError, OSError) as e:
                 get_logger().error("Failed to load custom profile '%s': %s", profile_name, e)
@@ -192,21 +258,8 @@ class ConfigLoader:
                 return data["phi_tags"]
             return data.get("phi_tags", data)  # Fallback to assumes root dict is tags if no key
         else:
-            # Load default from package resources
-            base = os.path.dirname(os.path.abspath(__file__))
-            filepath = os.path.join(base, "resources", "phi_tags.json")
-            if os.path.exists(filepath):
-                # Resource is likely still JSON for internal defaults unless we change it too.
-                # But sticking to JSON for internal resources is fine, OR we change helper to handle both?
-                # User asked to drop JSON support for *config files*.
-                # Let's support JSON just for internal resources via simple json load if yaml fails or extension check?
-                # Actually, clearer to migrate the resource to YAML too?
-                # Or just use json.load here explicitly since it's internal.
-                # import json  <-- Removed
-
-                with open(filepath, 'r', encoding="utf-8") as f:
-                    return json.load(f).get("phi_tags", {})
-            return {}
+            # Packaged defaults are parsed once; callers get their own copy to mutate
+            return copy.deepcopy(_load_default_phi_tags())
 
     @staticmethod
     def clean_filename(filename: str) -> str:
@@ -228,7 +281,7 @@ class ConfigLoader:
 
         try:
             with open(filepath, 'r', encoding="utf-8") as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_YAML_LOADER)
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML format in {filepath}: {e}") from e
 
@@ -242,24 +295,29 @@ class ConfigLoader:
         if not isinstance(zones, list):
             raise ValueError(f"Rule #{index} ({sn}): 'redaction_zones' must be a list.")
 
+        # Shape checks are per zone; value checks run over all well-formed ROIs
+        # at once, up to the first malformed zone (errors keep zone order).
+        rois = []
+        shape_error = None
         for z_idx, zone in enumerate(zones):
             if isinstance(zone, list):
                 roi = zone
             elif isinstance(zone, dict):
                 roi = zone.get("roi")
             else:
-                raise ValueError(
+                shape_error = ValueError(
                     f"Rule #{index} ({sn}), Zone #{z_idx}: Invalid zone format (must be list or dict).")
+                break
 
             if not roi or not isinstance(roi, list) or len(roi) != 4:
-                raise ValueError(
+                shape_error = ValueError(
                     f"Rule #{index} ({sn}), Zone #{z_idx}: ROI must be a list of 4 integers.")
-
-            r1, r2, c1, c2 = roi
-            if any(x < 0 for x in roi):
-                raise ValueError(
-                    f"Rule #{index} ({sn}), Zone #{z_idx}: ROI values must be non-negative.")
-
-            if r1 > r2 or c1 > c2:
-                raise ValueError(
-                    f"Rule #{index} ({sn}), Zone #{z_idx}: Invalid ROI logic (Start > End).")
+                break
+            rois.append(roi)
+
+        bad = _first_invalid_roi(rois)
+        if bad is not None:
+            z_idx, reason = bad
+            raise ValueError(f"Rule #{index} ({sn}), Zone #{z_idx}: {reason}")
+        if shape_error is not None:
+            raise shape_error
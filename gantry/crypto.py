@@ -2,8 +2,79 @@
 Cryptography utilities for handling encryption keys and operations.
 """
 import os
-from typing import Optional
-from cryptography.fernet import Fernet
+import platform
+import functools
+from typing import Optional, Dict, Tuple
+from cryptography.fernet import Fernet, InvalidToken
+
+from .logger import get_logger
+
+try:
+    import rfernet  # Rust Fernet: same token format, far less per-call overhead
+except ImportError:
+    rfernet = None
+
+# (abspath, st_mtime_ns, st_size) -> key bytes, so reopening an unchanged key file skips the read
+_KEY_CACHE: Dict[Tuple[str, int, int], bytes] = {}
+
+
+def _remember_key(path: str, st: os.stat_result, key: bytes) -> None:
+    """Caches `key` for this version of the file, dropping entries for older versions."""
+    for stale in [k for k in _KEY_CACHE if k[0] == path]:
+        del _KEY_CACHE[stale]
+    _KEY_CACHE[(path, st.st_mtime_ns, st.st_size)] = key
+
+
+# OPENSSL_ia32cap bit (first capability word) advertising AES-NI to OpenSSL
+_IA32CAP_AESNI = 1 << 57
+
+
+def _aesni_masked_by_env() -> bool:
+    """True if OPENSSL_ia32cap tells OpenSSL to ignore the CPU's AES-NI support."""
+    value = os.environ.get("OPENSSL_ia32cap", "").split(":")[0].strip()
+    if not value:
+        return False
+    inverted = value.startswith("~")
+    try:
+        word = int(value.lstrip("~"), 0)
+    except ValueError:
+        return False
+    # "~mask" clears the masked bits; a bare value replaces the detected capabilities
+    return bool(word & _IA32CAP_AESNI) if inverted else not word & _IA32CAP_AESNI
+
+
+@functools.lru_cache(maxsize=1)
+def _check_aesni() -> bool:
+    """
+    Checks (once per process) that Fernet's AES-CBC step can use AES-NI on x86.
+
+    cryptography goes through OpenSSL's EVP interface, which picks AES-NI on its
+    own when the CPU has it; this only detects the cases where it can't. Logs a
+    warning rather than raising, since encryption is still correct, just slower.
+
+    Returns:
+        bool: False if AES-NI is known to be unavailable or disabled, else True.
+    """
+    if platform.machine().lower() not in ("x86_64", "amd64", "i386", "i686", "x86"):
+        return True  # Other architectures have their own AES paths in OpenSSL
+
+    if _aesni_masked_by_env():
+        get_logger().warning(
+            "OPENSSL_ia32cap disables AES-NI; Fernet encryption will use software AES.")
+        return False
+
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    if "aes" in line.split(":", 1)[1].split():
+                        return True
+                    get_logger().warning(
+                        "CPU does not report AES-NI; Fernet encryption will use software AES.")
+                    return False
+    except OSError:
+        pass  # Not Linux, or /proc unavailable: nothing to check against
+    return True
 
 
 class KeyManager:
@@ -20,21 +91,35 @@ class KeyManager:
         """
         self.key_path = os.path.abspath(key_path)
         self.key: Optional[bytes] = None
+        _check_aesni()
 
     def load_or_generate_key(self) -> bytes:
         """
         Loads the key from disk if it exists, otherwise generates a new one.
 
+        Keys are cached per file version (mtime and size), so reopening an
+        unchanged key file costs a stat() rather than a read.
+
         Returns:
             bytes: The URL-safe base64-encoded key.
         """
-        if os.path.exists(self.key_path):
-            with open(self.key_path, "rb") as f:
-                self.key = f.read()
+        try:
+            st = os.stat(self.key_path)
+        except FileNotFoundError:
+            st = None
+
+        if st is not None:
+            cache_key = (self.key_path, st.st_mtime_ns, st.st_size)
+            self.key = _KEY_CACHE.get(cache_key)
+            if self.key is None:
+                with open(self.key_path, "rb") as f:
+                    self.key = f.read()
+                _remember_key(self.key_path, st, self.key)
         else:
             self.key = Fernet.generate_key()
             with open(self.key_path, "wb") as f:
                 f.write(self.key)
+            _remember_key(self.key_path, os.stat(self.key_path), self.key)
         return self.key
 
     def get_key(self) -> bytes:
@@ -55,6 +140,9 @@ class KeyManager:
 class CryptoEngine:
     """
     Handles encryption and decryption of bytes using Fernet (AES-128-CBC w/ HMAC-SHA256).
+
+    Uses `rfernet` when installed, otherwise `cryptography`. Both produce standard
+    Fernet tokens, so either can decrypt what the other encrypted.
     """
 
     def __init__(self, key: bytes):
@@ -62,12 +150,29 @@ class CryptoEngine:
         Args:
             key (bytes): The fernet key.
         """
-        self.fernet = Fernet(key)
+        if rfernet is not None:
+            self.fernet = rfernet.Fernet(key.decode("ascii") if isinstance(key, bytes) else key)
+        else:
+            self.fernet = Fernet(key)
 
     def encrypt(self, data: bytes) -> bytes:
         """Encrypts the byte payload."""
-        return self.fernet.encrypt(data)
+        if rfernet is None:
+            return self.fernet.encrypt(data)
+        return self.fernet.encrypt(data).encode("ascii")  # rfernet tokens are str
 
     def decrypt(self, token: bytes) -> bytes:
-        """Decrypts the token payload."""
-        return self.fernet.decrypt(token)
+        """
+        Decrypts the token payload.
+
+        Raises:
+            InvalidToken: If the token is malformed, tampered with, or from another key.
+        """
+        if rfernet is None:
+            return self.fernet.decrypt(token)
+        try:
+            if isinstance(token, (bytes, bytearray)):
+                token = bytes(token).decode("ascii")
+            return self.fernet.decrypt(token)
+        except (UnicodeDecodeError, rfernet.DecryptionError) as e:
+            raise InvalidToken from e
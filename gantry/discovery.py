@@ -3,16 +3,87 @@ Module for discovering common locations of burned-in text (hotspots) in DICOM in
 """
 import logging
 import re
-from dataclasses import dataclass
+from collections import OrderedDict, deque
+from itertools import chain, compress
+from threading import Lock
+from dataclasses import dataclass, asdict
 from typing import List, Tuple, Any, Dict, Union, Callable, Optional
 
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
 # Lazy imports for optional dependencies
 # import pandas as pd
 # import spacy
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Strips punctuation before the capitalized-word heuristic
+_PUNCT_RE = re.compile(r'[^\w\s]')
+# spaCy components text classification does not use (only 'ner' is read)
+_NLP_UNUSED_PIPES = ["parser", "lemmatizer", "attribute_ruler"]
+# Distinct OCR strings whose labels are remembered (see classify_texts)
+_LABEL_CACHE_SIZE = 4096
+
+
+def _flood_fill_clusters(left, top, right, bottom, by_left, sorted_left, reach, px, py):
+    """
+    Scalar-loop form of the group_boxes flood fill, compiled with Numba when installed.
+
+    Produces exactly the clusters of the vectorized path: members in visit order,
+    each box's new neighbours in ascending index order.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (members, starts); cluster k is
+        members[starts[k]:starts[k + 1]].
+    """
+    n = left.shape[0]
+    unvisited = np.ones(n, dtype=np.bool_)
+    members = np.empty(n, dtype=np.int64)
+    starts = np.empty(n + 1, dtype=np.int64)
+    hits = np.empty(n, dtype=np.int64)
+    n_clusters = 0
+    tail = 0
+
+    for i in range(n):
+        if not unvisited[i]:
+            continue
+        unvisited[i] = False
+        starts[n_clusters] = tail
+        n_clusters += 1
+        members[tail] = i
+        head = tail
+        tail += 1
+        # members[head:tail] doubles as the BFS queue
+        while head < tail:
+            curr = members[head]
+            head += 1
+            lo = np.searchsorted(sorted_left, left[curr] - reach, side="left")
+            hi = np.searchsorted(sorted_left, right[curr] + px, side="right")
+            found = 0
+            for k in range(lo, hi):
+                j = by_left[k]
+                if (unvisited[j] and left[curr] - px <= right[j]
+                        and bottom[curr] + py >= top[j] and top[curr] - py <= bottom[j]):
+                    unvisited[j] = False
+                    hits[found] = j
+                    found += 1
+            if found:
+                members[tail:tail + found] = np.sort(hits[:found])
+                tail += found
+
+    starts[n_clusters] = tail
+    return members, starts[:n_clusters + 1]
+
+
+if numba is not None:
+    _flood_fill_clusters = numba.njit(cache=True)(_flood_fill_clusters)
+
+@dataclass(slots=True)
 class DiscoveryCandidate:
     """A single text region detected during discovery."""
     text: str
@@ -36,6 +107,10 @@ class DiscoveryResult:
     def __iter__(self):
         return iter(self.candidates)
 
+    def _box_array(self) -> np.ndarray:
+        """(N, 4) array of candidate boxes [x, y, w, h], built from the current candidates."""
+        return np.array([c.box for c in self.candidates]).reshape(-1, 4)
+
     def filter(self, predicate: Union[float, Callable] = 0.0) -> 'DiscoveryResult':
         """
         Returns a new result with filtered candidates.
@@ -46,7 +121,11 @@ class DiscoveryResult:
         if callable(predicate):
             filtered = [c for c in self.candidates if predicate(c)]
         else:
-            filtered = [c for c in self.candidates if c.confidence >= predicate]
+            # float64 so thresholds compare exactly as Python floats do; rebuilt per call
+            # so edits to candidates (or the list) are always seen
+            confs = np.fromiter((c.confidence for c in self.candidates),
+                                dtype=np.float64, count=len(self.candidates))
+            filtered = list(compress(self.candidates, confs >= predicate))
         return DiscoveryResult(filtered, self.n_sources)
 
     def to_dataframe(self):
@@ -56,7 +135,7 @@ class DiscoveryResult:
         """
         try:
             import pandas as pd
-            return pd.DataFrame([vars(c) for c in self.candidates])
+            return pd.DataFrame([asdict(c) for c in self.candidates])
         except ImportError:
             raise ImportError("Pandas is required for to_dataframe()")
 
@@ -72,28 +151,22 @@ class DiscoveryResult:
             return [[0] * bins[1] for _ in range(bins[0])]
 
         rows, cols = bins
-        grid = [[0] * cols for _ in range(rows)]
-
-        # Normalize to 0-1
-        xs = [c.box[0] for c in self.candidates]
-        ys = [c.box[1] for c in self.candidates]
+        boxes = self._box_array()
 
-        max_x, max_y = max(xs) if xs else 1, max(ys) if ys else 1
-        # Avoid div by zero
-        max_x = max_x or 1
-        max_y = max_y or 1
+        # Normalize to 0-1 (avoiding div by zero)
+        max_x = boxes[:, 0].max() or 1
+        max_y = boxes[:, 1].max() or 1
 
-        for c in self.candidates:
-            # Map center of box
-            cx = c.box[0] + c.box[2] // 2
-            cy = c.box[1] + c.box[3] // 2
+        # Map center of box
+        cx = boxes[:, 0] + boxes[:, 2] // 2
+        cy = boxes[:, 1] + boxes[:, 3] // 2
 
-            c_idx = min(int((cx / max_x) * cols), cols - 1)
-            r_idx = min(int((cy / max_y) * rows), rows - 1)
+        c_idx = np.minimum((cx / max_x * cols).astype(np.intp), cols - 1)
+        r_idx = np.minimum((cy / max_y * rows).astype(np.intp), rows - 1)
 
-            grid[r_idx][c_idx] += 1
-
-        return grid
+        # One bincount over flattened cell indices instead of a per-candidate loop
+        grid = np.bincount(r_idx * cols + c_idx, minlength=rows * cols)
+        return grid.reshape(rows, cols).tolist()
 
     def visualize_heatmap(self, bins: Tuple[int, int] = (10, 10)) -> str:
         """
@@ -158,8 +231,7 @@ class DiscoveryResult:
         if not self.candidates:
             return []
 
-        boxes = [c.box for c in self.candidates]
-        cluster_indices = ZoneDiscoverer.group_boxes(boxes, pad_x=pad_x, pad_y=pad_y)
+        cluster_indices = ZoneDiscoverer.group_boxes(self._box_array(), pad_x=pad_x, pad_y=pad_y)
 
         return [[self.candidates[i] for i in indices] for indices in cluster_indices]
 
@@ -175,11 +247,8 @@ class DiscoveryResult:
         if not self.candidates:
             return []
 
-        # 1. Prepare boxes for clustering
-        boxes = [c.box for c in self.candidates]
-
-        # 2. Cluster
-        clusters = ZoneDiscoverer.group_boxes(boxes, pad_x=pad_x, pad_y=pad_y)
+        # 1. Cluster the box column
+        clusters = ZoneDiscoverer.group_boxes(self._box_array(), pad_x=pad_x, pad_y=pad_y)
 
         final_zones = []
 
@@ -229,102 +298,181 @@ class ZoneDiscoverer:
     """
     _nlp_model = None
     _nlp_model_failed = False
+    # LRU of stripped text -> label, valid only for the model in _label_cache_model
+    _label_cache = OrderedDict()
+    _label_cache_model = None
+    _label_cache_lock = Lock()  # Discovery may classify from several threads
+
+    @staticmethod
+    def _load_nlp():
+        """Returns the spaCy model, loading it on first use; None if unavailable."""
+        if ZoneDiscoverer._nlp_model is None and not ZoneDiscoverer._nlp_model_failed:
+            try:
+                import spacy
+                ZoneDiscoverer._nlp_model = spacy.load("en_core_web_sm")
+                logger.info("Loaded spaCy NLP model.")
+            except Exception as e:
+                logger.warning(f"Failed to load or import spaCy: {e}. Fallback to regex.")
+                ZoneDiscoverer._nlp_model_failed = True
+        return ZoneDiscoverer._nlp_model
+
+    @staticmethod
+    def _rule_class(clean: str) -> Optional[str]:
+        """Label decided without NLP ('TEXT' for blanks, 'NAME_PATTERN'), else None."""
+        if not clean:
+            return "TEXT"
+        # Explicit DICOM Name Pattern
+        if '^' in clean and any(c.isalpha() for c in clean):
+            return "NAME_PATTERN"
+        return None
+
+    @staticmethod
+    def _heuristic_class(clean: str) -> str:
+        """Fallback when NLP finds no entity: any capitalized word marks a candidate."""
+        # Punctuation is never whitespace, so stripping it once up front leaves the
+        # same words as stripping each word (emptied words simply vanish)
+        for w in _PUNCT_RE.sub('', clean).split():
+            if len(w) > 1 and w[0].isupper():
+                return "PROPER_NOUN_CANDIDATE"
+        return "TEXT"
 
     @staticmethod
     def _classify_text(text: str) -> str:
         """
         Classifies text as 'NAME_PATTERN', 'PROPER_NOUN', or 'TEXT'.
         """
-        clean = text.strip()
-        if not clean:
-            return "TEXT"
+        return ZoneDiscoverer.classify_texts([text])[0]
 
-        # 1. Explicit DICOM Name Pattern
-        if '^' in clean and any(c.isalpha() for c in clean):
-            return "NAME_PATTERN"
+    @staticmethod
+    def classify_texts(texts: List[str], batch_size: int = 64) -> List[str]:
+        """
+        Classifies many OCR strings at once (see `_classify_text`).
 
-        # 2. NLP (spaCy) - Optional
-        if not ZoneDiscoverer._nlp_model_failed:
-            if ZoneDiscoverer._nlp_model is None:
-                try:
-                    import spacy
-                    ZoneDiscoverer._nlp_model = spacy.load("en_core_web_sm")
-                    logger.info("Loaded spaCy NLP model.")
-                except Exception as e:
-                    logger.warning(f"Failed to load or import spaCy: {e}. Fallback to regex.")
-                    ZoneDiscoverer._nlp_model_failed = True
-
-        if ZoneDiscoverer._nlp_model:
-            doc = ZoneDiscoverer._nlp_model(clean)
-            for ent in doc.ents:
-                if ent.label_ in ("PERSON", "ORG"): # Accept ORG too
-                    return "PROPER_NOUN"
-
-        # 3. Fallback Heuristic
-        words = clean.split()
-        cap_count = 0
-        for w in words:
-            w_clean = re.sub(r'[^\w\s]', '', w)
-            if w_clean and w_clean[0].isupper() and len(w_clean) > 1:
-                cap_count += 1
-
-        if cap_count > 0:
-            return "PROPER_NOUN_CANDIDATE"
+        Rule-based labels are settled first. The rest are looked up in an LRU
+        cache (OCR repeats the same banners across instances); each distinct
+        uncached text then goes through spaCy once, in batches via `nlp.pipe`
+        with the components NER does not need disabled.
 
-        return "TEXT"
+        Args:
+            texts: Strings to classify.
+            batch_size: spaCy batch size.
+
+        Returns:
+            List[str]: One label per input, in order.
+        """
+        cleaned = [t.strip() for t in texts]
+        labels = [ZoneDiscoverer._rule_class(c) for c in cleaned]
+        pending = [i for i, label in enumerate(labels) if label is None]
+        if not pending:
+            return labels
+
+        nlp = ZoneDiscoverer._load_nlp()
+        cache = ZoneDiscoverer._label_cache
+        fresh = {}
+        with ZoneDiscoverer._label_cache_lock:
+            if ZoneDiscoverer._label_cache_model is not nlp:
+                # Labels depend on the model (or its absence): start over when it changes
+                cache.clear()
+                ZoneDiscoverer._label_cache_model = nlp
+            for i in pending:
+                label = cache.get(cleaned[i])
+                if label is None:
+                    fresh[cleaned[i]] = None  # Ordered de-duplication
+                else:
+                    labels[i] = label
+                    cache.move_to_end(cleaned[i])
+        unique = list(fresh)
+
+        if nlp and unique:
+            if len(unique) == 1:
+                docs = [nlp(unique[0])]  # Nothing to batch
+            else:
+                docs = nlp.pipe(unique, batch_size=batch_size, disable=_NLP_UNUSED_PIPES)
+            for text, doc in zip(unique, docs):
+                if any(ent.label_ in ("PERSON", "ORG") for ent in doc.ents):  # Accept ORG too
+                    fresh[text] = "PROPER_NOUN"
+
+        for text in unique:
+            if fresh[text] is None:
+                fresh[text] = ZoneDiscoverer._heuristic_class(text)
+
+        for i in pending:
+            if labels[i] is None:
+                labels[i] = fresh[cleaned[i]]
+
+        with ZoneDiscoverer._label_cache_lock:
+            cache.update(fresh)
+            while len(cache) > _LABEL_CACHE_SIZE:
+                cache.popitem(last=False)
+        return labels
 
     @staticmethod
     def group_boxes(boxes: List[List[int]], padding: int = 0, pad_x: int = None, pad_y: int = None) -> List[List[int]]:
-        """Groups boxes into overlapping clusters."""
-        if not boxes:
+        """Groups boxes (a list of [x, y, w, h] or an (N, 4) array) into overlapping clusters."""
+        if len(boxes) == 0:
             return []
 
         px = pad_x if pad_x is not None else padding
         py = pad_y if pad_y is not None else padding
 
+        arr = np.asarray(boxes)
+        left, top = arr[:, 0], arr[:, 1]
+        right, bottom = left + arr[:, 2], top + arr[:, 3]
+
+        # Breadth-first flood fill over the overlap graph. Each visited box is
+        # tested against the unvisited boxes in one vectorized step (same rule as
+        # _boxes_overlap), so no N x N matrix or adjacency lists are built.
         n = len(boxes)
-        adj = [[] for _ in range(n)]
+        unvisited = np.ones(n, dtype=bool)
+        clusters = []
 
-        for i in range(n):
-            for j in range(i + 1, n):
-                if ZoneDiscoverer._boxes_overlap(boxes[i], boxes[j], px, py):
-                    adj[i].append(j)
-                    adj[j].append(i)
+        # Sweep window: only boxes whose left edge lies within
+        # [left - px - widest, right + px] can overlap horizontally, so each step
+        # tests a slice of the left-sorted order instead of every box.
+        by_left = np.argsort(left, kind="stable")
+        sorted_left = left[by_left]
+        reach = arr[:, 2].max() + px
 
-        visited = [False] * n
-        clusters = []
+        if numba is not None:
+            members, starts = _flood_fill_clusters(
+                left, top, right, bottom,
+                by_left, sorted_left, reach, px, py)
+            members, starts = members.tolist(), starts.tolist()
+            return [members[a:b] for a, b in zip(starts, starts[1:])]
 
         for i in range(n):
-            if not visited[i]:
-                visited[i] = True
+            if unvisited[i]:
+                unvisited[i] = False
                 cluster = [i]
-                queue = [i]
+                queue = deque([i])
                 while queue:
-                    curr = queue.pop(0)
-                    for neighbor in adj[curr]:
-                        if not visited[neighbor]:
-                            visited[neighbor] = True
-                            cluster.append(neighbor)
-                            queue.append(neighbor)
+                    curr = queue.popleft()
+                    lo = np.searchsorted(sorted_left, left[curr] - reach, side="left")
+                    hi = np.searchsorted(sorted_left, right[curr] + px, side="right")
+                    window = by_left[lo:hi]
+                    # Sorted so clusters list members in the same order as a full scan
+                    hits = np.sort(window[
+                        unvisited[window]
+                        & (left[curr] - px <= right[window])
+                        & (bottom[curr] + py >= top[window]) & (top[curr] - py <= bottom[window])])
+                    unvisited[hits] = False
+                    neighbors = hits.tolist()
+                    cluster.extend(neighbors)
+                    queue.extend(neighbors)
                 clusters.append(cluster)
         return clusters
 
     @staticmethod
     def _union_box_list(boxes: List[List[int]]) -> List[int]:
-        if not boxes:
+        if len(boxes) == 0:
             return [0, 0, 0, 0]
-        ux, uy, uw, uh = boxes[0]
-        ur, ub = ux + uw, uy + uh
-        for k in range(1, len(boxes)):
-            b = boxes[k]
-            ux = min(ux, b[0])
-            uy = min(uy, b[1])
-            ur = max(ur, b[0] + b[2])
-            ub = max(ub, b[1] + b[3])
-        return [ux, uy, ur - ux, ub - uy]
+        arr = np.asarray(boxes)
+        lo = arr[:, :2].min(axis=0)
+        hi = (arr[:, :2] + arr[:, 2:4]).max(axis=0)
+        return np.concatenate([lo, hi - lo]).tolist()
 
     @staticmethod
-    def _boxes_overlap(b1, b2, px: int, py: int) -> bool:
+    def _boxes_overlap(b1, b2, px: int = 0, py: int = 0) -> bool:
         l1, t1, r1, b1_ = b1[0], b1[1], b1[0]+b1[2], b1[1]+b1[3]
         l2, t2, r2, b2_ = b2[0], b2[1], b2[0]+b2[2], b2[1]+b2[3]
         return not ((r1 + px) < l2 or (l1 - px) > r2 or (b1_ + py) < t2 or (t1 - py) > b2_)
@@ -332,5 +480,16 @@ class ZoneDiscoverer:
     @staticmethod
     def _merge_overlapping_boxes(boxes: List[List[int]], padding: int = 0) -> List[List[int]]:
         """Legacy helper."""
-        clusters = ZoneDiscoverer.group_boxes(boxes, padding=padding)
-        return [ZoneDiscoverer._union_box_list([boxes[i] for i in cluster]) for cluster in clusters]
+        if len(boxes) == 0:
+            return []
+        arr = np.asarray(boxes)
+        clusters = ZoneDiscoverer.group_boxes(arr, padding=padding)
+
+        # Union every cluster at once: lay boxes out cluster by cluster, then
+        # reduce each contiguous run of corners
+        order = np.fromiter(chain.from_iterable(clusters), dtype=np.intp, count=len(arr))
+        starts = np.cumsum([0] + [len(c) for c in clusters[:-1]])
+        near = arr[order, :2]
+        lo = np.minimum.reduceat(near, starts, axis=0)
+        hi = np.maximum.reduceat(near + arr[order, 2:4], starts, axis=0)
+        return np.hstack([lo, hi - lo]).tolist()
@@ -7,6 +7,49 @@ from pydicom.uid import generate_uid
 import gantry.imagecodecs_handler as h
 from .logger import get_logger
 
+# Elements larger than this are left on disk by dcmread until accessed, so lazy
+# pixel loads do not read PixelData just to parse the header
+_PIXEL_DEFER_SIZE = "1 KB"
+_PIXEL_DATA_TAG = 0x7FE00010
+
+
+def _map_native_pixels(ds, path: str) -> Optional[np.ndarray]:
+    """
+    Memory-maps uncompressed little-endian PixelData straight from `path`.
+
+    The map is copy-on-write: pages are read on demand and shared with other
+    readers, while in-place edits (redaction) stay private and never reach the
+    file. Returns None whenever pydicom's decoding could differ (encapsulated,
+    big-endian or deflated data, 1-bit, high-bit masking, planar RGB), and the
+    caller falls back to `ds.pixel_array`.
+    """
+    try:
+        ts = ds.file_meta.TransferSyntaxUID
+        if ts.is_encapsulated or ts.is_deflated or not ts.is_little_endian:
+            return None
+        elem = ds.get_item(_PIXEL_DATA_TAG, keep_deferred=True)
+        offset = getattr(elem, "value_tell", None)
+        if offset is None or getattr(elem, "value", None) is not None:
+            return None  # Small enough to be read already; nothing to gain
+
+        bits = int(ds.BitsAllocated)
+        if bits not in (8, 16, 32) or int(ds.BitsStored) != bits:
+            return None
+        rows, cols = int(ds.Rows), int(ds.Columns)
+        samples = int(getattr(ds, "SamplesPerPixel", 1))
+        frames = int(getattr(ds, "NumberOfFrames", 1) or 1)
+        if samples > 1 and int(getattr(ds, "PlanarConfiguration", 0)) != 0:
+            return None
+
+        dtype = np.dtype(f"<{'i' if int(ds.PixelRepresentation) else 'u'}{bits // 8}")
+        shape = tuple(d for d, keep in ((frames, frames > 1), (rows, True), (cols, True),
+                                        (samples, samples > 1)) if keep)
+        if elem.length < int(np.prod(shape)) * dtype.itemsize:
+            return None
+        return np.memmap(path, dtype=dtype, mode="c", offset=offset, shape=shape).view(np.ndarray)
+    except (AttributeError, TypeError, ValueError, OSError):
+        return None
+
 
 @dataclass(slots=True)
 class DicomSequence:
@@ -259,9 +302,11 @@ class Instance(DicomItem):
                 # Read pixel data on demand
                 ds = None
                 try:
-                    ds = pydicom.dcmread(self.file_path)
+                    ds = pydicom.dcmread(self.file_path, defer_size=_PIXEL_DEFER_SIZE)
 
-                    self.set_pixel_data(ds.pixel_array)  # Cache it in memory
+                    # Native pixels are mapped from the file; anything else is decoded
+                    arr = _map_native_pixels(ds, self.file_path)
+                    self.set_pixel_data(arr if arr is not None else ds.pixel_array)
                     return self.pixel_array
                 except (AttributeError, TypeError):
                     # No pixel data element
@@ -15,6 +15,10 @@ import shutil
 import hashlib
 import io
 import base64
+import threading
+import struct
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Set, Dict, Any, Optional, Tuple, NamedTuple, Iterable
 from datetime import datetime, date
 import json
@@ -26,15 +30,16 @@ try:
     from PIL import Image
 except ImportError:
     Image = None
+try:
+    import imagecodecs
+    imagecodecs.jpeg2k_encode  # Builds without OpenJPEG lack the encoder
+except (ImportError, AttributeError):
+    imagecodecs = None
 from tqdm import tqdm
 from pydicom.dataset import FileDataset, FileMetaDataset
 from pydicom.uid import ImplicitVRLittleEndian, UncompressedTransferSyntaxes, JPEG2000Lossless
 from pydicom.tag import Tag
 from pydicom.datadict import dictionary_VR
-try:
-    from pydicom.encapsulate import encapsulate
-except ImportError:
-    from pydicom.encaps import encapsulate
 from pydicom.sequence import Sequence
 from pydicom.dataset import Dataset
 
@@ -47,6 +52,48 @@ from .sidecar import SidecarManager
 
 from .store import DicomStore
 
+# Multi-frame J2K encoding fans frames out over a shared thread pool (OpenJPEG
+# and Pillow release the GIL while encoding). Capped at 6: beyond that, export
+# workers already running in parallel only oversubscribe the cores.
+_J2K_MAX_WORKERS = min(
+    len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1), 6)
+_j2k_pool = None
+_j2k_pool_pid = None
+_j2k_pool_lock = threading.Lock()
+
+
+def _get_j2k_pool() -> ThreadPoolExecutor:
+    """Returns this process's frame-encoding pool, created on first use (fork-safe)."""
+    global _j2k_pool, _j2k_pool_pid
+    with _j2k_pool_lock:
+        if _j2k_pool is None or _j2k_pool_pid != os.getpid():
+            # A pool inherited across fork has no live threads; start a fresh one
+            _j2k_pool = ThreadPoolExecutor(
+                max_workers=_J2K_MAX_WORKERS, thread_name_prefix="J2KEncode")
+            _j2k_pool_pid = os.getpid()
+        return _j2k_pool
+
+
+# Imports of at most this many files are parsed in the calling process
+_SERIAL_INGEST_MAX = 64
+
+# Text-like VRs that might contain PHI
+_TEXT_VRS = frozenset({'PN', 'LO', 'SH', 'ST', 'LT', 'UT', 'DA', 'DT', 'TM'})
+# Binary VRs to explicitly skip (Metadata Refactor)
+# UN left out for safety, usually small private tags
+_BINARY_VRS = frozenset({'OB', 'OW', 'OF', 'OD', 'OL'})
+
+
+@functools.lru_cache(maxsize=4096)
+def _tag_key(tag: int) -> str:
+    """
+    'gggg,eeee' attribute key for a tag. Cached so every instance parsed in this
+    process shares one key string per tag instead of formatting (and holding) its
+    own copy. Interned, so `_share_tag_keys` maps keys from pool results onto the
+    same strings.
+    """
+    return sys.intern(f"{tag >> 16:04x},{tag & 0xFFFF:04x}")
+
 
 def populate_attrs(ds: Any, item: "DicomItem", text_index: list = None):
     """
@@ -62,19 +109,13 @@ def populate_attrs(ds: Any, item: "DicomItem", text_index: list = None):
         text_index (list, optional): A list to append (item, tag) tuples for text indexing.
     """
 
-    # Text-like VRs that might contain PHI
-    TEXT_VRS = {'PN', 'LO', 'SH', 'ST', 'LT', 'UT', 'DA', 'DT', 'TM'}
-    # Binary VRs to explicitly skip (Metadata Refactor)
-    # UN left out for safety, usually small private tags
-    BINARY_VRS = {'OB', 'OW', 'OF', 'OD', 'OL'}
-
     for elem in ds:
         if elem.tag.group == 0x7fe0:
             continue  # Skip pixels
-        if elem.VR in BINARY_VRS:
+        if elem.VR in _BINARY_VRS:
             continue  # Skip binary blobs
 
-        tag = f"{elem.tag.group:04x},{elem.tag.element:04x}"
+        tag = _tag_key(elem.tag)
 
         if elem.VR == 'SQ':
             process_sequence(tag, elem, item, text_index)
@@ -87,7 +128,7 @@ def populate_attrs(ds: Any, item: "DicomItem", text_index: list = None):
         else:
             item.set_attr(tag, elem.value)
             # Index if text
-            if text_index is not None and elem.VR in TEXT_VRS:
+            if text_index is not None and elem.VR in _TEXT_VRS:
                 text_index.append((item, tag))
 
 
@@ -99,6 +140,21 @@ def process_sequence(tag, elem, parent_item, text_index: list = None):
         parent_item.add_sequence_item(tag, seq_item)
 
 
+def _share_tag_keys(item: "DicomItem"):
+    """
+    Re-keys an item unpickled from a worker (and its nested sequence items) with
+    interned tag strings. Pickle only shares strings within one result, so without
+    this every instance from the pool holds its own copy of each key.
+    """
+    item.attributes = {sys.intern(k): v for k, v in item.attributes.items()}
+    if item.sequences:
+        item.sequences = {sys.intern(k): seq for k, seq in item.sequences.items()}
+        for seq in item.sequences.values():
+            seq.tag = sys.intern(seq.tag)
+            for seq_item in seq.items:
+                _share_tag_keys(seq_item)
+
+
 def ingest_worker(fp: str) -> Tuple[Optional[Dict],
                                     Optional[Instance],
                                     Optional[bytes],
@@ -237,17 +293,23 @@ class DicomImporter:
                     series_map[se.series_instance_uid] = se
 
         # 2. Parallel Execution
-        # OPTIMIZATION: Use return_generator=True to stream results.
-        # This prevents accumulating result tuples (with huge p_bytes) in a list (O(N) memory).
-        # We process each result immediately and discard it (O(1) memory).
-        # OPTIMIZATION: chunksize=1 to prevent buffering multiple large files in IPC queue
-        results = run_parallel(
-            ingest_worker,
-            new_files,
-            desc="Ingesting",
-            chunksize=1,
-            executor=executor,
-            return_generator=True)
+        pooled = len(new_files) > _SERIAL_INGEST_MAX
+        if not pooled:
+            # Small batches: parsing inline beats waking the pool and pickling
+            # every instance and its pixel bytes back through IPC
+            results = map(ingest_worker, new_files)
+        else:
+            # OPTIMIZATION: Use return_generator=True to stream results.
+            # This prevents accumulating result tuples (with huge p_bytes) in a list (O(N) memory).
+            # We process each result immediately and discard it (O(1) memory).
+            # OPTIMIZATION: chunksize=1 to prevent buffering multiple large files in IPC queue
+            results = run_parallel(
+                ingest_worker,
+                new_files,
+                desc="Ingesting",
+                chunksize=1,
+                executor=executor,
+                return_generator=True)
 
         # 3. Aggregation (Streaming)
         count = 0
@@ -259,9 +321,14 @@ class DicomImporter:
                 continue
             if inst:
                 try:
+                    if pooled:
+                        _share_tag_keys(inst)
+                        inst.text_index = [(item, sys.intern(tag)) for item, tag in inst.text_index]
+
                     # Persist Pixels to Sidecar (Main Thread Sequential Write)
                     if p_bytes and sidecar_manager:
-                        off, leng = sidecar_manager.write_frame(p_bytes, p_alg)
+                        # Synced once by the save that records these offsets
+                        off, leng = sidecar_manager.write_frame(p_bytes, p_alg, sync=False)
                         inst._pixel_loader = SidecarPixelLoader(
                             sidecar_manager.filepath, off, leng, p_alg, instance=inst)
                         inst._pixel_hash = p_hash
@@ -453,7 +520,18 @@ def _export_instance_worker(ctx: ExportContext) -> Optional[bool]:
         # Ensure dir exists (race safe)
         os.makedirs(os.path.dirname(ctx.output_path), exist_ok=True)
 
-        ds.save_as(ctx.output_path, write_like_original=False)
+        # Write beside the target and rename into place: a dataset that fails to
+        # serialize leaves no truncated .dcm behind in the export tree
+        temp_path = ctx.output_path + ".tmp"
+        try:
+            ds.save_as(temp_path, write_like_original=False)
+            os.replace(temp_path, ctx.output_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
         return True
     except Exception as e:
         # Do not raise, as it aborts the entire parallel batch.
@@ -462,9 +540,38 @@ def _export_instance_worker(ctx: ExportContext) -> Optional[bool]:
         return e
 
 
+def _encapsulate_frames(frames: List[bytes]) -> bytes:
+    """
+    Encapsulates encoded frames, one fragment per frame, with a Basic Offset Table.
+
+    Byte-identical to pydicom's `encapsulate(frames)`, but sizes the output up front
+    and writes item headers and payloads into a single preallocated buffer instead
+    of growing a bytearray fragment by fragment.
+    """
+    n = len(frames)
+    padded = [len(f) + (len(f) & 1) for f in frames]  # Items are even length
+    if sum(padded[:-1]) + 8 * (n - 1) > 0xFFFFFFFF:
+        raise ValueError(
+            "Encapsulated frame data exceeds the Basic Offset Table limit (2**32 - 1 bytes)")
+
+    buf = bytearray(8 + 4 * n + sum(padded) + 8 * n)  # zero-filled: pad bytes are free
+    mv = memoryview(buf)
+    struct.pack_into("<4sI", buf, 0, b"\xFE\xFF\x00\xE0", 4 * n)
+
+    pos = 8 + 4 * n
+    for i, (frame, length) in enumerate(zip(frames, padded)):
+        struct.pack_into("<I", buf, 8 + 4 * i, pos - 8 - 4 * n)  # BOT offset
+        struct.pack_into("<4sI", buf, pos, b"\xFE\xFF\x00\xE0", length)
+        pos += 8
+        mv[pos:pos + len(frame)] = frame
+        pos += length
+    return bytes(buf)
+
+
 def _compress_j2k(ds, pixel_array=None):
     """
-    Compresses the pixel data of the dataset using JPEG 2000 Lossless (Pillow).
+    Compresses the pixel data of the dataset using JPEG 2000 Lossless.
+    Encodes with imagecodecs (OpenJPEG) when available, else Pillow.
     Updates TransferSyntaxUID and PixelData.
     """
     try:
@@ -551,6 +658,12 @@ def _compress_j2k(ds, pixel_array=None):
 
         # Helper to compress single frame
         def encode_frame(frame_arr):
+            if imagecodecs is not None:
+                # OpenJPEG directly on the array buffer: raw J2K codestream,
+                # reversible wavelet (level=0), no colour transform so RGB stays RGB
+                return imagecodecs.jpeg2k_encode(
+                    np.ascontiguousarray(frame_arr), level=0, codecformat='J2K', mct=False)
+
             # Pillow expects [H, W] or [H, W, C]
             if Image is None:
                 raise ImportError("Pillow not installed.")
@@ -559,13 +672,16 @@ def _compress_j2k(ds, pixel_array=None):
             img.save(bio, format='JPEG2000', compression='lossless')
             return bio.getvalue()
 
-        if frames > 1:
+        if frames > 1 and _J2K_MAX_WORKERS > 1:
+            # map() preserves frame order
+            frames_data = list(_get_j2k_pool().map(encode_frame, (arr[i] for i in range(frames))))
+        elif frames > 1:
             for i in range(frames):
                 frames_data.append(encode_frame(arr[i]))
         else:
             frames_data.append(encode_frame(arr))
 
-        ds.PixelData = encapsulate(frames_data)
+        ds.PixelData = _encapsulate_frames(frames_data)
         # ds.TransferSyntaxUID = JPEG2000Lossless # REMOVE: Group 2 tags must be in file_meta only
         ds.file_meta.TransferSyntaxUID = JPEG2000Lossless
         ds.is_implicit_VR = False  # Compressed transfer syntaxes are always Explicit VR
@@ -732,12 +848,14 @@ class DicomExporter:
         Yields:
             ExportContext: A prepared context for exporting a single file.
         """
+        from .persistence import gantry_json_loads  # persistence imports this module
+
         for row in store_backend.get_flattened_instances(patient_ids, instance_uids):
             # 1. Rehydrate Attributes
             attrs = {}
             if row['attributes_json']:
                 try:
-                    attrs = json.loads(row['attributes_json'], object_hook=gantry_json_object_hook)
+                    attrs = gantry_json_loads(row['attributes_json'])
                 except BaseException:
                     pass
 
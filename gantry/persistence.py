@@ -15,21 +15,146 @@ import queue
 import threading
 import time
 import hashlib
-import shutil
+import errno
+import re
+import math
 import base64
 import traceback
 from typing import List, Optional, Dict, Any, Tuple
-from datetime import datetime
+from datetime import datetime, date
 from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 
 from pydicom.multival import MultiValue
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import connectorx
+except ImportError:
+    connectorx = None
+
 from .entities import Patient, Study, Series, Instance, Equipment, DicomItem
 from .sidecar import SidecarManager
 from .logger import get_logger
 from .privacy import PhiFinding, PhiRemediation
 from .io_handlers import SidecarPixelLoader
 
+# Max keys per "IN (...)" lookup; stays under SQLITE_MAX_VARIABLE_NUMBER on old builds (999)
+_SQL_IN_CHUNK = 500
+
+# Top-level attribute key ("GGGG,EEEE") accepted in JSON paths
+_TAG_RE = re.compile(r"^[0-9A-Fa-f]{4},[0-9A-Fa-f]{4}$")
+
+# Bare JSON integers of 19+ digits; orjson.loads turns those past 64 bits into floats
+_WIDE_INT_RE = re.compile(r"(?<=[:,\[\s])-?\d{19,}(?=[,\]}\s])")
+
+# Findings inserted per executemany call in save_findings
+_FINDINGS_BATCH = 500
+
+# Per-connection tuning (see SqliteStore._configure_connection)
+_CACHE_SIZE_KIB = 65536  # 64 MiB page cache
+_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+
+# bytes attributes longer than this are stored in instance_blobs instead of attributes_json
+_BLOB_INLINE_MAX = 64
+
+# Statements reused by every save; sqlite3 caches the prepared form per connection
+_UPSERT_PATIENT_SQL = """
+    INSERT INTO patients (patient_id, patient_name) VALUES (?, ?)
+    ON CONFLICT(patient_id) DO UPDATE SET patient_name=excluded.patient_name
+"""
+_UPSERT_STUDY_SQL = """
+    INSERT INTO studies (patient_id_fk, study_instance_uid, study_date) VALUES (?, ?, ?)
+    ON CONFLICT(study_instance_uid) DO UPDATE SET
+        study_date=excluded.study_date,
+        patient_id_fk=excluded.patient_id_fk
+"""
+_UPSERT_SERIES_SQL = """
+    INSERT INTO series (study_id_fk, series_instance_uid, modality, series_number, manufacturer, model_name, device_serial_number)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(series_instance_uid) DO UPDATE SET
+        modality=excluded.modality,
+        series_number=excluded.series_number,
+        manufacturer=excluded.manufacturer,
+        model_name=excluded.model_name,
+        device_serial_number=excluded.device_serial_number,
+        study_id_fk=excluded.study_id_fk
+"""
+_UPSERT_INSTANCE_SQL = """
+    INSERT INTO instances (series_id_fk, sop_instance_uid, sop_class_uid, instance_number, file_path,
+                           pixel_offset, pixel_length, pixel_hash, compress_alg, attributes_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(sop_instance_uid) DO UPDATE SET
+        series_id_fk=excluded.series_id_fk,
+        sop_class_uid=excluded.sop_class_uid,
+        instance_number=excluded.instance_number,
+        file_path=excluded.file_path,
+        attributes_json=excluded.attributes_json,
+        pixel_offset=COALESCE(excluded.pixel_offset, instances.pixel_offset),
+        pixel_length=COALESCE(excluded.pixel_length, instances.pixel_length),
+        pixel_hash=COALESCE(excluded.pixel_hash, instances.pixel_hash),
+        compress_alg=COALESCE(excluded.compress_alg, instances.compress_alg)
+"""
+_UPDATE_ATTRIBUTES_SQL = """
+    UPDATE instances
+    SET attributes_json = ?
+    WHERE sop_instance_uid = ?
+"""
+_INSERT_FINDING_SQL = """
+    INSERT INTO phi_findings
+    (timestamp, entity_uid, entity_type, field_name, value, reason, patient_id, remediation_action, remediation_value, details_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# One row per instance with the basic cohort-report columns, in load_all() order.
+# Equipment columns are '' where load_all() attaches no Equipment, otherwise raw (NULL kept).
+_COHORT_SQL = """
+    WITH series_eq AS (
+        SELECT *, (COALESCE(manufacturer, '') != '' OR COALESCE(model_name, '') != '') AS has_eq
+        FROM series
+    )
+    SELECT
+        p.patient_id AS PatientID, p.patient_name AS PatientName,
+        st.study_instance_uid AS StudyInstanceUID, st.study_date AS StudyDate,
+        s.series_instance_uid AS SeriesInstanceUID, s.modality AS Modality,
+        i.sop_instance_uid AS SOPInstanceUID,
+        CASE WHEN s.has_eq THEN s.manufacturer ELSE '' END AS Manufacturer,
+        CASE WHEN s.has_eq THEN s.model_name ELSE '' END AS Model,
+        CASE WHEN s.has_eq THEN s.device_serial_number ELSE '' END AS DeviceSerial
+    FROM instances i
+    JOIN series_eq s ON i.series_id_fk = s.id
+    JOIN studies st ON s.study_id_fk = st.id
+    JOIN patients p ON st.patient_id_fk = p.id
+    ORDER BY p.id, st.id, s.id, i.id
+"""
+
+# Pooled connections inherited across fork (see SqliteStore._get_connection)
+_INHERITED_CONNS = []
+
+# save_all prepares instance rows on a shared thread pool once a save has this
+# many dirty instances; below that, thread handoff costs more than it saves.
+_PREPARE_PARALLEL_MIN = 64
+_PREPARE_MAX_WORKERS = min(
+    len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1), 4)
+_prepare_pool = None
+_prepare_pool_pid = None
+_prepare_pool_lock = threading.Lock()
+
+
+def _get_prepare_pool() -> ThreadPoolExecutor:
+    """Returns this process's row-preparation pool, created on first use (fork-safe)."""
+    global _prepare_pool, _prepare_pool_pid
+    with _prepare_pool_lock:
+        if _prepare_pool is None or _prepare_pool_pid != os.getpid():
+            # A pool inherited across fork has no live threads; start a fresh one
+            _prepare_pool = ThreadPoolExecutor(
+                max_workers=_PREPARE_MAX_WORKERS, thread_name_prefix="SavePrepare")
+            _prepare_pool_pid = os.getpid()
+        return _prepare_pool
 
 
 class SqliteStore:
@@ -101,6 +226,14 @@ class SqliteStore:
         UNIQUE(instance_uid, group_id, element_id, atom_index)
     );
 
+    CREATE TABLE IF NOT EXISTS instance_blobs (
+        instance_uid TEXT NOT NULL,
+        tag TEXT NOT NULL,
+        data BLOB NOT NULL,
+        FOREIGN KEY(instance_uid) REFERENCES instances(sop_instance_uid) ON DELETE CASCADE,
+        PRIMARY KEY(instance_uid, tag)
+    );
+
     CREATE TABLE IF NOT EXISTS audit_log (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         timestamp TEXT,
@@ -131,14 +264,18 @@ class SqliteStore:
     CREATE INDEX IF NOT EXISTS idx_inst_attr_uid ON instance_attributes(instance_uid);
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, durable: bool = False):
         """
         Initialize the SQLite store.
 
         Args:
             db_path (str): Path to the SQLite DB file. Use ":memory:" for transient storage.
+            durable (bool): If True, use synchronous=FULL (fsync on every commit) instead of
+                            NORMAL. NORMAL in WAL mode can lose the last commits on power loss,
+                            but never corrupts the database.
         """
         self.db_path = db_path
+        self.durable = durable
         self.logger = get_logger()
         if db_path == ":memory:":
             # Use a temporary file for sidecar if DB is in-memory
@@ -151,11 +288,14 @@ class SqliteStore:
             # Shared memory connection for :memory: database to persist across transactions
             self._memory_conn = sqlite3.connect(":memory:", check_same_thread=False)
             self._memory_conn.row_factory = sqlite3.Row
+            self._configure_connection(self._memory_conn)
             self._memory_lock = threading.Lock()
         else:
             self.sidecar_path = os.path.splitext(db_path)[0] + "_pixels.bin"
             self._memory_conn = None
             self._memory_lock = None
+        # Thread-local pooled connection for file-backed DBs (see _get_connection)
+        self._pool = threading.local()
 
         self.sidecar = SidecarManager(self.sidecar_path)
         self._init_db()
@@ -173,6 +313,7 @@ class SqliteStore:
         keys_to_remove = [
             '_memory_lock',
             '_memory_conn',
+            '_pool',
             'audit_queue',
             '_stop_event',
             '_audit_thread']
@@ -191,6 +332,7 @@ class SqliteStore:
         else:
             self._memory_lock = None
             self._memory_conn = None
+        self._pool = threading.local()
 
         self.audit_queue = queue.Queue()
         self._stop_event = threading.Event()
@@ -220,25 +362,77 @@ class SqliteStore:
                     self._memory_conn.rollback()
                     raise e
         else:
-            # File-based DB: create fresh connection per transaction
-            conn = sqlite3.connect(self.db_path, timeout=900.0)
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.commit()
-            conn.row_factory = sqlite3.Row
+            # File-based DB: reuse one connection per thread for the store's
+            # lifetime, so PRAGMAs and the page cache survive across calls.
+            # A nested call on the same thread (e.g. while a get_flattened_instances
+            # generator is still iterating) gets a transient connection instead,
+            # so it can't commit or roll back the outer transaction.
+            pool = self._pool
+            if getattr(pool, 'conn', None) is None or pool.pid != os.getpid():
+                # First use on this thread, or inherited across fork. An inherited
+                # connection must neither be used nor closed in the child (closing
+                # would drop the parent's POSIX locks), so it is parked for good.
+                if getattr(pool, 'conn', None) is not None:
+                    _INHERITED_CONNS.append(pool.conn)
+                pool.conn = self._open_connection()
+                pool.pid = os.getpid()
+                pool.busy = False
+
+            if pool.busy:
+                conn = self._open_connection()
+                try:
+                    yield conn
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    conn.close()
+                return
+
+            conn = pool.conn
+            pool.busy = True
             try:
                 yield conn
                 conn.commit()
-            except Exception as e:
+            except BaseException:
+                # Includes GeneratorExit/KeyboardInterrupt: the connection outlives
+                # this call, so it must never be handed out mid-transaction.
                 conn.rollback()
                 raise
             finally:
-                conn.close()
+                pool.busy = False
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """
+        Opens a configured connection to the file DB.
+
+        Pooled connections are closed when their thread exits or the store is
+        garbage collected (the thread-local holding them is dropped).
+        """
+        # Only ever used by one thread at a time, but may be finalized from another
+        conn = sqlite3.connect(self.db_path, timeout=900.0, check_same_thread=False)
+        self._configure_connection(conn)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """
+        Applies per-connection tuning PRAGMAs.
+
+        Unlike journal_mode, these are not stored in the database file, so they
+        must be set on every new connection.
+        """
+        conn.execute(f"PRAGMA synchronous={'FULL' if self.durable else 'NORMAL'}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA cache_size=-{_CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE_BYTES}")
 
     def _init_db(self):
         with self._get_connection() as conn:
+            # Persistent settings (stored in the DB file)
             conn.execute("PRAGMA journal_mode = WAL;")
             conn.execute("PRAGMA auto_vacuum = FULL;")
-            conn.execute("PRAGMA synchronous = NORMAL;")
             conn.executescript(self.SCHEMA)
 
     def _create_pixel_loader(self, offset, length, alg, instance, pixel_hash=None):
@@ -362,25 +556,49 @@ class SqliteStore:
         Returns:
             List[tuple]: (sop_instance_uid, file_path, details)
         """
-        unsafe = []
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                # Naive text search in JSON.
-                # matches "0028,0301": "YES"
-                # We need to be careful about spacing in JSON serialization, but standard json.dumps usually does ": "
-                # A safer broad check is %0028,0301%YES%
-                cursor.execute("""
-                    SELECT sop_instance_uid, file_path
-                    FROM instances
-                    WHERE attributes_json LIKE '%"0028,0301": "YES"%'
-                """)
-                rows = cursor.fetchall()
-                for r in rows:
-                    unsafe.append((r[0], r[1], "BurnedInAnnotation FLAGGED as YES"))
+            rows = self.find_instances_with_tag("0028,0301", "YES")
         except sqlite3.OperationalError:
-            pass
-        return unsafe
+            return []
+        return [(uid, path, "BurnedInAnnotation FLAGGED as YES") for uid, path, _ in rows]
+
+    def find_instances_with_tag(self, tag: str, value: Any = None) -> List[Tuple[str, Optional[str], Any]]:
+        """
+        Finds instances whose attributes_json holds `tag`, filtered inside SQLite.
+
+        Uses JSON1 `json_extract`, so only matching rows (and only the tag's value)
+        are returned to Python rather than every attributes_json document.
+        Large binary values live in `instance_blobs` and are not searched; rows
+        with malformed JSON are skipped rather than failing the query.
+
+        Args:
+            tag (str): Top-level DICOM tag, e.g. "0008,0020".
+            value (Any, optional): If given, only instances where the tag equals this value.
+
+        Returns:
+            List[Tuple[str, Optional[str], Any]]: (sop_instance_uid, file_path, value).
+            Array/object values are returned as JSON text.
+
+        Raises:
+            ValueError: If `tag` is not in "GGGG,EEEE" form.
+        """
+        if not _TAG_RE.match(tag):
+            raise ValueError(f"Invalid DICOM tag: {tag!r}")
+        path = f'$."{tag}"'
+
+        sql = """
+            SELECT sop_instance_uid, file_path, json_extract(attributes_json, ?)
+            FROM instances
+            WHERE CASE WHEN json_valid(attributes_json) THEN json_extract(attributes_json, ?) END """
+        params = [path, path]
+        if value is None:
+            sql += "IS NOT NULL"
+        else:
+            sql += "= ?"
+            params.append(value)
+
+        with self._get_connection() as conn:
+            return [tuple(r) for r in conn.execute(sql, params)]
 
     def log_audit_batch(self, entries: List[tuple]):
         """
@@ -430,6 +648,7 @@ class SqliteStore:
                 st_rows = cur.execute("SELECT * FROM studies").fetchall()
                 se_rows = cur.execute("SELECT * FROM series").fetchall()
                 i_rows = cur.execute("SELECT * FROM instances").fetchall()
+                blob_map = self._fetch_blobs(cur)
 
                 # 2. Build Maps
                 p_map = {}
@@ -466,11 +685,12 @@ class SqliteStore:
                     # Restore extra attributes
                     if r['attributes_json']:
                         try:
-                            attrs = json.loads(
-                                r['attributes_json'], object_hook=gantry_json_object_hook)
+                            attrs = gantry_json_loads(r['attributes_json'])
                             self._deserialize_into(inst, attrs)
                         except BaseException:
                             pass  # JSON error
+                    if r['sop_instance_uid'] in blob_map:
+                        inst.attributes.update(blob_map[r['sop_instance_uid']])
 
                     # Wire up Sidecar Loader if present
                     if r['pixel_offset'] is not None and r['pixel_length'] is not None:
@@ -553,6 +773,9 @@ class SqliteStore:
                         # Fetch Instances
                         i_rows = cur.execute(
                             "SELECT * FROM instances WHERE series_id_fk = ?", (se_pk,)).fetchall()
+                        blob_map = self._fetch_blobs(
+                            cur, "instance_uid IN (SELECT sop_instance_uid FROM instances WHERE series_id_fk = ?)",
+                            (se_pk,))
                         for r in i_rows:
                             inst = Instance(
                                 r['sop_instance_uid'],
@@ -563,11 +786,12 @@ class SqliteStore:
                             # Wire up Sidecar (Copy-Paste logic from load_all, keep generic?)
                             if r['attributes_json']:
                                 try:
-                                    attrs = json.loads(
-                                        r['attributes_json'], object_hook=gantry_json_object_hook)
+                                    attrs = gantry_json_loads(r['attributes_json'])
                                     self._deserialize_into(inst, attrs)
                                 except BaseException:
                                     pass
+                            if r['sop_instance_uid'] in blob_map:
+                                inst.attributes.update(blob_map[r['sop_instance_uid']])
 
                             # Wire up Sidecar (Copy-Paste logic from load_all, keep generic?)
                             if r['pixel_offset'] is not None and r['pixel_length'] is not None:
@@ -586,6 +810,42 @@ class SqliteStore:
             self.logger.error(f"Failed to load patient: {e}")
             return None
 
+    @staticmethod
+    def _split_blobs(data: Dict[str, Any]) -> Dict[str, bytes]:
+        """
+        Pops large top-level bytes attributes (e.g. OB/OW private data) out of `data`.
+
+        They are stored raw in `instance_blobs` rather than base64-inflated in
+        attributes_json. Bytes nested in sequences stay in the JSON.
+        """
+        blobs = {}
+        for key, val in data.items():
+            if isinstance(val, (bytes, bytearray)) and len(val) > _BLOB_INLINE_MAX:
+                blobs[key] = bytes(val)
+        for key in blobs:
+            del data[key]
+        return blobs
+
+    @staticmethod
+    def _fetch_blobs(cur, where: str = None, params: tuple = ()) -> Dict[str, Dict[str, bytes]]:
+        """Returns {instance_uid: {tag: bytes}} from `instance_blobs`, optionally filtered."""
+        sql = "SELECT instance_uid, tag, data FROM instance_blobs"
+        if where:
+            sql += " WHERE " + where
+        blob_map = {}
+        for uid, tag, data in cur.execute(sql, params):
+            blob_map.setdefault(uid, {})[tag] = data
+        return blob_map
+
+    @staticmethod
+    def _replace_blobs(cur, blob_rows: Dict[str, Dict[str, bytes]]):
+        """Replaces the stored blobs of each instance in `blob_rows` (empty dict clears them)."""
+        cur.executemany("DELETE FROM instance_blobs WHERE instance_uid=?",
+                        [(uid,) for uid in blob_rows])
+        cur.executemany("INSERT INTO instance_blobs (instance_uid, tag, data) VALUES (?, ?, ?)",
+                        [(uid, tag, data) for uid, blobs in blob_rows.items()
+                         for tag, data in blobs.items()])
+
     def _serialize_item(self, item: Instance) -> Dict[str, Any]:
         """
         Serializes a DicomItem (or Instance) to a dictionary, including attributes and sequences.
@@ -779,7 +1039,9 @@ class SqliteStore:
             # Ideally we respect original or config, but for swap zlib is safe/fast enough.
             c_alg = 'zlib'
 
-            offset, length = self.sidecar.write_frame(b_data, c_alg)
+            # fsync is deferred to the next save_all, which syncs before it
+            # commits rows pointing at this frame
+            offset, length = self.sidecar.write_frame(b_data, c_alg, sync=False)
 
             # 2. Update Instance Loader
             # This allows instance.unload_pixel_data() to work safely
@@ -805,6 +1067,122 @@ class SqliteStore:
             self.logger.error(f"Failed to persist pixel swap for {instance.sop_instance_uid}: {e}")
             raise e
 
+    @staticmethod
+    def _fetch_pk_map(cur, table: str, key_col: str, keys) -> Dict[str, int]:
+        """
+        Resolves natural keys (UIDs) to primary keys with chunked IN queries.
+
+        Args:
+            cur (sqlite3.Cursor): Cursor inside the active transaction.
+            table (str): Table name.
+            key_col (str): Unique natural-key column.
+            keys (Iterable[str]): Keys to resolve.
+
+        Returns:
+            Dict[str, int]: Mapping of natural key to row id (missing keys omitted).
+        """
+        keys = list(keys)
+        pk_map = {}
+        for i in range(0, len(keys), _SQL_IN_CHUNK):
+            chunk = keys[i:i + _SQL_IN_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = cur.execute(
+                f"SELECT {key_col}, id FROM {table} WHERE {key_col} IN ({placeholders})", chunk)
+            pk_map.update((r[0], r[1]) for r in rows)
+        return pk_map
+
+    def _prepare_instance_row(self, se_pk: int, inst: Instance):
+        """
+        Serializes a dirty instance into an `instances` row.
+
+        Writes new pixel data to the sidecar as a side effect (deduplicated by hash).
+
+        Returns:
+            Tuple[tuple, Dict, Dict, int]: (row, vertical attributes, blobs, sidecar bytes written).
+        """
+        full_data = self._serialize_item(inst)
+
+        # Split Core vs Vertical (Private Tags -> Vertical Table)
+        core_data = {}
+        vert_data = {}
+
+        for key, val in full_data.items():
+            if key == "__sequences__":
+                # Keep sequences in Core JSON for now
+                core_data[key] = val
+                continue
+
+            # key is "GGGG,EEEE" hex string
+            try:
+                group = int(key.split(',')[0], 16)
+                # Odd Group = Private Tag (usually)
+                # Skip Vertical for BYTES (cant be stored as TEXT easily, keep in JSON)
+                is_private = (group % 2 != 0) and not isinstance(val, bytes)
+
+                if is_private:
+                    # Tuple key for vertical method: (grp, elem)
+                    vert_data[tuple(key.split(','))] = val
+                else:
+                    core_data[key] = val
+            except BaseException:
+                core_data[key] = val
+
+        # Large binary values go to instance_blobs, the rest is Core JSON
+        blobs = self._split_blobs(core_data)
+        attrs_json = gantry_json_dumps(core_data)
+
+        p_offset, p_length, p_alg, p_hash = None, None, None, None
+        written = 0
+
+        arr = inst.pixel_array
+        if arr is not None:
+            prev_loader = inst._pixel_loader
+            b_data = arr.tobytes()
+            c_alg = 'zlib'
+            p_hash = hashlib.sha256(b_data).hexdigest()
+
+            # Deduplication: If already persisted with same hash, skip write
+            if getattr(inst, '_pixel_hash', None) == p_hash and isinstance(
+                    prev_loader, SidecarPixelLoader):
+                p_offset = prev_loader.offset
+                p_length = prev_loader.length
+                p_alg = prev_loader.alg
+            else:
+                off, leng = self.sidecar.write_frame(b_data, c_alg, sync=False)
+                p_offset, p_length, p_alg = off, leng, c_alg
+                written = leng
+
+                # Update loader so we can unload safely later.
+                # A concurrent persist_pixel_data (e.g. a redaction swap on the main
+                # thread) may have linked newer pixels meanwhile; don't clobber them.
+                # The instance stays dirty (its _mod_count moved on) and the next
+                # save records the newer blob.
+                if inst._pixel_loader is prev_loader and inst.pixel_array is arr:
+                    inst._pixel_loader = self._create_pixel_loader(
+                        off, leng, c_alg, inst, pixel_hash=p_hash)
+                    inst._pixel_hash = p_hash  # Cache on instance
+
+        elif isinstance(inst._pixel_loader, SidecarPixelLoader):
+            # Already persisted (swapped), preserve metadata
+            p_offset = inst._pixel_loader.offset
+            p_length = inst._pixel_loader.length
+            p_alg = inst._pixel_loader.alg
+            p_hash = getattr(inst, '_pixel_hash', None)
+
+        row = (
+            se_pk,
+            inst.sop_instance_uid,
+            inst.sop_class_uid,
+            inst.instance_number,
+            inst.file_path,
+            p_offset,
+            p_length,
+            p_hash,
+            p_alg,
+            attrs_json
+        )
+        return row, vert_data, blobs, written
+
     def save_all(self, patients: List[Patient]):
         """
         Incrementally persists the provided patients and their graph to the database.
@@ -812,6 +1190,10 @@ class SqliteStore:
         Uses UPSERT logic to update existing records and Insert new ones.
         Only processes entities marked as `_dirty`.
 
+        The graph is written level by level (patients, studies, series, instances),
+        each level as a single `executemany` batch inside one IMMEDIATE transaction,
+        so the cost is a handful of statements and one commit regardless of size.
+
         Args:
             patients (List[Patient]): The list of patient objects to save.
         """
@@ -819,284 +1201,145 @@ class SqliteStore:
 
         pixel_bytes_written = 0
         pixel_frames_written = 0
-        sidecar_manager = self.sidecar
+        conn = None
 
         try:
             with self._get_connection() as conn:
+                # Take the write lock up front: avoids a deferred read->write lock
+                # upgrade (SQLITE_BUSY) when another connection writes concurrently.
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
                 cur = conn.cursor()
 
-                # Check for schema compatibility (simple check)
-                try:
-                    # We rely on UNIQUE constraints for UPSERT.
-                    # If older DB without constraints, we might fail or duplicate.
-                    pass
-                except BaseException:
-                    pass
-
-                # Counts for reporting
-                saved_p, saved_st, saved_se, saved_i = 0, 0, 0, 0
-
-                for p in patients:
-                    # Patient Level (Always Check Dirty)
-                    if getattr(p, '_dirty', True):
-                        cur.execute("""
-                            INSERT INTO patients (patient_id, patient_name) VALUES (?, ?)
-                            ON CONFLICT(patient_id) DO UPDATE SET patient_name=excluded.patient_name
-                        """, (p.patient_id, p.patient_name))
-                        saved_p += 1
-
-                    # We need the PK for children
-                    # Since we might have just updated or it might exist, we select it.
-                    # Optimization: Cache PKs? For now, fetch is safe.
-                    p_pk_row = cur.execute(
-                        "SELECT id FROM patients WHERE patient_id=?", (p.patient_id,)).fetchone()
-                    if not p_pk_row:
-                        continue  # Should not happen after Insert
-                    p_pk = p_pk_row[0]
-
-                    for st in p.studies:
-                        if getattr(st, '_dirty', True):
-                            # FIX: Convert date objects to string to avoid Python 3.12+
-                            # DeprecationWarning for default adapter
-                            s_date = st.study_date
-                            if hasattr(s_date, "isoformat"):
-                                s_date = s_date.isoformat()
-                            elif s_date is not None:
-                                s_date = str(s_date)
-
-                            cur.execute("""
-                                INSERT INTO studies (patient_id_fk, study_instance_uid, study_date) VALUES (?, ?, ?)
-                                ON CONFLICT(study_instance_uid) DO UPDATE SET
-                                    study_date=excluded.study_date,
-                                    patient_id_fk=excluded.patient_id_fk
-                            """, (p_pk, st.study_instance_uid, s_date))
-                            saved_st += 1
-
-                        st_pk_row = cur.execute(
-                            "SELECT id FROM studies WHERE study_instance_uid=?", (st.study_instance_uid,)).fetchone()
-                        if not st_pk_row:
+                # 1. Patients
+                p_rows = [(p.patient_id, p.patient_name)
+                          for p in patients if getattr(p, '_dirty', True)]
+                cur.executemany(_UPSERT_PATIENT_SQL, p_rows)
+                saved_p = len(p_rows)
+
+                p_pks = self._fetch_pk_map(
+                    cur, "patients", "patient_id", {p.patient_id for p in patients})
+
+                # 2. Studies
+                studies = [(p_pks[p.patient_id], st)
+                           for p in patients if p.patient_id in p_pks
+                           for st in p.studies]
+                st_rows = []
+                for p_pk, st in studies:
+                    if getattr(st, '_dirty', True):
+                        # FIX: Convert date objects to string to avoid Python 3.12+
+                        # DeprecationWarning for default adapter
+                        s_date = st.study_date
+                        if hasattr(s_date, "isoformat"):
+                            s_date = s_date.isoformat()
+                        elif s_date is not None:
+                            s_date = str(s_date)
+                        st_rows.append((p_pk, st.study_instance_uid, s_date))
+
+                cur.executemany(_UPSERT_STUDY_SQL, st_rows)
+                saved_st = len(st_rows)
+
+                st_pks = self._fetch_pk_map(
+                    cur, "studies", "study_instance_uid", {st.study_instance_uid for _, st in studies})
+
+                # 3. Series
+                series = [(st_pks[st.study_instance_uid], se)
+                          for _, st in studies if st.study_instance_uid in st_pks
+                          for se in st.series]
+                se_rows = []
+                for st_pk, se in series:
+                    if getattr(se, '_dirty', True):
+                        man = se.equipment.manufacturer if se.equipment else ""
+                        mod = se.equipment.model_name if se.equipment else ""
+                        sn = se.equipment.device_serial_number if se.equipment else ""
+                        se_rows.append((st_pk, se.series_instance_uid, se.modality,
+                                        se.series_number, man, mod, sn))
+
+                cur.executemany(_UPSERT_SERIES_SQL, se_rows)
+                saved_se = len(se_rows)
+
+                se_pks = self._fetch_pk_map(
+                    cur, "series", "series_instance_uid", {se.series_instance_uid for _, se in series})
+
+                # 4. Instances
+                # --- Deletion Handling (Diff DB vs Memory) ---
+                # Removing an item from Series.instances doesn't mark anything dirty,
+                # so we must diff every series against the DB.
+                mem_uids = {}  # se_pk -> set of in-memory SOP UIDs
+                for _, se in series:
+                    se_pk = se_pks.get(se.series_instance_uid)
+                    if se_pk is not None:
+                        mem_uids.setdefault(se_pk, set()).update(
+                            i.sop_instance_uid for i in se.instances)
+
+                to_delete = []
+                se_pk_list = list(mem_uids)
+                for i in range(0, len(se_pk_list), _SQL_IN_CHUNK):
+                    chunk = se_pk_list[i:i + _SQL_IN_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = cur.execute(
+                        f"SELECT series_id_fk, sop_instance_uid FROM instances WHERE series_id_fk IN ({placeholders})",
+                        chunk)
+                    to_delete.extend((uid,) for se_pk, uid in rows if uid not in mem_uids[se_pk])
+
+                if to_delete:
+                    cur.executemany("DELETE FROM instances WHERE sop_instance_uid=?", to_delete)
+                    cur.executemany("DELETE FROM instance_blobs WHERE instance_uid=?", to_delete)
+
+                # --- Upsert Dirty ---
+                dirty_items = []
+                for _, se in series:
+                    se_pk = se_pks.get(se.series_instance_uid)
+                    if se_pk is None:
+                        continue
+                    for inst in se.instances:
+                        if not getattr(inst, '_dirty', True):
                             continue
-                        st_pk = st_pk_row[0]
-
-                        for se in st.series:
-                            if getattr(se, '_dirty', True):
-                                man = se.equipment.manufacturer if se.equipment else ""
-                                mod = se.equipment.model_name if se.equipment else ""
-                                sn = se.equipment.device_serial_number if se.equipment else ""
-
-                                cur.execute("""
-                                    INSERT INTO series (study_id_fk, series_instance_uid, modality, series_number, manufacturer, model_name, device_serial_number)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                                    ON CONFLICT(series_instance_uid) DO UPDATE SET
-                                        modality=excluded.modality,
-                                        series_number=excluded.series_number,
-                                        manufacturer=excluded.manufacturer,
-                                        model_name=excluded.model_name,
-                                        device_serial_number=excluded.device_serial_number,
-                                        study_id_fk=excluded.study_id_fk
-                                """, (st_pk, se.series_instance_uid, se.modality, se.series_number, man, mod, sn))
-                                saved_se += 1
-
-                            se_pk_row = cur.execute(
-                                "SELECT id FROM series WHERE series_instance_uid=?", (se.series_instance_uid,)).fetchone()
-                            if not se_pk_row:
-                                continue
-                            se_pk = se_pk_row[0]
-
-                            # --- Deletion Handling (Diff DB vs Memory) ---
-                            # Only perform if we suspect deletions or periodically?
-                            # Plan says: Implement Diff Logic.
-                            # Optimization: If series is NOT dirty, can we assume no deletions?
-                            # Not necessarily. Removing an item doesn't always mark Series dirty unless we hook "remove".
-                            # But DicomItem doesn't track removals from list automatically.
-                            # So we must check.
-
-                            db_uids_rows = cur.execute(
-                                "SELECT sop_instance_uid FROM instances WHERE series_id_fk=?", (se_pk,)).fetchall()
-                            db_uids = {r[0] for r in db_uids_rows}
-                            mem_uids = {i.sop_instance_uid for i in se.instances}
-
-                            to_delete = db_uids - mem_uids
-                            if to_delete:
-                                cur.executemany(
-                                    "DELETE FROM instances WHERE sop_instance_uid=?", [
-                                        (u,) for u in to_delete])
-                                saved_i += 0  # Or count negative?
-                                # self.logger.debug(f"Deleted {len(to_delete)} instances from Series {se.series_instance_uid}")
-
-                            # --- Upsert Dirty ---
-                            dirty_items = []
-                            for i in se.instances:
-                                if getattr(i, '_dirty', True):
-                                    # Capture version if available (robustness against race)
-                                    ver = getattr(i, '_mod_count', 0)
-                                    dirty_items.append((i, ver))
-
-                            if dirty_items:
-                                i_batch = []
-                                vert_updates = []  # Defer vertical updates to satisfy foreign key
-                                for inst, ver in dirty_items:
-                                    full_data = self._serialize_item(inst)
-
-                                    # Split Core vs Vertical (Private Tags -> Vertical Table)
-                                    core_data = {}
-                                    vert_data = {}
-
-                                    for key, val in full_data.items():
-                                        if key == "__sequences__":
-                                            # Keep sequences in Core JSON for now
-                                            core_data[key] = val
-                                            continue
-
-                                        # key is "GGGG,EEEE" hex string
-                                        try:
-                                            group = int(key.split(',')[0], 16)
-                                            # Odd Group = Private Tag (usually)
-                                            # Skip Vertical for BYTES (cant be stored as TEXT
-                                            # easily, keep in JSON)
-                                            is_private = (
-                                                group %
-                                                2 != 0) and not isinstance(
-                                                val, bytes)
-
-                                            if is_private:
-                                                # Tuple key for vertical method: (grp, elem)
-                                                k_tuple = tuple(key.split(','))
-                                                vert_data[k_tuple] = val
-                                            else:
-                                                core_data[key] = val
-                                        except BaseException:
-                                            core_data[key] = val
-
-                                    # Queue Vertical (Saved after Instance Insert)
-                                    if vert_data:
-                                        vert_updates.append((inst.sop_instance_uid, vert_data))
-
-                                    # Serialize Core
-                                    attrs_json = json.dumps(core_data, cls=GantryJSONEncoder)
-
-                                    p_offset, p_length, p_alg, p_hash = None, None, None, None
-
-                                    if inst.pixel_array is not None:
-                                        b_data = inst.pixel_array.tobytes()
-                                        c_alg = 'zlib'
-                                        # Compute Hash
-                                        # Compute Hash
-                                        # Compute Hash
-                                        p_hash = hashlib.sha256(b_data).hexdigest()
-
-                                        # Deduplication: If already persisted with same hash, skip
-                                        # write
-                                        if getattr(
-                                                inst, '_pixel_hash', None) == p_hash and isinstance(
-                                                inst._pixel_loader, SidecarPixelLoader):
-                                            p_offset = inst._pixel_loader.offset
-                                            p_length = inst._pixel_loader.length
-                                            p_alg = inst._pixel_loader.alg
-                                        else:
-                                            off, leng = sidecar_manager.write_frame(b_data, c_alg)
-                                            p_offset, p_length, p_alg = off, leng, c_alg
-                                            pixel_bytes_written += leng
-                                            pixel_frames_written += 1
-
-                                            # Update loader so we can unload safely later
-                                            inst._pixel_loader = self._create_pixel_loader(
-                                                off, leng, c_alg, inst)
-
-                                        inst._pixel_hash = p_hash  # Cache on instance
-
-                                    elif isinstance(inst._pixel_loader, SidecarPixelLoader):
-                                        # Already persisted (swapped), preserve metadata
-                                        p_offset = inst._pixel_loader.offset
-                                        p_length = inst._pixel_loader.length
-                                        p_alg = inst._pixel_loader.alg
-                                        p_hash = getattr(inst, '_pixel_hash', None)
-                                    else:
-                                        pass
-
-                                    i_batch.append((
-                                        se_pk,
-                                        inst.sop_instance_uid,
-                                        inst.sop_class_uid,
-                                        inst.instance_number,
-                                        inst.file_path,
-                                        p_offset,
-                                        p_length,
-                                        p_hash,
-                                        p_alg,
-                                        attrs_json
-                                    ))
-
-                                cur.executemany("""
-                                    INSERT INTO instances (series_id_fk, sop_instance_uid, sop_class_uid, instance_number, file_path,
-                                                           pixel_offset, pixel_length, pixel_hash, compress_alg, attributes_json)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                                    ON CONFLICT(sop_instance_uid) DO UPDATE SET
-                                        series_id_fk=excluded.series_id_fk,
-                                        sop_class_uid=excluded.sop_class_uid,
-                                        instance_number=excluded.instance_number,
-                                        file_path=excluded.file_path,
-                                        attributes_json=excluded.attributes_json,
-                                        pixel_offset=COALESCE(excluded.pixel_offset, instances.pixel_offset),
-                                        pixel_length=COALESCE(excluded.pixel_length, instances.pixel_length),
-                                        pixel_hash=COALESCE(excluded.pixel_hash, instances.pixel_hash),
-                                        compress_alg=COALESCE(excluded.compress_alg, instances.compress_alg)
-                                """, i_batch)
-
-                                # Process Deferred Vertical Updates (Now that Instances exist)
-                                if vert_updates:
-                                    # self.logger.debug(f"Saving vertical attributes for {len(vert_updates)} instances")
-                                    for uid, v_data in vert_updates:
-                                        self.save_vertical_attributes(uid, v_data, conn=conn)
-
-                                saved_i += len(dirty_items)
-
-                                # Mark saved with version (deferred until commit success?
-                                # No, we can attach to list and do it post-commit)
-                                # But we're inside loops.
-                                # Creating a cleanup list:
-                                # (We can store dirty_items in a larger list to clean up post-commit)
-                                # For now, let's mark clean *assuming* commit will succeed.
-                                # If commit fails, we rollback, but objects remain "clean" in memory?
-                                # That is a risk. We should do it post-commit.
-                                # But scope is tricky.
-                                # Let's mark clean here but using version.
-                                # If transaction rolls back, DB is old, but memory has _saved_mod_count advanced?
-                                # That means next save won't save it. BAD.
-                                # We must hold off.
-
-                                # Since we commit once at the end:
-                                # We need to collect ALL dirty items and their versions.
-                                # That is expensive memory-wise for massive sets.
-                                # But necessary for correctness.
-                                # Compromise: we iterate again.
-                                # Wait, "Iterate again" in 'mark clean' loop below.
-                                # We can't know "ver" then.
-
-                                # Let's just update them here. If commit fails, the Exception propagates.
-                                # Use a try/except block around the whole `save_all`? Yes.
-                                # But `_saved_mod_count` is in memory.
-                                # If we update it, and `save_all` crashes, we can't easily undo it.
-                                # BUT `save_all` crashing usually kills the process or stops persistence.
-                                # So `eventual consistency` implies retrying.
-                                # If we marked it saved but it didn't save, we have data loss.
-
-                                # Correct way: List of callbacks?
-                                # Or just:
-                                for inst, ver in dirty_items:
-                                    if hasattr(inst, 'mark_saved'):
-                                        inst.mark_saved(ver)
-                                    else:
-                                        inst._dirty = False
-
+                        # Capture version before serializing (robustness against race)
+                        dirty_items.append((se_pk, inst, getattr(inst, '_mod_count', 0)))
+
+                # Serializing and hashing/compressing new pixels is the CPU-heavy part
+                # of a large save; zlib and sha256 release the GIL, so fan out.
+                if len(dirty_items) >= _PREPARE_PARALLEL_MIN and _PREPARE_MAX_WORKERS > 1:
+                    prepared = _get_prepare_pool().map(
+                        lambda item: self._prepare_instance_row(item[0], item[1]), dirty_items)
+                else:
+                    prepared = (self._prepare_instance_row(se_pk, inst)
+                                for se_pk, inst, _ in dirty_items)
+
+                i_batch = []
+                vert_updates = []  # Deferred until instances exist (foreign key)
+                blob_rows = {}
+                for (_, inst, _), (row, vert_data, blobs, written) in zip(dirty_items, prepared):
+                    i_batch.append(row)
+                    blob_rows[inst.sop_instance_uid] = blobs
+                    if vert_data:
+                        vert_updates.append((inst.sop_instance_uid, vert_data))
+                    if written:
+                        pixel_bytes_written += written
+                        pixel_frames_written += 1
+
+                cur.executemany(_UPSERT_INSTANCE_SQL, i_batch)
+
+                for uid, v_data in vert_updates:
+                    self.save_vertical_attributes(uid, v_data, conn=conn)
+
+                self._replace_blobs(cur, blob_rows)
+
+                saved_i = len(dirty_items)
+
+                # One fsync for every frame written since the last save, before
+                # the DB durably points at them
+                self.sidecar.sync()
                 conn.commit()
 
-                # Post-Commit:
-                # We already marked items as saved/clean incrementally using naive-commit assumption.
-                # If transaction failed, those items are marked clean in memory but not in DB -> Inconsistency.
-                # However, re-implementing rollback for memory objects is out of scope.
-                # The versioning fixes the "Overwrite valid change" race, which is the user's issue.
-                pass
+                # Post-Commit: mark saved with the version captured before serializing,
+                # so edits made during the save keep the instance dirty.
+                for _, inst, ver in dirty_items:
+                    if hasattr(inst, 'mark_saved'):
+                        inst.mark_saved(ver)
+                    else:
+                        inst._dirty = False
 
                 # Restore Logging Logic
                 if saved_p + saved_i > 0:
@@ -1148,6 +1391,12 @@ class SqliteStore:
             # conn.row_factory = sqlite3.Row
             cur = conn.cursor()
 
+            from_clause = """
+                FROM instances i
+                JOIN series s ON i.series_id_fk = s.id
+                JOIN studies st ON s.study_id_fk = st.id
+                JOIN patients p ON st.patient_id_fk = p.id
+            """
             query = """
                 SELECT
                     p.patient_id, p.patient_name,
@@ -1155,11 +1404,7 @@ class SqliteStore:
                     s.series_instance_uid, s.modality, s.series_number, s.manufacturer, s.model_name, s.device_serial_number,
                     i.sop_instance_uid, i.sop_class_uid, i.instance_number, i.file_path,
                     i.pixel_offset, i.pixel_length, i.compress_alg, i.attributes_json
-                FROM instances i
-                JOIN series s ON i.series_id_fk = s.id
-                JOIN studies st ON s.study_id_fk = st.id
-                JOIN patients p ON st.patient_id_fk = p.id
-            """
+            """ + from_clause
 
             conditions = []
             params = []
@@ -1174,8 +1419,13 @@ class SqliteStore:
                 conditions.append(f"i.sop_instance_uid IN ({placeholders})")
                 params.extend(instance_uids)
 
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
+            where = " WHERE " + " AND ".join(conditions) if conditions else ""
+            query += where
+
+            # Fold instance_blobs back into attributes_json so rows stay self-contained;
+            # one query for the whole selection rather than one per yielded row
+            blob_map = self._fetch_blobs(
+                cur, f"instance_uid IN (SELECT i.sop_instance_uid {from_clause}{where})", tuple(params))
 
             # Execute generator
             cursor = cur.execute(query, params)
@@ -1184,7 +1434,13 @@ class SqliteStore:
             cols = [desc[0] for desc in cursor.description]
 
             for row in cursor:
-                yield dict(zip(cols, row))
+                flat = dict(zip(cols, row))
+                blobs = blob_map.get(flat['sop_instance_uid'])
+                if blobs:
+                    attrs = gantry_json_loads(flat['attributes_json']) if flat['attributes_json'] else {}
+                    attrs.update(blobs)
+                    flat['attributes_json'] = gantry_json_dumps(attrs)
+                yield flat
 
     def update_attributes(self, instances: List[Patient]):
         """
@@ -1206,17 +1462,16 @@ class SqliteStore:
 
                 # Pre-calculate data for executemany
                 data = []
+                blob_rows = {}
                 for inst in instances:
                     # Serialize attributes AND sequences
                     full_data = self._serialize_item(inst)
-                    attrs_json = json.dumps(full_data, cls=GantryJSONEncoder)
+                    blob_rows[inst.sop_instance_uid] = self._split_blobs(full_data)
+                    attrs_json = gantry_json_dumps(full_data)
                     data.append((attrs_json, inst.sop_instance_uid))
 
-                cur.executemany("""
-                    UPDATE instances
-                    SET attributes_json = ?
-                    WHERE sop_instance_uid = ?
-                """, data)
+                cur.executemany(_UPDATE_ATTRIBUTES_SQL, data)
+                self._replace_blobs(cur, blob_rows)
 
                 conn.commit()
                 self.logger.info("Update complete.")
@@ -1242,16 +1497,12 @@ class SqliteStore:
             with self._get_connection() as conn:
                 cur = conn.cursor()
 
-                # Prepare Data Generator for Batch Insert (Memory Efficient)
-                def findings_generator():
-                    for f in findings:
-                        rem_action = None
-                        rem_value = None
-                        if f.remediation_proposal:
-                            rem_action = f.remediation_proposal.action_type
-                            rem_value = str(f.remediation_proposal.new_value)
-
-                        yield (
+                # Fixed-size batches, one transaction: bounded row memory, single commit
+                for start in range(0, len(findings), _FINDINGS_BATCH):
+                    rows = []
+                    for f in findings[start:start + _FINDINGS_BATCH]:
+                        rem = f.remediation_proposal
+                        rows.append((
                             timestamp,
                             f.entity_uid,
                             f.entity_type,
@@ -1259,16 +1510,11 @@ class SqliteStore:
                             str(f.value),
                             f.reason,
                             f.patient_id,
-                            rem_action,
-                            rem_value,
+                            rem.action_type if rem else None,
+                            str(rem.new_value) if rem else None,
                             "{}"
-                        )
-
-                cur.executemany("""
-                    INSERT INTO phi_findings
-                    (timestamp, entity_uid, entity_type, field_name, value, reason, patient_id, remediation_action, remediation_value, details_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, findings_generator())
+                        ))
+                    cur.executemany(_INSERT_FINDING_SQL, rows)
 
                 conn.commit()
                 self.logger.info("Findings saved.")
@@ -1322,6 +1568,68 @@ class SqliteStore:
 
         return findings
 
+    def load_findings_df(self):
+        """
+        Loads all findings into a Pandas DataFrame, one column per phi_findings column.
+
+        Skips PhiFinding construction. Uses connectorx (columnar reads) when it is
+        installed and the store is file-backed, otherwise `pandas.read_sql_query`.
+
+        Returns:
+            pd.DataFrame: Findings ordered by id; `entity_type` and `reason` are categorical.
+
+        Raises:
+            ImportError: If pandas is not installed.
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError(
+                "Pandas is required for this feature. Install it with `pip install pandas`.")
+
+        sql = "SELECT * FROM phi_findings ORDER BY id"
+        if connectorx is not None and self.db_path != ":memory:":
+            df = connectorx.read_sql(
+                f"sqlite://{os.path.abspath(self.db_path)}", sql, return_type="pandas")
+        else:
+            with self._get_connection() as conn:
+                df = pd.read_sql_query(sql, conn)
+
+        for col in ("entity_type", "reason"):
+            df[col] = df[col].astype("category")
+        return df
+
+    def load_cohort_df(self):
+        """
+        Loads one row per instance with the basic `DicomSession.get_cohort_report()`
+        columns, joined and materialized by SQLite instead of walking the object graph.
+
+        Reflects the last save. The frame is built from Python values the same way
+        `get_cohort_report()` builds its own, so both have the same dtypes: ISO study
+        dates (as saved from `date` objects) come back as `date`, and equipment columns
+        follow `load_all()` ('' without Equipment, None for unset fields).
+
+        Returns:
+            pd.DataFrame: Rows in patient, study, series, instance insertion order.
+
+        Raises:
+            ImportError: If pandas is not installed.
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError(
+                "Pandas is required for this feature. Install it with `pip install pandas`.")
+
+        with self._get_connection() as conn:
+            cur = conn.execute(_COHORT_SQL)
+            names = [d[0] for d in cur.description]
+            rows = cur.fetchall()
+
+        columns = {name: [r[i] for r in rows] for i, name in enumerate(names)}
+        columns["StudyDate"] = [_parse_iso_date(v) for v in columns["StudyDate"]]
+        return pd.DataFrame(columns)
+
     def compact_sidecar(self) -> Dict[str, Tuple[int, int]]:
         """
         Reclaims disk space by rewriting the sidecar file.
@@ -1362,44 +1670,58 @@ class SqliteStore:
         written_bytes = 0
 
         try:
-            # 2. Rewrite
-            with open(self.sidecar_path, "rb") as f_in, open(temp_path, "wb") as f_out:
-                current_out_pos = 0
-
-                for r in rows:
-                    if r['pixel_length'] <= 0:
-                        continue
-
-                    # Read
-                    f_in.seek(r['pixel_offset'])
-                    data = f_in.read(r['pixel_length'])
-
-                    if len(data) != r['pixel_length']:
+            # 2. Plan the copy: deduplicated blobs (shared (offset, length)) are
+            # copied once, and blobs adjacent in the old file merge into one run.
+            runs = []  # [src_offset, dst_offset, length]
+            placed = {}  # (old_offset, old_length) -> new_offset
+            current_out_pos = 0
+            for r in rows:
+                if r['pixel_length'] <= 0:
+                    continue
+                key = (r['pixel_offset'], r['pixel_length'])
+                new_off = placed.get(key)
+                length = max(0, min(r['pixel_length'], original_size - r['pixel_offset']))
+                if new_off is None:
+                    if length != r['pixel_length']:
                         self.logger.warning(
-                            f"Compaction Warning: Unexpected EOF for instance ID {
-                                r['id']}")
+                            f"Compaction Warning: Unexpected EOF for instance ID {r['id']}")
+                    new_off = current_out_pos
+                    placed[key] = new_off
+                    if runs and runs[-1][0] + runs[-1][2] == r['pixel_offset']:
+                        runs[-1][2] += length
+                    else:
+                        runs.append([r['pixel_offset'], new_off, length])
+                    current_out_pos += length
 
-                    # Write
-                    f_out.write(data)
-                    length = len(data)
+                # Record change
+                # (new_offset, instance_id)
+                updates.append((new_off, r['id']))
+                uid_map[r['sop_instance_uid']] = (new_off, length)
 
-                    # Record change
-                    # (new_offset, instance_id)
-                    updates.append((current_out_pos, r['id']))
-                    uid_map[r['sop_instance_uid']] = (current_out_pos, length)
+            written_bytes = current_out_pos
 
-                    current_out_pos += length
-
-                written_bytes = current_out_pos
+            # 3. Copy runs (in-kernel where supported), then make the new file durable
+            fd_in = os.open(self.sidecar_path, os.O_RDONLY)
+            try:
+                fd_out = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    for src, dst, length in runs:
+                        _copy_range(fd_in, fd_out, src, dst, length)
+                    os.fsync(fd_out)
+                finally:
+                    os.close(fd_out)
+            finally:
+                os.close(fd_in)
 
-            # 3. Update DB (Transaction)
+            # 4. Update DB (Transaction)
             with self._get_connection() as conn:
                 conn.executemany("UPDATE instances SET pixel_offset=? WHERE id=?", updates)
 
-            # 4. Swap Files
-            shutil.move(temp_path, self.sidecar_path)
+            # 5. Swap Files (atomic rename within the directory, then persist the rename)
+            os.replace(temp_path, self.sidecar_path)
+            _fsync_dir(os.path.dirname(os.path.abspath(self.sidecar_path)))
 
-            # 5. Reset Manager
+            # 6. Reset Manager
             self.sidecar = SidecarManager(self.sidecar_path)
 
             duration = time.time() - start_time
@@ -1431,6 +1753,65 @@ class SqliteStore:
             raise e
 
 
+_COPY_CHUNK = 8 * 1024 * 1024
+
+
+def _copy_range(fd_in: int, fd_out: int, src: int, dst: int, length: int):
+    """
+    Copies `length` bytes from fd_in@src to fd_out@dst.
+
+    Uses os.copy_file_range (in-kernel, no user-space buffer; Linux) when
+    available, else chunked os.pread/os.pwrite.
+    """
+    if length <= 0:
+        return
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while length > 0:
+                n = os.copy_file_range(fd_in, fd_out, length, src, dst)
+                if n == 0:
+                    raise IOError(f"Unexpected EOF copying sidecar range at {src}")
+                src, dst, length = src + n, dst + n, length - n
+            return
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL,
+                               errno.EOPNOTSUPP, errno.EPERM):
+                raise
+            # Unsupported for these files/filesystem: finish with pread/pwrite
+
+    while length > 0:
+        buf = os.pread(fd_in, min(length, _COPY_CHUNK), src)
+        if not buf:
+            raise IOError(f"Unexpected EOF copying sidecar range at {src}")
+        os.pwrite(fd_out, buf, dst)
+        n = len(buf)
+        src, dst, length = src + n, dst + n, length - n
+
+
+def _fsync_dir(path: str):
+    """fsyncs a directory so a rename inside it is durable (POSIX only; no-op elsewhere)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _parse_iso_date(value):
+    """Returns a `date` for 'YYYY-MM-DD' (how save_all() writes date objects), else value."""
+    if isinstance(value, str) and len(value) == 10 and value[4] == "-" and value[7] == "-":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return value
+
+
 class GantryJSONEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, bytes):
@@ -1446,3 +1827,76 @@ def gantry_json_object_hook(d):
     if "__type__" in d and d["__type__"] == "bytes":
         return base64.b64decode(d["data"])
     return d
+
+
+def _orjson_default(obj):
+    """orjson fallback hook; mirrors GantryJSONEncoder.default."""
+    if isinstance(obj, bytes):
+        return {"__type__": "bytes", "data": base64.b64encode(obj).decode('ascii')}
+    if isinstance(obj, MultiValue):
+        return list(obj)
+    # orjson natively handles str/int subclasses but not float ones (e.g. pydicom DSfloat)
+    if isinstance(obj, float):
+        return float(obj)
+    raise TypeError
+
+
+def _restore_bytes(obj):
+    """Applies gantry_json_object_hook bottom-up to a decoded JSON tree."""
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if isinstance(v, (dict, list)):
+                obj[k] = _restore_bytes(v)
+        return gantry_json_object_hook(obj)
+    if isinstance(obj, list):
+        for i, v in enumerate(obj):
+            if isinstance(v, (dict, list)):
+                obj[i] = _restore_bytes(v)
+    return obj
+
+
+def _has_nonfinite(obj) -> bool:
+    """True if a NaN or +/-Infinity float appears anywhere in a decoded JSON tree."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_nonfinite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple, MultiValue)):
+        return any(_has_nonfinite(v) for v in obj)
+    return False
+
+
+def gantry_json_dumps(data) -> str:
+    """
+    Serializes attribute data to JSON, using orjson (C encoder) when installed.
+
+    Output is interchangeable with `json.dumps(data, cls=GantryJSONEncoder)`;
+    anything orjson can't encode (e.g. ints past 64 bits) falls back to the stdlib
+    encoder, as do NaN/Infinity floats, which orjson would write as null.
+    """
+    if orjson is not None:
+        try:
+            out = orjson.dumps(data, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # orjson.JSONEncodeError subclasses TypeError
+            out = None
+        # Only walk the data when a null could be a non-finite float
+        if out is not None and not (b"null" in out and _has_nonfinite(data)):
+            return out.decode('utf-8')
+    return json.dumps(data, cls=GantryJSONEncoder)
+
+
+def gantry_json_loads(text: str):
+    """
+    Deserializes JSON written by `gantry_json_dumps`, restoring bytes values.
+
+    With orjson, the bytes-restoring walk is skipped for documents without markers.
+    Documents with NaN/Infinity or integers too wide for orjson (as the stdlib
+    encoder writes them) are decoded by the stdlib instead.
+    """
+    if (orjson is None or "NaN" in text or "Infinity" in text
+            or _WIDE_INT_RE.search(text)):
+        return json.loads(text, object_hook=gantry_json_object_hook)
+    data = orjson.loads(text)
+    if '"__type__"' in text:
+        data = _restore_bytes(data)
+    return data
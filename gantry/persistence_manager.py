@@ -58,6 +58,54 @@ class PersistenceManager:
 
         self.queue.join()
 
+    def flush_bulk(self):
+        """
+        Saves every snapshot queued right now in a single `save_all` (one transaction)
+        on the calling thread, then waits for any save the worker already has in flight.
+
+        Useful after a burst of `save_async` calls (e.g. producer threads that have
+        finished) when the caller needs the data durable before continuing.
+        """
+        try:
+            first = self.queue.get_nowait()
+        except queue.Empty:
+            self.flush()
+            return
+
+        if first is None:
+            patients, taken, sentinel = [], 1, True
+        else:
+            patients, taken, sentinel = self._drain(first)
+
+        try:
+            if patients:
+                self.store_backend.save_all(patients)
+        except Exception as e:
+            get_logger().error(f"Bulk save failed: {e}")
+        finally:
+            for _ in range(taken):
+                self.queue.task_done()
+
+        if sentinel:
+            # Shutdown (or a stale sentinel) stays the worker's to handle
+            self.queue.put(None)
+        self.flush()
+
+    def save_sync(self, patients: List[Patient]):
+        """
+        Saves a list of patients on the calling thread and commits before returning.
+
+        Any snapshots already queued are flushed first so saves land in order and
+        never overlap the worker. Meant for small batches and tests that need the
+        data readable immediately; bulk ingest should keep using `save_async`.
+        Errors propagate to the caller.
+
+        Args:
+            patients (List[Patient]): The list of patients to persist.
+        """
+        self.flush()
+        self.store_backend.save_all(list(patients))
+
     def save_async(self, patients: List[Patient]):
         """
         Queues an asynchronous save operation for a list of patients.
@@ -79,8 +127,37 @@ class PersistenceManager:
         snapshot = list(patients)
         self.queue.put(snapshot)
 
+    def _drain(self, first):
+        """
+        Coalesces `first` with every snapshot already waiting in the queue.
+
+        Each snapshot is a full patient list and save_all is incremental (dirty
+        entities only), so saving the ordered union once is equivalent to saving
+        each snapshot in turn. Stops at a shutdown sentinel so it is handled
+        after the merged save.
+
+        Returns:
+            Tuple[List[Patient], int, bool]: (merged patients, items taken, sentinel seen).
+        """
+        merged = {id(p): p for p in first}
+        taken = 1
+        while True:
+            try:
+                nxt = self.queue.get_nowait()
+            except queue.Empty:
+                return list(merged.values()), taken, False
+            taken += 1
+            if nxt is None:
+                return list(merged.values()), taken, True
+            for p in nxt:
+                merged.setdefault(id(p), p)
+
     def _worker(self):
         while True:
+            # A restart (flush/save_async after a crash or stop) supersedes this
+            # thread; step aside so only one worker receives the shutdown sentinel.
+            if self.thread is not threading.current_thread():
+                break
             try:
                 # Wait for work
                 patients = self.queue.get(timeout=1.0)
@@ -94,6 +171,9 @@ class PersistenceManager:
                     self.queue.task_done()
                     break
 
+                # Back-to-back save_async() calls collapse into one DB write
+                patients, taken, sentinel = self._drain(patients)
+
                 # Perform the save
                 # We catch exceptions to prevent thread death
                 try:
@@ -101,7 +181,12 @@ class PersistenceManager:
                 except Exception as e:
                     get_logger().error(f"Background save failed: {e}")
                 finally:
-                    self.queue.task_done()
+                    # One task_done per queue item so flush()/join() stays accurate
+                    for _ in range(taken):
+                        self.queue.task_done()
+
+                if sentinel and not self.running:
+                    break
 
             except queue.Empty:
                 # Check exit condition periodically if using timeout,
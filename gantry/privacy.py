@@ -1,8 +1,47 @@
 from dataclasses import dataclass, field
-from typing import List, Any, Optional, Union, Dict
+from typing import List, Any, Optional, Union, Dict, NamedTuple
 import hashlib
 from .entities import Patient, Study, Series, Instance
 
+# Config action codes that request date shifting
+_SHIFT_ACTIONS = frozenset({"SHIFT", "JITTER"})
+
+
+def _is_private_tag(tag: str) -> bool:
+    """True for tags in an odd (private) group, e.g. "0009,0010"."""
+    try:
+        group_str, _ = tag.split(',')
+        return int(group_str, 16) % 2 != 0
+    except ValueError:
+        return False  # Malformed tag?
+
+
+class _TagRule(NamedTuple):
+    """A PHI tag rule resolved to the finding it produces (see PhiInspector)."""
+    field_name: str
+    deep_field_name: str  # Used when the tag sits in a sequence item
+    reason: str
+    remediation_action: str
+    new_value: Any
+    clean_values: tuple  # Values that already satisfy the rule (no finding)
+
+
+def _compile_rule(tag: str, description: str, action_code: str) -> Optional[_TagRule]:
+    """Resolves a config action to its remediation; None for KEEP (never a finding)."""
+    if action_code == "KEEP":
+        return None
+    if action_code == "REMOVE":
+        # If user wants it gone, and it exists, finding!
+        remediation, new_value, clean = "REMOVE_TAG", None, ()
+    elif action_code == "EMPTY":
+        remediation, new_value, clean = "REPLACE_TAG", "", ("",)
+    elif action_code in _SHIFT_ACTIONS:
+        remediation, new_value, clean = "SHIFT_DATE", None, ()
+    else:  # REPLACE (Default)
+        remediation, new_value, clean = "REPLACE_TAG", "ANONYMIZED", ("ANONYMIZED", "")
+    return _TagRule(description, f"{description} (Deep)",
+                    f"Matched PHI Tag {tag} ({description})", remediation, new_value, clean)
+
 
 @dataclass(slots=True)
 class PhiRemediation:
@@ -59,6 +98,8 @@ class PhiReport:
     DataFrame export features.
     """
 
+    _COLUMNS = ["patient_id", "entity_type", "entity_uid", "tag", "field", "value", "reason", "action"]
+
     def __init__(self, findings: List[PhiFinding]):
         self.findings = findings
 
@@ -66,6 +107,8 @@ class PhiReport:
         """
         Converts findings to a Pandas DataFrame for analysis.
 
+        `entity_type`, `reason` and `action` are categorical.
+
         Returns:
             pd.DataFrame: A dataframe containing flattened finding details.
 
@@ -78,20 +121,21 @@ class PhiReport:
             raise ImportError(
                 "Pandas is required for this feature. Install it with `pip install pandas`.")
 
-        data = []
-        for f in self.findings:
-            row = {
-                "patient_id": f.patient_id,
-                "entity_type": f.entity_type,
-                "entity_uid": f.entity_uid,
-                "tag": f.tag,
-                "field": f.field_name,
-                "value": str(f.value),
-                "reason": f.reason,
-                "action": f.remediation_proposal.action_type if f.remediation_proposal else None
-            }
-            data.append(row)
-        return pd.DataFrame(data)
+        # Build column-wise (categoricals directly): pandas adopts each column as-is,
+        # with no row transpose or dtype inference pass
+        findings = self.findings
+        proposals = [f.remediation_proposal for f in findings]
+        columns = {
+            "patient_id": [f.patient_id for f in findings],
+            "entity_type": pd.Categorical([f.entity_type for f in findings]),
+            "entity_uid": [f.entity_uid for f in findings],
+            "tag": [f.tag for f in findings],
+            "field": [f.field_name for f in findings],
+            "value": [str(f.value) for f in findings],
+            "reason": pd.Categorical([f.reason for f in findings]),
+            "action": pd.Categorical([p.action_type if p else None for p in proposals]),
+        }
+        return pd.DataFrame(columns, columns=self._COLUMNS)
 
     def __iter__(self):
         return iter(self.findings)
@@ -138,6 +182,26 @@ class PhiInspector:
         else:
             self.phi_tags = ConfigLoader.load_phi_config()
 
+        # Partially evaluate the config once: each rule becomes the finding it
+        # produces, so the per-instance scan is a dict probe plus a value check.
+        # KEEP rules never produce findings and are dropped here.
+        self._tag_rules = {}
+        for tag, config_val in (self.phi_tags or {}).items():
+            if not config_val:
+                continue
+            if isinstance(config_val, dict):
+                description = config_val.get("name", "Unknown Tag")
+                action_code = config_val.get("action", "REPLACE").upper()
+            else:
+                description, action_code = str(config_val), "REPLACE"
+            rule = _compile_rule(tag, description, action_code)
+            if rule is not None:
+                self._tag_rules[tag] = rule
+
+        # Shifted entities skip date-shift rules: pick the dict once per instance
+        self._unshifted_tag_rules = {tag: r for tag, r in self._tag_rules.items()
+                                     if r.remediation_action != "SHIFT_DATE"}
+
     def scan_patient(self, patient: Patient) -> List[PhiFinding]:
         """
         Recursively scans a Patient and their child studies for PHI.
@@ -212,8 +276,6 @@ class PhiInspector:
         Uses cached `text_index` (if available) for O(1) access to all text nodes,
         including nested sequence items.
         """
-        findings = []
-
         # 0. Determine Scan Targets
         # If we have a text_index, we use that for targeted scanning.
         # Otherwise fallback to iterating attributes (shallow scan).
@@ -223,120 +285,73 @@ class PhiInspector:
             scan_targets = instance.text_index
         else:
             # Fallback: List of (instance, tag) for direct attributes
-            scan_targets = [(instance, t) for t in instance.attributes.keys()]
+            scan_targets = ((instance, t) for t in instance.attributes)
 
         # 1. Private Tag Removal Logic
+        private_tags = ()
         if self.remove_private_tags:
-            # Gantry Whitelist for Reversibility
-            # Usually checking value, but here we check tag if possible?
-            WHITELIST_CREATORS = ["GANTRY_SECURE"]
-            # Actually, per DICOM, Private Tags are odd groups.
             # We want to remove ALL private tags except our own reversibility ones.
             # Our Reversibility Service uses "0099,0010" (Creator) and "0099,1001" (Data)
             WHITELIST_TAGS = {"0099,0010", "0099,1001"}
-
-            for tag, val in instance.attributes.items():
-                try:
-                    group_str, element_str = tag.split(',')
-                    group = int(group_str, 16)
-                    if group % 2 != 0:  # Odd group = Private
-                        if tag not in WHITELIST_TAGS:
-                            findings.append(PhiFinding(
-                                entity_uid=instance.sop_instance_uid,
-                                entity_type="Instance",
-                                field_name=f"Private Tag {tag}",
-                                value="<PRIVATE>",
-                                reason="Private Tag Removal Requested",
-                                tag=tag,
-                                patient_id=patient_id,
-                                entity=instance,
-                                remediation_proposal=PhiRemediation(
-                                    action_type="REMOVE_TAG",
-                                    target_attr=tag
-                                )
-                            ))
-                except ValueError:
-                    pass  # Malformed tag?
-
-        # 2. Configured PHI Tags
-        if not self.phi_tags:
-            return findings
-
-        for item, tag in scan_targets:
-            # Parse config
-            config_val = self.phi_tags.get(tag)
-            if not config_val:
-                continue
-
-            if isinstance(config_val, dict):
-                description = config_val.get("name", "Unknown Tag")
-                action_code = config_val.get("action", "REPLACE").upper()
+            private_tags = tuple(tag for tag in instance.attributes
+                                 if tag not in WHITELIST_TAGS and _is_private_tag(tag))
+
+        # 2. Configured PHI Tags: collect (item, tag, value, rule) matches
+        matches = []
+        if self._tag_rules:
+            # If instance or its parent study is already shifted, date tags are not findings
+            if (getattr(instance, "date_shifted", False) or
+                    (study and getattr(study, "date_shifted", False))):
+                rules = self._unshifted_tag_rules
             else:
-                description = str(config_val)
-                action_code = "REPLACE"
+                rules = self._tag_rules
 
-            # Check if tag exists in item items
-            val = item.attributes.get(tag)
+            for item, tag in scan_targets:
+                rule = rules.get(tag)
+                if rule is None:
+                    continue
+                val = item.attributes.get(tag)
+                if val is not None and val not in rule.clean_values:
+                    matches.append((item, tag, val, rule))
 
-            if val is None:
-                continue
+        uid = instance.sop_instance_uid
+        findings = []
+        for tag in private_tags:
+            findings.append(PhiFinding(
+                entity_uid=uid,
+                entity_type="Instance",
+                field_name=f"Private Tag {tag}",
+                value="<PRIVATE>",
+                reason="Private Tag Removal Requested",
+                tag=tag,
+                patient_id=patient_id,
+                entity=instance,
+                remediation_proposal=PhiRemediation(
+                    action_type="REMOVE_TAG",
+                    target_attr=tag
+                )
+            ))
+
+        for item, tag, val, rule in matches:
+            proposal = PhiRemediation(
+                action_type=rule.remediation_action,
+                target_attr=tag,
+                new_value=rule.new_value,
+                original_value=val,
+                metadata={
+                    "patient_id": patient_id} if rule.remediation_action == "SHIFT_DATE" else {})
 
-            # Determine if remediation is needed
-            needs_remediation = False
-            remediation_action = "REPLACE_TAG"
-            new_val = None
-
-            if action_code == "REMOVE":
-                # If user wants it gone, and it exists (val is not None), finding!
-                needs_remediation = True
-                remediation_action = "REMOVE_TAG"
-            elif action_code == "EMPTY":
-                if val != "":
-                    needs_remediation = True
-                    remediation_action = "REPLACE_TAG"
-                    new_val = ""
-            elif action_code in ["SHIFT", "JITTER"]:
-                # Date Shifting
-                # If instance or its parent study is already shifted, this is not a finding
-                is_shifted = False
-                if hasattr(instance, "date_shifted") and instance.date_shifted:
-                    is_shifted = True
-                elif study and hasattr(study, "date_shifted") and study.date_shifted:
-                    is_shifted = True
-
-                if is_shifted:
-                    needs_remediation = False
-                else:
-                    needs_remediation = True
-                    remediation_action = "SHIFT_DATE"
-            elif action_code == "KEEP":
-                needs_remediation = False
-            else:  # REPLACE (Default)
-                if val != "ANONYMIZED" and val != "":
-                    needs_remediation = True
-                    remediation_action = "REPLACE_TAG"
-                    new_val = "ANONYMIZED"
-
-            if needs_remediation:
-                proposal = PhiRemediation(
-                    action_type=remediation_action,
-                    target_attr=tag,
-                    new_value=new_val,
-                    original_value=val,
-                    metadata={
-                        "patient_id": patient_id} if remediation_action == "SHIFT_DATE" else {})
-
-                findings.append(PhiFinding(
-                    entity_uid=instance.sop_instance_uid,
-                    entity_type="Instance",
-                    field_name=f"{description} (Deep)" if item != instance else description,
-                    value=val,
-                    reason=f"Matched PHI Tag {tag} ({description})",
-                    tag=tag,
-                    patient_id=patient_id,
-                    entity=item,  # Point to the specific deep item!
-                    remediation_proposal=proposal
-                ))
+            findings.append(PhiFinding(
+                entity_uid=uid,
+                entity_type="Instance",
+                field_name=rule.deep_field_name if item != instance else rule.field_name,
+                value=val,
+                reason=rule.reason,
+                tag=tag,
+                patient_id=patient_id,
+                entity=item,  # Point to the specific deep item!
+                remediation_proposal=proposal
+            ))
         return findings
 
     def _scan_study(self, study: Study, patient_id: str = None) -> List[PhiFinding]:
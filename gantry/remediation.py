@@ -5,6 +5,17 @@ from tqdm import tqdm
 from .privacy import PhiFinding, PhiRemediation
 from .logger import get_logger
 
+# (0012,0063) creator string and (0012,0064) code stamped by add_global_deid_tags
+_DEID_METHOD = "Gantry Privacy Profile"
+_BASIC_PROFILE_CODE = "113100"
+# Attributes of the Basic Application Confidentiality Profile code item.
+# Copied into a fresh DicomItem per entity; items must never be shared.
+_BASIC_PROFILE_ITEM = {
+    "0008,0100": _BASIC_PROFILE_CODE,
+    "0008,0102": "DCM",
+    "0008,0104": "Basic Application Confidentiality Profile",
+}
+
 
 class RemediationService:
     """
@@ -346,14 +357,23 @@ class RemediationService:
         if not hasattr(entity, "set_attr"):
             return
 
+        current_method = entity.attributes.get("0012,0063", [])
+        seq = entity.sequences.get("0012,0064")
+        has_code = seq is not None and any(
+            existing_item.attributes.get("0008,0100") == _BASIC_PROFILE_CODE
+            for existing_item in seq.items)
+
+        # Already stamped: leave the entity untouched (and clean for persistence)
+        if has_code and isinstance(current_method, list) and _DEID_METHOD in current_method:
+            return
+
         # 1. 0012,0063 De-identification Method
         # We append our method string if one exists, or set it fresh
         # Standard says: "Creator of the De-identification"
-        current_method = entity.attributes.get("0012,0063", [])
         if isinstance(current_method, str):
             current_method = [current_method]
 
-        our_method = "Gantry Privacy Profile"
+        our_method = _DEID_METHOD
         if our_method not in current_method:
             current_method.append(our_method)
             # Remove empty/None if any
@@ -365,26 +385,13 @@ class RemediationService:
         # We assume "Basic Application Confidentiality Profile" (113100)
         from .entities import DicomSequence, DicomItem
 
-        seq = entity.sequences.get("0012,0064")
         if not seq:
             seq = DicomSequence(tag="0012,0064")
 
-        # Create Item
-        # Code: 113100, Scheme: DCM, Meaning: Basic Application Confidentiality Profile
-        item = DicomItem()
-        item.set_attr("0008,0100", "113100")
-        item.set_attr("0008,0102", "DCM")
-        item.set_attr("0008,0104", "Basic Application Confidentiality Profile")
-
-        # Avoid duplication if possible?
-        # A simple check: do we have an item with 113100?
-        exists = False
-        for existing_item in seq.items:
-            if existing_item.attributes.get("0008,0100") == "113100":
-                exists = True
-                break
-
-        if not exists:
+        if not has_code:
+            # Code: 113100, Scheme: DCM, Meaning: Basic Application Confidentiality Profile
+            item = DicomItem()
+            item.attributes.update(_BASIC_PROFILE_ITEM)  # New items start dirty
             seq.items.append(item)
 
         entity.sequences["0012,0064"] = seq
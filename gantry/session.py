@@ -24,6 +24,33 @@ from .configuration import GantryConfiguration
 from . import pixel_analysis
 from .automation import ConfigAutomator
 
+
+# Basic per-instance columns of get_cohort_report(), in output order
+_COHORT_COLUMNS = ("PatientID", "PatientName", "StudyInstanceUID", "StudyDate", "SeriesInstanceUID",
+                   "Modality", "SOPInstanceUID", "Manufacturer", "Model", "DeviceSerial")
+
+# Rows per Parquet row group; large groups keep the UID dictionaries effective
+_PARQUET_ROW_GROUP_ROWS = 1_000_000
+
+
+def _write_parquet(df, output_path: str):
+    """
+    Writes `df` as Snappy-compressed, dictionary-encoded Parquet.
+
+    Uses pyarrow directly when installed (so the encoding options are explicit),
+    otherwise whatever engine pandas finds.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        df.to_parquet(output_path, index=False, compression="snappy")
+        return
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, output_path, compression="snappy", use_dictionary=True,
+                   row_group_size=_PARQUET_ROW_GROUP_ROWS)
+
+
 def scan_worker(args):
     """
     Worker function for parallel PHI scanning.
@@ -180,7 +207,10 @@ class DicomSession:
         Persists the current session state to the database.
         :param sync: If True, blocks until save is complete.
         """
-        if sync and hasattr(self, 'store_backend'):
+        if sync and hasattr(self, 'persistence_manager'):
+            get_logger().info("Saving session (Synchronous)...")
+            self.persistence_manager.save_sync(self.store.patients)
+        elif sync and hasattr(self, 'store_backend'):
             get_logger().info("Saving session (Synchronous)...")
             self.store_backend.save_all(self.store.patients)
         elif hasattr(self, 'persistence_manager'):
@@ -339,6 +369,9 @@ class DicomSession:
 
         Args:
             directory (str): The path to the directory containing DICOM files.
+
+        Returns:
+            int: The total number of instances held by the session after ingestion.
         """
         print(f"Ingesting from '{directory}'...")
         # Pass Sidecar Manager for eager pixel writing
@@ -364,6 +397,8 @@ class DicomSession:
         print(f"  - {n_se} Series")
         print(f"  - {n_i} Instances")
 
+        return n_i
+
     # =========================================================================
     # CONFIGURATION
     # =========================================================================
@@ -987,23 +1022,21 @@ class DicomSession:
             force_threads=True
         )
 
-        candidates = []
-        
-        for i, regions in enumerate(raw_regions_lists):
-            # i serves as the unique source index
-            for r in regions:
-                if r.confidence >= min_confidence:
-                    # Classify immediately (or could be lazy)
-                    cls = ZoneDiscoverer._classify_text(r.text)
-                    
-                    cand = DiscoveryCandidate(
-                        text=r.text,
-                        confidence=r.confidence,
-                        box=list(r.box),
-                        source_index=i,
-                        classification=cls
-                    )
-                    candidates.append(cand)
+        kept = [(i, r) for i, regions in enumerate(raw_regions_lists)  # i is the source index
+                for r in regions if r.confidence >= min_confidence]
+        # Classify all texts in one batch (spaCy pipes them)
+        classes = ZoneDiscoverer.classify_texts([r.text for _, r in kept])
+
+        candidates = [
+            DiscoveryCandidate(
+                text=r.text,
+                confidence=r.confidence,
+                box=list(r.box),
+                source_index=i,
+                classification=cls
+            )
+            for (i, r), cls in zip(kept, classes)
+        ]
 
         result = DiscoveryResult(candidates, len(sample))
         print(f"Discovery complete. Found {len(candidates)} raw candidates.")
@@ -1015,7 +1048,8 @@ class DicomSession:
         Useful for analysis and QA.
         """
         import pandas as pd
-        rows = []
+        columns = {name: [] for name in _COHORT_COLUMNS}
+        attributes = []
         for p in self.store.patients:
             for s in p.studies:
                 for se in s.series:
@@ -1024,26 +1058,28 @@ class DicomSession:
                     device_serial = se.equipment.device_serial_number if se.equipment else ""
 
                     for inst in se.instances:
-                        # Basic row info
-                        row = {
-                            "PatientID": p.patient_id,
-                            "PatientName": p.patient_name,
-                            "StudyInstanceUID": s.study_instance_uid,
-                            "StudyDate": s.study_date,
-                            "SeriesInstanceUID": se.series_instance_uid,
-                            "Modality": se.modality,
-                            "SOPInstanceUID": inst.sop_instance_uid,
-                            "Manufacturer": manufacturer,
-                            "Model": model,
-                            "DeviceSerial": device_serial
-                        }
-
-                        if expand_metadata and hasattr(inst, 'attributes') and inst.attributes:
-                            row.update(inst.attributes)
-
-                        rows.append(row)
-
-        return pd.DataFrame(rows)
+                        # Basic row info, appended column-wise
+                        for name, value in zip(_COHORT_COLUMNS, (
+                                p.patient_id, p.patient_name, s.study_instance_uid, s.study_date,
+                                se.series_instance_uid, se.modality, inst.sop_instance_uid,
+                                manufacturer, model, device_serial)):
+                            columns[name].append(value)
+
+                        if expand_metadata:
+                            attributes.append(getattr(inst, 'attributes', None) or {})
+
+        df = pd.DataFrame(columns)
+        if not any(attributes):
+            return df
+
+        # Attributes become extra columns in one frame build; where an attribute
+        # shares a name with a basic column, it overrides that row's value
+        attrs_df = pd.DataFrame.from_records(attributes, index=df.index)
+        for name in attrs_df.columns.intersection(df.columns):
+            present = [name in a for a in attributes]
+            df[name] = attrs_df[name].where(present, df[name])
+        extra = attrs_df.columns.difference(df.columns, sort=False)
+        return pd.concat([df, attrs_df[extra]], axis=1)
 
     def generate_report(self, output_path: str, format: str = "markdown") -> None:
         """
@@ -1947,21 +1983,33 @@ class DicomSession:
     def export_dataframe(
             self,
             output_path: str = "export_metadata.csv",
-            expand_metadata: bool = False):
+            expand_metadata: bool = False,
+            from_db: bool = False):
         """
         Exports flat validation metadata to CSV or Parquet.
 
         Args:
             output_path (str): The output file path (ends with .csv or .parquet).
             expand_metadata (bool): If True, includes all DICOM attributes as columns.
+            from_db (bool): If True, reads the basic columns with one SQL join instead
+                of walking the object graph. Reflects the last save, so call
+                `save(sync=True)` first if the session has unsaved changes.
+
+        Raises:
+            ValueError: If both `expand_metadata` and `from_db` are set.
         """
         import pandas as pd
-        df = self.get_cohort_report(expand_metadata=expand_metadata)
+        if from_db:
+            if expand_metadata:
+                raise ValueError("from_db exports only the basic columns; drop expand_metadata")
+            df = self.store_backend.load_cohort_df()
+        else:
+            df = self.get_cohort_report(expand_metadata=expand_metadata)
 
         if output_path.endswith(".parquet"):
             try:
-                # Requires pyarrow and pandas
-                df.to_parquet(output_path, index=False)
+                # Requires pyarrow (or fastparquet) and pandas
+                _write_parquet(df, output_path)
             except Exception as e:
                 get_logger().error(f"Failed to export parquet: {e}")
                 raise e
@@ -2015,7 +2063,7 @@ class DicomSession:
         os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
 
         try:
-            df.to_parquet(output_path, index=False)
+            _write_parquet(df, output_path)
             get_logger().info("Parquet export successful.")
         except ImportError as e:
             get_logger().error("Parquet engine (pyarrow or fastparquet) missing.")
@@ -17,6 +17,7 @@ class SidecarManager:
     def __init__(self, filepath: str):
         self.filepath = filepath
         self._lock = Lock()
+        self._unsynced = False  # Frames written with sync=False not yet fsynced
         self._ensure_file()
 
     def _ensure_file(self):
@@ -25,13 +26,16 @@ class SidecarManager:
             with open(self.filepath, 'wb') as f:
                 pass
 
-    def write_frame(self, data: bytes, compression: str = 'zlib') -> Tuple[int, int]:
+    def write_frame(self, data: bytes, compression: str = 'zlib', sync: bool = True) -> Tuple[int, int]:
         """
         Appends data to the sidecar file.
 
         Args:
             data (bytes): The binary data to store.
             compression (str): 'zlib' or 'raw'.
+            sync (bool): If False, skip the per-frame fsync. The frame is readable
+                         immediately, but the caller must call `sync()` before
+                         recording its offset anywhere durable.
 
         Returns:
             Tuple[int, int]: (offset, length) of the written blob.
@@ -59,12 +63,28 @@ class SidecarManager:
                 offset = f.tell()
                 f.write(blob)
                 f.flush()
-                os.fsync(f.fileno())
+                if sync:
+                    os.fsync(f.fileno())
+                else:
+                    self._unsynced = True
             finally:
                 fcntl.flock(f, fcntl.LOCK_UN)
 
         return offset, length
 
+    def sync(self):
+        """
+        Flushes frames written with `sync=False` to disk with a single fsync.
+
+        No-op if there are none.
+        """
+        if not self._unsynced:
+            return
+        # Clear first: a frame appended during the fsync re-flags itself
+        self._unsynced = False
+        with open(self.filepath, 'r+b') as f:
+            os.fsync(f.fileno())
+
     def read_frame(self, offset: int, length: int, compression: str = 'zlib') -> bytes:
         """
         Reads a frame from the sidecar at the specified offset.
@@ -129,4 +149,5 @@ class SidecarManager:
     def __setstate__(self, state):
         """Recreate lock on unpickling."""
         self.__dict__.update(state)
+        self.__dict__.setdefault('_unsynced', False)
         self._lock = Lock()
@@ -3,6 +3,12 @@ import re
 import sys
 import yaml
 
+# { condition } followed by its run of (x,y,w,h) tuples; conditions may span lines
+_BLOCK_RE = re.compile(r'\{\s*(.*?)\s*\}\s*([\(\)\d\s,]+)', re.DOTALL)
+_COORD_RE = re.compile(r'\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)')
+_MANUFACTURER_RE = re.compile(r'Manufacturer\.containsIgnoreCase\("([^"]+)"\)')
+_MODEL_RE = re.compile(r'ManufacturerModelName\.containsIgnoreCase\("([^"]+)"\)')
+
 
 class CTPParser:
     """
@@ -31,12 +37,7 @@ class CTPParser:
         # { ... }
         # ( ... )
 
-        # Regex for condition block
-        pattern = re.compile(r'\{\s*(.*?)\s*\}\s*([\(\)\d\s,]+)', re.DOTALL)
-
-        matches = pattern.findall(content)
-
-        for condition_str, coords_str in matches:
+        for condition_str, coords_str in _BLOCK_RE.findall(content):
             rule = CTPParser._parse_block(condition_str, coords_str)
             if rule:
                 rules.append(rule)
@@ -54,13 +55,13 @@ class CTPParser:
         # Rows.equals("512")
 
         # Extract Manufacturer
-        m_man = re.search(r'Manufacturer\.containsIgnoreCase\("([^"]+)"\)', condition_str)
+        m_man = _MANUFACTURER_RE.search(condition_str)
         if m_man:
             criteria['manufacturer'] = m_man.group(1)
 
         # Extract Model
         # ManufacturerModelName can be mapped to model_name
-        m_mod = re.search(r'ManufacturerModelName\.containsIgnoreCase\("([^"]+)"\)', condition_str)
+        m_mod = _MODEL_RE.search(condition_str)
         if m_mod:
             criteria['model_name'] = m_mod.group(1)
 
@@ -79,10 +80,7 @@ class CTPParser:
         gantry_zones = []
 
         # Find all (x,y,w,h) tuples
-        coord_matches = re.findall(
-            r'\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)', coords_str)
-
-        for (x, y, w, h) in coord_matches:
+        for (x, y, w, h) in _COORD_RE.findall(coords_str):
             x, y, w, h = int(x), int(y), int(w), int(h)
             gantry_zone = [y, y + h, x, x + w]
             gantry_zones.append(gantry_zone)
@@ -26,6 +26,12 @@ setup(
             "mkdocstrings[python]>=0.20.0",
             "mkdocs-awesome-pages-plugin>=2.8.0"
         ],
+        "fast": [
+            "orjson>=3.9.0",
+            "connectorx>=0.3.0",
+            "rfernet>=0.3.0",
+            "numba>=0.58.0"
+        ],
         "nlp": [
             "spacy>=3.7.0",
             "en_core_web_sm @ https://github.com/explosion/spacy-models/releases/download/en_core_web_sm-3.7.1/en_core_web_sm-3.7.1-py3-none-any.whl"
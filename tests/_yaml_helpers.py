@@ -0,0 +1,15 @@
+"""YAML round-trip helpers for config tests, using libyaml when available."""
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+
+def load(stream):
+    return yaml.load(stream, Loader=_Loader)
+
+
+def dump(data, stream=None, **kwargs):
+    return yaml.dump(data, stream, Dumper=_Dumper, **kwargs)
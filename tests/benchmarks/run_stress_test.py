@@ -5,199 +5,228 @@ Executes Import -> Redact -> Export pipeline and reports metrics.
 """
 
 import os
+from contextlib import suppress
+import io
+import sys
 import time
 import argparse
 import resource
-import shutil
 import logging
+import tempfile
+import concurrent.futures
 from gantry.session import DicomSession
+from gantry.persistence import SqliteStore
 from gantry.logger import get_logger
 
-def report_resource_usage(stage_name):
-    usage = resource.getrusage(resource.RUSAGE_SELF)
-    # Max RSS is in KB on Linux, bytes on Mac (usually, but let's assume KB/MB relevant)
-    # Actually Python resource.getrusage behavior varies.
-    # On Linux: KB. On Mac: Bytes.
-    # We will just report raw and let user interpret or normalize if we detect OS.
-    # Let's simple report MB (assuming KB input for Linux, dividing by 1024, or Mac dividing by 1024*1024?)
-    # Safer to just print raw.
-    print(f"[{stage_name}] Max RSS: {usage.ru_maxrss} (units OS dependent)")
-
-def run_benchmark(input_dir, output_dir, db_path, return_stats=False, compress_export=True):
-    print(f"--- Starting Safety Pipeline Stress Test ---")
-    print(f"Input: {input_dir}")
-    print(f"Output: {output_dir}")
-    print(f"DB: {db_path}")
-
-    # ensure clean start
-    if os.path.exists(db_path):
-        os.remove(db_path)
-    if os.path.exists(output_dir):
-        shutil.rmtree(output_dir)
-
-    start_global = time.time()
-
-    # [1] Initialize & Ingest
-    print("\n[Step 1 & 2] Ingest")
-    t0 = time.time()
-    sess = DicomSession(db_path)
-    sess.ingest(input_dir)
-    sess.save()
-    duration_ingest = time.time() - t0
-    print(f"Ingest Duration: {duration_ingest:.2f}s")
-
-    # [3] Examine
-    print("\n[Step 3] Examine")
-    t0 = time.time()
-    sess.examine()
-    duration_examine = time.time() - t0
-    print(f"Examine Duration: {duration_examine:.2f}s")
-
-    # [4] Configure (Create & Load)
-    # [4] Configure (Create & Load)
-    print("\n[Step 4] Configure")
-    # Write a dynamic config compatible with generated data
-    # Machines: GantryGen, Siemens, GE, Philips, Canon, Toshiba, Hitachi, Fujifilm
-    # Serial Format: GEN_{MFR}_001
-
-    machines_list = [
-        "GantryGen", "Siemens", "GE", "Philips",
-        "Canon", "Toshiba", "Hitachi", "Fujifilm"
-    ]
-
-    machine_yaml_blocks = []
-    for mfr in machines_list:
-        # Match logic in generate_dataset.py
-        serial = f"GEN_{mfr[:3].upper()}_001"
-        block = f"""  - manufacturer: "{mfr}"
-    serial_number: "{serial}"
+# Dynamic config compatible with generated data
+# Machines: GantryGen, Siemens, GE, Philips, Canon, Toshiba, Hitachi, Fujifilm
+# Serial Format: GEN_{MFR}_001 (matches logic in generate_dataset.py)
+_MACHINES = [
+    "GantryGen", "Siemens", "GE", "Philips",
+    "Canon", "Toshiba", "Hitachi", "Fujifilm"
+]
+
+_MACHINES_YAML = "\n".join(
+    f"""  - manufacturer: "{mfr}"
+    serial_number: "GEN_{mfr[:3].upper()}_001"
     redaction_zones:
-      - [0, 10, 0, 10]"""
-        machine_yaml_blocks.append(block)
-
-    machines_yaml = "\n".join(machine_yaml_blocks)
+      - [0, 10, 0, 10]""" for mfr in _MACHINES)
 
-    config_path = "stress_config.yaml"
-    with open(config_path, "w") as f:
-        f.write(f"""
+STRESS_CONFIG_BYTES = f"""
 privacy_profile: "basic"
 date_jitter:
   min_days: -10
   max_days: -1
 remove_private_tags: true
 machines:
-{machines_yaml}
+{_MACHINES_YAML}
 
 phi_tags:
   "0008,0020": {{ "action": "EMPTY" }}
   "0008,0030": {{ "action": "EMPTY" }}
   "0008,0021": {{ "action": "EMPTY" }}
   "0008,0031": {{ "action": "EMPTY" }}
-""")
-    sess.load_config(config_path)
+""".encode("utf-8")
+
+# ru_maxrss is reported in KB on Linux and in bytes on macOS
+_RSS_DIV = 1024 * 1024 if sys.platform == "darwin" else 1024
+
+def report_resource_usage(stage_name, max_rss=None, log=print):
+    if max_rss is None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    log(f"[{stage_name}] Max RSS: {max_rss / _RSS_DIV:.1f} MB")
+
+def _parallel_rmtree(path):
+    """
+    Removes a directory tree, unlinking files from a thread pool.
+    unlink releases the GIL, so threads overlap the kernel work on large exports.
+    """
+    files, dirs = [], []
+    stack = [path]
+    try:
+        while stack:
+            current = stack.pop()
+            dirs.append(current)
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        files.append(entry.path)
+    except FileNotFoundError:
+        return
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+        list(pool.map(os.unlink, files))
+
+    # Parents are discovered before children, so remove in reverse
+    for d in reversed(dirs):
+        os.rmdir(d)
+
+def run_benchmark(input_dir, output_dir, db_path, return_stats=False, compress_export=True):
+    # Buffer our own output so stdout writes (TTY / CI pipes) don't land
+    # between timed stages; everything is written out once at the end.
+    out = io.StringIO()
+
+    def log(line=""):
+        out.write(line + "\n")
+
+    log(f"--- Starting Safety Pipeline Stress Test ---")
+    log(f"Input: {input_dir}")
+    log(f"Output: {output_dir}")
+    log(f"DB: {db_path}")
+
+    # ensure clean start
+    with suppress(FileNotFoundError):
+        os.unlink(db_path)
+    _parallel_rmtree(output_dir)
+
+    # SqliteStore opens the DB in WAL mode with synchronous=NORMAL.
+    # Confirm that before timing so a regression there can't silently skew results.
+    probe = SqliteStore(db_path)
+    with probe._get_connection() as conn:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    probe.stop()
+    log(f"Journal Mode: {journal_mode}")
+
+    # Stage durations in ns (monotonic clock); reported once at the end
+    stages = {}
+    rss_snapshots = {}
+    start_global = time.perf_counter_ns()
+
+    # [1] Initialize & Ingest
+    log("\n[Step 1 & 2] Ingest")
+    t0 = time.perf_counter_ns()
+    sess = DicomSession(db_path)
+    # Fresh DB, so the post-ingest count is the number of instances ingested
+    total_instances = sess.ingest(input_dir)
+    sess.save()
+    stages["Ingest"] = time.perf_counter_ns() - t0
+
+    # [3] Examine
+    log("\n[Step 3] Examine")
+    t0 = time.perf_counter_ns()
+    sess.examine()
+    stages["Examine"] = time.perf_counter_ns() - t0
+
+    # [4] Configure (Create & Load)
+    log("\n[Step 4] Configure")
+    # Private temp file: keeps the CWD clean and parallel runs independent
+    fd, config_path = tempfile.mkstemp(suffix=".yaml")
+    try:
+        os.write(fd, STRESS_CONFIG_BYTES)
+        os.close(fd)
+        sess.load_config(config_path)
+    finally:
+        os.unlink(config_path)
 
     # [5] Audit (Measure Twice)
-    print("\n[Step 5] Audit")
-    t0 = time.time()
+    log("\n[Step 5] Audit")
+    t0 = time.perf_counter_ns()
     report = sess.audit()
-    duration_audit = time.time() - t0
-    print(f"Audit Found {len(report)} issues.")
-    print(f"Audit Duration: {duration_audit:.2f}s")
+    stages["Audit"] = time.perf_counter_ns() - t0
 
     # [6] Backup (Reversibility)
-    print("\n[Step 6] Backup Identity")
-    t0 = time.time()
+    log("\n[Step 6] Backup Identity")
+    t0 = time.perf_counter_ns()
     sess.enable_reversible_anonymization()
     sess.lock_identities(report, auto_persist_chunk_size=200)
     sess.save()
-    duration_backup = time.time() - t0
-    print(f"Backup Duration: {duration_backup:.2f}s")
+    stages["Backup"] = time.perf_counter_ns() - t0
 
     # [7] Anonymize (Metadata)
-    print("\n[Step 7] Anonymize")
-    t0 = time.time()
+    log("\n[Step 7] Anonymize")
+    t0 = time.perf_counter_ns()
     sess.anonymize(report)
-    duration_anonymize = time.time() - t0
-    print(f"Anonymize Duration: {duration_anonymize:.2f}s")
+    stages["Anonymize"] = time.perf_counter_ns() - t0
 
     # [8] Redact (Pixel Data)
-    print("\n[Step 8] Redact")
-    t0 = time.time()
+    log("\n[Step 8] Redact")
+    t0 = time.perf_counter_ns()
     sess.redact(show_progress=False)
-    duration_redact = time.time() - t0
-    print(f"Redact Duration: {duration_redact:.2f}s")
-    report_resource_usage("Post-Redact")
+    stages["Redact"] = time.perf_counter_ns() - t0
+    rss_snapshots["Post-Redact"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
 
     # [9] Verify & Export (Cut Once)
-    print("\n[Step 9] Export (Verify & Write)")
-    t0 = time.time()
+    log("\n[Step 9] Export (Verify & Write)")
+    t0 = time.perf_counter_ns()
     # Default to j2k if compress requested, else None
     comp_method = 'j2k' if compress_export else None
     sess.export(output_dir, safe=False, compression=comp_method, show_progress=False)
-    duration_export = time.time() - t0
-    print(f"Export Duration: {duration_export:.2f}s")
-    report_resource_usage("Post-Export")
+    stages["Export"] = time.perf_counter_ns() - t0
+    rss_snapshots["Post-Export"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
 
     # Calculate Totals
-    total_time = time.time() - start_global
-
-    # Get counts for throughput calculation
-    # We can infer from session.store
-    # (Checking private store objects is messy but acceptable for a benchmark script)
-    total_instances = 0
-    # A bit inefficient to recount, but safe.
-    # Alternatively, capture from sess.examine output if possible, but sess.examine prints to stdout.
-    # Let's count via SQL for speed if possible, or just iterate.
-    # Actually, we can just use the store backend directly.
-    total_instances = sess.store_backend.get_total_instances()
-
-    # Metrics
-    fps_ingest = total_instances / duration_ingest if duration_ingest > 0 else 0
-    fps_export = total_instances / duration_export if duration_export > 0 else 0
-    fps_overall = total_instances / total_time if total_time > 0 else 0
-
-    print("\n" + "="*60)
-    print(f"BENCHMARK REPORT")
-    print("="*60)
-    print(f"Total Instances: {total_instances}")
-    print(f"Total Time:      {total_time:.2f}s")
-    print(f"Overall Rate:    {fps_overall:.0f} inst/sec")
-    print("-" * 60)
-    print(f"{'STEP':<20} | {'DURATION':<10} | {'RATE (inst/s)':<15}")
-    print("-" * 60)
-    print(f"{'Ingest':<20} | {duration_ingest:<10.2f} | {fps_ingest:<15.0f}")
-    print(f"{'Examine':<20} | {duration_examine:<10.2f} | {'-':<15}")
-    print(f"{'Audit':<20} | {duration_audit:<10.2f} | {'-':<15}")
-    print(f"{'Backup':<20} | {duration_backup:<10.2f} | {'-':<15}")
-    print(f"{'Anonymize':<20} | {duration_anonymize:<10.2f} | {'-':<15}")
-    print(f"{'Redact':<20} | {duration_redact:<10.2f} | {'-':<15}")
-    print(f"{'Export':<20} | {duration_export:<10.2f} | {fps_export:<15.0f}")
-    print("-" * 60)
-    print("Resource Usage:")
-    report_resource_usage("Final")
-    print("="*60)
+    total_time = (time.perf_counter_ns() - start_global) / 1e9
 
     # Ensure Shutdown
     try:
         sess.close()
     except Exception as e:
-        print(f"Warning: Failed to close session: {e}")
+        log(f"Warning: Failed to close session: {e}")
+
+    durations = {name: ns / 1e9 for name, ns in stages.items()}
+
+    # Metrics
+    fps_ingest = total_instances / durations["Ingest"] if durations["Ingest"] > 0 else 0
+    fps_export = total_instances / durations["Export"] if durations["Export"] > 0 else 0
+    fps_overall = total_instances / total_time if total_time > 0 else 0
+    rates = {"Ingest": fps_ingest, "Export": fps_export}
+
+    log(f"\nAudit Found {len(report)} issues.")
+    for name, value in rss_snapshots.items():
+        report_resource_usage(name, value, log=log)
+
+    log("\n" + "="*60)
+    log(f"BENCHMARK REPORT")
+    log("="*60)
+    log(f"Total Instances: {total_instances}")
+    log(f"Total Time:      {total_time:.2f}s")
+    log(f"Overall Rate:    {fps_overall:.0f} inst/sec")
+    log("-" * 60)
+    log(f"{'STEP':<20} | {'DURATION':<10} | {'RATE (inst/s)':<15}")
+    log("-" * 60)
+    for name, duration in durations.items():
+        rate = f"{rates[name]:<15.0f}" if name in rates else f"{'-':<15}"
+        log(f"{name:<20} | {duration:<10.2f} | {rate}")
+    log("-" * 60)
+    log("Resource Usage:")
+    report_resource_usage("Final", log=log)
+    log("="*60)
+
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
 
     if return_stats:
-        return {
-            "Ingest Duration": duration_ingest,
-            "Examine Duration": duration_examine,
-            "Audit Duration": duration_audit,
-            "Backup Duration": duration_backup,
-            "Anonymize Duration": duration_anonymize,
-            "Redact Duration": duration_redact,
-            "Export Duration": duration_export,
+        stats = {f"{name} Duration": duration for name, duration in durations.items()}
+        stats.update({
             "Total Time": total_time,
             "Total Instances": total_instances,
             "Overall Rate": fps_overall,
             "Ingest Rate": fps_ingest,
             "Export Rate": fps_export
-        }
+        })
+        return stats
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -11,18 +11,43 @@ from datetime import date
 from gantry.entities import Patient, Study, Series, Instance, Equipment
 from gantry.builders import DicomBuilder
 
+def pytest_addoption(parser):
+    parser.addoption("--runslow", action="store_true", default=False,
+                     help="also run tests marked slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="need --runslow option to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def redirect_shared_logging(tmp_path_factory):
+    """Redirects gantry.log for module- and class-scoped fixtures, set up before redirect_logging."""
+    previous = os.environ.get("GANTRY_LOG_FILE")
+    os.environ["GANTRY_LOG_FILE"] = str(tmp_path_factory.mktemp("logs") / "gantry.log")
+    yield
+    if previous is None:
+        os.environ.pop("GANTRY_LOG_FILE", None)
+    else:
+        os.environ["GANTRY_LOG_FILE"] = previous
+
 @pytest.fixture(autouse=True)
-def redirect_logging(tmp_path):
+def redirect_logging(tmp_path, monkeypatch):
     """Redirects gantry.log to a temp file for all tests."""
     log_file = tmp_path / "gantry.log"
-    os.environ["GANTRY_LOG_FILE"] = str(log_file)
-    yield
-    if "GANTRY_LOG_FILE" in os.environ:
-        del os.environ["GANTRY_LOG_FILE"]
+    monkeypatch.setenv("GANTRY_LOG_FILE", str(log_file))
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dummy_pixel_array_2d():
-    return np.zeros((512, 512), dtype=np.uint16)
+    """Shared read-only pixel array. Copy it before mutating."""
+    arr = np.zeros((512, 512), dtype=np.uint16)
+    arr.setflags(write=False)
+    return arr
 
 
 @pytest.fixture
@@ -1,13 +1,19 @@
 
 import os
+from contextlib import suppress
 import sys
+import math
+import gc
+import multiprocessing
 import psutil
-import time
+import resource
 import numpy as np
-import threading
 from gantry.session import DicomSession
 from gantry.io_handlers import DicomExporter, ExportContext, _export_instance_worker
 
+# PCG64 generator; much faster than the legacy RandomState (MT19937)
+_RNG = np.random.default_rng()
+
 # Mock objects
 class MockInstance:
     def __init__(self, uid, size_mb):
@@ -23,23 +29,37 @@ class MockInstance:
         # Size MB = (Pixels * 2) / 1024 / 1024
         # Pixels = (MB * 1024 * 1024) / 2
         num_pixels = int((size_mb * 1024 * 1024) / 2)
-        side = int(np.sqrt(num_pixels))
+        side = math.isqrt(num_pixels)
         self.rows = side
         self.columns = side
-        self.pixel_data = np.random.randint(0, 65535, (side, side), dtype=np.uint16)
+        self.pixel_data = _RNG.integers(0, 65535, (side, side), dtype=np.uint16)
 
     def get_pixel_data(self):
         return self.pixel_data
 
+_PROC = psutil.Process(os.getpid())
+
 def get_memory_usage():
-    process = psutil.Process(os.getpid())
-    return process.memory_info().rss / 1024 / 1024  # MB
+    return _PROC.memory_info().rss / 1024 / 1024  # MB
+
+# ru_maxrss is KB on Linux, bytes on macOS
+_MAXRSS_DIV = 1024 * 1024 if sys.platform == 'darwin' else 1024
+
+def reset_peak_memory():
+    """Resets the kernel's peak-RSS high-water mark (Linux only, best effort)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def get_peak_memory():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / _MAXRSS_DIV  # MB
 
 def run_experiment(size_mb, compression='j2k'):
     print(f"\n--- Experiment: Export {size_mb}MB Image (Compression: {compression}) ---")
 
     # 1. Baseline Memory
-    import gc
     gc.collect()
     mem_start = get_memory_usage()
     print(f"Baseline Memory: {mem_start:.2f} MB")
@@ -60,17 +80,9 @@ def run_experiment(size_mb, compression='j2k'):
     print(f"Memory with Image Loaded: {mem_loaded:.2f} MB (+{mem_loaded - mem_start:.2f} MB)")
 
     # 3. Peak Tracking
-    peak_mem = [mem_loaded]
-    stop_tracker = False
-
-    def tracker():
-        while not stop_tracker:
-            m = get_memory_usage()
-            peak_mem.append(m)
-            time.sleep(0.01)
-
-    t = threading.Thread(target=tracker)
-    t.start()
+    # The kernel tracks the high-water mark for us; reset it so earlier
+    # experiments in this process don't leak into this one.
+    reset_peak_memory()
 
     # 4. Run Export
     try:
@@ -82,13 +94,10 @@ def run_experiment(size_mb, compression='j2k'):
 
     except Exception as e:
         print(f"Export Failed: {e}")
-    finally:
-        stop_tracker = True
-        t.join()
 
     # 5. Report
     mem_final = get_memory_usage()
-    peak = max(peak_mem)
+    peak = max(get_peak_memory(), mem_loaded)
 
     print(f"Peak Memory: {peak:.2f} MB (+{peak - mem_start:.2f} MB overhead)")
     print(f"Final Memory: {mem_final:.2f} MB")
@@ -97,20 +106,54 @@ def run_experiment(size_mb, compression='j2k'):
     print(f">> Estimated Memory Cost Per Worker: {cost_per_worker:.2f} MB")
 
     # Cleanup
-    if os.path.exists(ctx.output_path):
-        os.remove(ctx.output_path)
+    with suppress(FileNotFoundError):
+        os.unlink(ctx.output_path)
 
     return cost_per_worker
 
+def _experiment_child(size_mb, compression, results):
+    try:
+        results.put(run_experiment(size_mb, compression=compression))
+    except RuntimeError as e:
+        results.put(e)
+
+def run_isolated_experiment(size_mb, compression='j2k'):
+    """
+    Runs one experiment in a fresh process so its baseline and peak RSS
+    aren't inflated by allocations left over from earlier experiments.
+    Experiments still run one at a time so they don't share the machine.
+    """
+    # spawn (not fork): the child starts from a clean heap and re-imports this
+    # module, so the cached psutil handle points at the child's own pid.
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=_experiment_child, args=(size_mb, compression, results))
+    proc.start()
+    proc.join()
+    if proc.exitcode != 0:
+        raise RuntimeError(f"Experiment process exited with code {proc.exitcode}")
+
+    result = results.get()
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+# Move everything alive after imports and module setup (pydicom, numpy,
+# gantry) into the permanent generation: later gc.collect() calls then only
+# scan objects created by the experiment, and import-time garbage stays out
+# of the baseline.
+gc.collect()
+gc.freeze()
+
 if __name__ == "__main__":
     costs = []
-    costs.append(run_experiment(10, compression=None))
-    costs.append(run_experiment(50, compression=None))
+    costs.append(run_isolated_experiment(10, compression=None))
+    costs.append(run_isolated_experiment(50, compression=None))
 
     # J2K is the heavy one
     try:
-        costs.append(run_experiment(10, compression='j2k'))
-        costs.append(run_experiment(50, compression='j2k'))
+        costs.append(run_isolated_experiment(10, compression='j2k'))
+        costs.append(run_isolated_experiment(50, compression='j2k'))
     except RuntimeError as e:
         print(f"Skipping J2K: {e}")
 
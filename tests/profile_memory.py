@@ -7,6 +7,7 @@ import threading
 from unittest.mock import MagicMock, patch
 from gantry.session import DicomSession
 from gantry.io_handlers import DicomExporter
+from gantry.entities import Patient, Study, Series, Instance
 
 class TestMemoryProfile(unittest.TestCase):
     """
@@ -25,8 +26,10 @@ class TestMemoryProfile(unittest.TestCase):
             sess = DicomSession("dummy.db")
 
             # Setup dummy data
-            mock_p = MagicMock(patient_id="P1")
-            mock_p.studies = [MagicMock(series=[MagicMock(instances=[MagicMock()])])]
+            # Plain slotted entities: far lighter than a MagicMock tree
+            inst = Instance("1.2.3.4.5", "1.2.840.10008.5.1.4.1.1.2", 1)
+            series = Series("1.2.3.4", "CT", 1, instances=[inst])
+            mock_p = Patient("P1", "Test^Patient", studies=[Study("1.2.3", "20230101", series=[series])])
             sess.store.patients = [mock_p]
 
             # Execute Export
@@ -72,3 +72,29 @@ def test_batch_preserve_from_report(tmp_path):
     # in the persisted attributes_json (inside __sequences__ block)
     assert "0400,0500" in row[0]
     conn.close()
+
+def test_phi_report_dataframe():
+    from gantry.privacy import PhiFinding
+    findings = [
+        PhiFinding(entity_uid=f"P{i}", entity_type="Patient", field_name="Patient Name",
+                   value="John Doe", reason="Name", patient_id=f"P{i}")
+        for i in range(3)
+    ]
+    report = PhiReport(findings)
+
+    df = report.to_dataframe()
+    assert list(df.columns) == ["patient_id", "entity_type", "entity_uid", "tag", "field",
+                                "value", "reason", "action"]
+    assert df["reason"].dtype == "category"
+    assert df["entity_type"].dtype == "category"
+
+    # Each call reflects the findings as they are now, including slot replacement
+    report.findings[0] = PhiFinding(entity_uid="P9", entity_type="Patient", field_name="Patient Name",
+                                    value="Jane Doe", reason="Name", patient_id="P9")
+    assert report.to_dataframe()["value"].tolist() == ["Jane Doe", "John Doe", "John Doe"]
+
+    report.findings.append(PhiFinding(entity_uid="S1", entity_type="Study", field_name="Study Date",
+                                      value="20230101", reason="Date", patient_id="P0"))
+    df = report.to_dataframe()
+    assert len(df) == 4
+    assert set(df["entity_type"].cat.categories) == {"Patient", "Study"}
@@ -55,3 +55,40 @@ def test_persist_empty(tmp_path):
     session.save_analysis([])
     loaded = session.store_backend.load_findings()
     assert len(loaded) == 0
+
+def test_persist_findings_across_batches(tmp_path):
+    from gantry.persistence import _FINDINGS_BATCH
+    db_path = str(tmp_path / "batches.db")
+    session = DicomSession(db_path)
+
+    n = _FINDINGS_BATCH * 2 + 3
+    findings = [
+        PhiFinding(entity_uid=f"P{i}", entity_type="Patient", field_name="patient_name",
+                   value=f"Name {i}", reason="PHI", patient_id=f"P{i}")
+        for i in range(n)
+    ]
+    session.save_analysis(PhiReport(findings))
+
+    loaded = session.store_backend.load_findings()
+    assert [f.entity_uid for f in loaded] == [f"P{i}" for i in range(n)]
+
+@pytest.mark.parametrize("use_connectorx", [True, False])
+def test_load_findings_df(tmp_path, monkeypatch, use_connectorx):
+    if use_connectorx:
+        pytest.importorskip("connectorx")
+    else:
+        monkeypatch.setattr("gantry.persistence.connectorx", None)
+
+    session = DicomSession(str(tmp_path / "findings_df.db"))
+    session.save_analysis([
+        PhiFinding(entity_uid="P1", entity_type="Patient", field_name="patient_name", value="John Doe",
+                   reason="PHI", patient_id="P1",
+                   remediation_proposal=PhiRemediation("REPLACE_TAG", "patient_name", "ANON", "John Doe")),
+        PhiFinding(entity_uid="S1", entity_type="Study", field_name="study_date", value="20230101",
+                   reason="PHI", patient_id="P1"),
+    ])
+
+    df = session.store_backend.load_findings_df()
+    assert list(df["entity_uid"]) == ["P1", "S1"]
+    assert df["entity_type"].dtype == "category"
+    assert df["remediation_action"].iloc[0] == "REPLACE_TAG"
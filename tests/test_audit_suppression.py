@@ -65,3 +65,24 @@ def test_remediation_service_sets_flag():
     # 4. Verify Flag
     assert inst.date_shifted is True
     assert inst.attributes["0008,0020"] == "20230111" # Shifted by 10 days
+
+def test_rescan_reflects_in_place_edits():
+    """
+    A reused inspector reports the instance as it is now, even when values
+    were changed without set_attr.
+    """
+    inst = Instance("I1", "SOP1", 1)
+    inst.attributes["0010,0010"] = "John Doe"
+    inst.attributes["0009,0010"] = "VENDOR"
+    inspector = PhiInspector(config_tags={"0010,0010": {"name": "Patient Name", "action": "REPLACE"}},
+                             remove_private_tags=True)
+
+    first = inspector._scan_instance(inst, "P1")
+    assert {f.tag for f in first} == {"0010,0010", "0009,0010"}
+
+    inst.attributes["0010,0010"] = "Jane Doe"
+    assert [f.value for f in inspector._scan_instance(inst, "P1") if f.tag == "0010,0010"] == ["Jane Doe"]
+
+    inst.attributes["0010,0010"] = "ANONYMIZED"
+    del inst.attributes["0009,0010"]
+    assert inspector._scan_instance(inst, "P1") == []
@@ -1,7 +1,8 @@
 import pytest
 import os
 import json
-from gantry.persistence import SqliteStore, GantryJSONEncoder, gantry_json_object_hook
+from gantry.persistence import (SqliteStore, GantryJSONEncoder, gantry_json_object_hook,
+                                gantry_json_dumps, gantry_json_loads, _restore_bytes)
 from gantry.entities import Patient, Study, Series, Instance
 
 def test_json_encoder_decoder_bytes():
@@ -18,6 +19,35 @@ def test_json_encoder_decoder_bytes():
     assert loaded["key"] == b"hello world"
     assert loaded["nested"]["other"] == b"\x00\x01\x02"
 
+def test_gantry_json_helpers_roundtrip():
+    data = {"key": b"hello world", "list": [1, {"deep": b"\x00\x01"}], "plain": "x"}
+    text = gantry_json_dumps(data)
+    assert gantry_json_loads(text) == data
+
+    # The post-decode walk used with orjson must match object_hook decoding
+    assert _restore_bytes(json.loads(text)) == data
+
+def test_gantry_json_helpers_lossy_values():
+    """NaN/Infinity and ints past 64 bits round-trip as the stdlib writes them."""
+    import math
+    wide = 2**70
+    data = {"ds": float("nan"), "inf": [float("inf"), -float("inf")], "wide": wide,
+            "neg": -2**63 - 1, "uid": "2.25.329800735698586629295641978511506172918", "n": None}
+    text = gantry_json_dumps(data)
+    assert text == json.dumps(data, cls=GantryJSONEncoder)
+
+    for source in (text, json.dumps(data, cls=GantryJSONEncoder)):
+        loaded = gantry_json_loads(source)
+        assert math.isnan(loaded["ds"])
+        assert loaded["inf"] == [float("inf"), -float("inf")]
+        assert loaded["wide"] == wide and isinstance(loaded["wide"], int)
+        assert loaded["neg"] == -2**63 - 1
+        assert loaded["uid"] == data["uid"] and loaded["n"] is None
+
+    # Wide ints alone (no NaN in the text) still decode exactly
+    assert gantry_json_loads(json.dumps({"a": [wide, 1]})) == {"a": [wide, 1]}
+    assert gantry_json_loads(json.dumps({"a": -wide}, separators=(",", ":"))) == {"a": -wide}
+
 def test_persistence_roundtrip_with_bytes(tmp_path):
     db_path = str(tmp_path / "test_bytes.db")
     store = SqliteStore(db_path)
@@ -56,3 +86,76 @@ def test_persistence_roundtrip_with_bytes(tmp_path):
 
     assert isinstance(val2, bytes)
     assert val2 == b"\x00\x01\x02\x03" * 10
+
+def test_large_bytes_stored_as_blob(tmp_path):
+    db_path = str(tmp_path / "test_blobs.db")
+    store = SqliteStore(db_path)
+
+    p = Patient("P_BLOB", "Blob Patient")
+    st = Study("ST_BLOB", None)
+    p.studies.append(st)
+    se = Series("SE_BLOB", "OT", 1)
+    st.series.append(se)
+    inst = Instance("SOP_BLOB", "1.2.840.10008.5.1.4.1.1.7", 1)
+    big = bytes(range(256)) * 16
+    inst.attributes["0029,1020"] = big
+    inst.attributes["0009,0010"] = b"GEMS_PETD_01"  # Small: stays inline
+    se.instances.append(inst)
+    store.save_all([p])
+
+    with store._get_connection() as conn:
+        attrs_json = conn.execute("SELECT attributes_json FROM instances").fetchone()[0]
+        blob = conn.execute("SELECT data FROM instance_blobs WHERE tag='0029,1020'").fetchone()[0]
+    assert "0029,1020" not in attrs_json
+    assert "0009,0010" in attrs_json
+    assert blob == big
+
+    assert store.load_all()[0].studies[0].series[0].instances[0].attributes["0029,1020"] == big
+    assert store.load_patient("P_BLOB").studies[0].series[0].instances[0].attributes["0029,1020"] == big
+    row = next(store.get_flattened_instances(["P_BLOB"]))
+    assert gantry_json_loads(row["attributes_json"])["0029,1020"] == big
+
+    # Blobs are matched to their own rows, with and without filters
+    other = Instance("SOP_BLOB_2", "1.2.840.10008.5.1.4.1.1.7", 2)
+    other.attributes["0029,1020"] = big[::-1]
+    se.instances.append(other)
+    store.save_all([p])
+    rows = {r["sop_instance_uid"]: gantry_json_loads(r["attributes_json"])
+            for r in store.get_flattened_instances()}
+    assert rows["SOP_BLOB"]["0029,1020"] == big and rows["SOP_BLOB_2"]["0029,1020"] == big[::-1]
+    rows = list(store.get_flattened_instances(["P_BLOB"], instance_uids=["SOP_BLOB_2"]))
+    assert [gantry_json_loads(r["attributes_json"])["0029,1020"] for r in rows] == [big[::-1]]
+    se.instances.remove(other)
+
+    # Removing the attribute removes the blob
+    del inst.attributes["0029,1020"]
+    inst._mod_count += 1
+    store.save_all([p])
+    assert "0029,1020" not in store.load_all()[0].studies[0].series[0].instances[0].attributes
+
+def test_find_instances_with_tag(tmp_path):
+    store = SqliteStore(str(tmp_path / "test_find_tag.db"))
+
+    p = Patient("P_FIND", "Find Patient")
+    st = Study("ST_FIND", None)
+    p.studies.append(st)
+    se = Series("SE_FIND", "OT", 1)
+    st.series.append(se)
+    for uid, burned in [("SOP_A", "YES"), ("SOP_B", "NO"), ("SOP_C", None)]:
+        inst = Instance(uid, "1.2.840.10008.5.1.4.1.1.7", 1)
+        if burned:
+            inst.set_attr("0028,0301", burned)
+        se.instances.append(inst)
+    store.save_all([p])
+
+    with store._get_connection() as conn:
+        conn.execute("UPDATE instances SET attributes_json='{not json' WHERE sop_instance_uid='SOP_C'")
+        conn.commit()
+
+    assert sorted(store.find_instances_with_tag("0028,0301")) == [
+        ("SOP_A", None, "YES"), ("SOP_B", None, "NO")]
+    assert store.find_instances_with_tag("0028,0301", "YES") == [("SOP_A", None, "YES")]
+    assert [r[0] for r in store.check_unsafe_attributes()] == ["SOP_A"]
+
+    with pytest.raises(ValueError):
+        store.find_instances_with_tag('0028,0301"')
@@ -155,3 +155,39 @@ class TestCompaction:
         arr = i1.get_pixel_data()
         assert arr is not None
         assert arr.shape == (100, 1000)
+
+    @pytest.mark.parametrize("kernel_copy", [True, False])
+    def test_compact_copies_shared_blob_once(self, session, monkeypatch, kernel_copy):
+        """
+        Rows pointing at the same blob (deduplicated pixels) share one copy after
+        compaction, with and without os.copy_file_range.
+        """
+        if not kernel_copy:
+            monkeypatch.delattr(os, "copy_file_range", raising=False)
+
+        from gantry.entities import Patient, Study, Series
+        i1 = self.create_dummy_instance("4.4.1")
+        i2 = self.create_dummy_instance("4.4.2")
+        pat = Patient("P4", "Shared Blob")
+        st = Study("ST4", "20230101")
+        se = Series("SE4", "CT", 1)
+        pat.studies.append(st); st.series.append(se); se.instances.extend([i1, i2])
+        session.store.patients.append(pat)
+        session.save(sync=True)
+
+        # Point i2 at i1's blob, orphaning i2's own
+        with session.store_backend._get_connection() as conn:
+            conn.execute("""
+                UPDATE instances SET (pixel_offset, pixel_length, pixel_hash) =
+                    (SELECT pixel_offset, pixel_length, pixel_hash FROM instances WHERE sop_instance_uid=?)
+                WHERE sop_instance_uid=?""", ("4.4.1", "4.4.2"))
+            length = conn.execute(
+                "SELECT pixel_length FROM instances WHERE sop_instance_uid=?", ("4.4.1",)).fetchone()[0]
+
+        uid_map = session.store_backend.compact_sidecar()
+
+        assert os.path.getsize(session.store_backend.sidecar_path) == length
+        assert uid_map["4.4.1"] == uid_map["4.4.2"] == (0, length)
+        loaded = session.store_backend.load_patient("P4").studies[0].series[0].instances
+        a, b = (inst.get_pixel_data() for inst in loaded)
+        assert np.array_equal(a, b)
@@ -79,3 +79,40 @@ class TestCompressHandlers:
 
         # Pillow raises IndexError/TypeError on scalar, caught and re-raised as RuntimeError
         assert "Compression failed" in str(excinfo.value)
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_compress_roundtrip_lossless(self, workers, monkeypatch):
+        """
+        Verify that every encoded frame decodes back to the exact input pixels,
+        in order, whether frames are encoded serially or on the thread pool.
+        """
+        monkeypatch.setattr("gantry.io_handlers._J2K_MAX_WORKERS", workers)
+        from pydicom.encaps import generate_frames
+        from PIL import Image
+        import io
+
+        ds = self._create_base_ds(16, 12, 3, 1)
+        ds.BitsAllocated = 16
+        arr = np.random.default_rng(0).integers(0, 4096, (3, 16, 12), dtype=np.uint16)
+
+        _compress_j2k(ds, pixel_array=arr)
+
+        frames = list(generate_frames(ds.PixelData, number_of_frames=3))
+        assert len(frames) == 3
+        for i, frame in enumerate(frames):
+            decoded = np.asarray(Image.open(io.BytesIO(frame)))
+            assert np.array_equal(decoded.astype(np.uint16), arr[i])
+
+
+    @pytest.mark.parametrize("sizes", [[], [7], [10, 3, 1, 4096]])
+    def test_encapsulate_frames_matches_pydicom(self, sizes):
+        """
+        Verify the preallocated encapsulation is byte-identical to pydicom's,
+        including odd-length padding and Basic Offset Table entries.
+        """
+        from pydicom.encaps import encapsulate
+        from gantry.io_handlers import _encapsulate_frames
+
+        rng = np.random.default_rng(1)
+        frames = [rng.integers(0, 256, n, dtype=np.uint8).tobytes() for n in sizes]
+        assert _encapsulate_frames(frames) == encapsulate(frames)
@@ -7,6 +7,11 @@ from pydicom.dataset import Dataset, FileMetaDataset
 from pydicom.uid import JPEG2000Lossless
 from gantry.io_handlers import _compress_j2k
 
+@pytest.fixture(autouse=True)
+def pillow_encoder(monkeypatch):
+    """These tests cover the Pillow encoder, used when imagecodecs is unavailable."""
+    monkeypatch.setattr('gantry.io_handlers.imagecodecs', None)
+
 @pytest.fixture
 def mock_dataset_compress():
     ds = MagicMock(spec=Dataset)
@@ -27,7 +32,7 @@ def test_compress_j2k_with_array(mock_dataset_compress):
     # Patch the global modules that _compress_j2k imports
     with patch('gantry.io_handlers.Image') as mock_img_cls: # Mock PIL.Image class
         # Patch encapsulation in gantry.io_handlers directly
-        with patch('gantry.io_handlers.encapsulate', return_value=b"compressed_data") as mock_enc:
+        with patch('gantry.io_handlers._encapsulate_frames', return_value=b"compressed_data") as mock_enc:
 
             mock_img_cls.fromarray.return_value.save.side_effect = lambda fp, **kwargs: fp.write(b"compressed_data")
 
@@ -38,7 +43,7 @@ def test_compress_j2k_with_array(mock_dataset_compress):
 def test_compress_j2k_success(mock_dataset_compress):
     arr = np.zeros((10, 10), dtype=np.uint8)
 
-    with patch('gantry.io_handlers.encapsulate', return_value=b"encapsulated_frames"):
+    with patch('gantry.io_handlers._encapsulate_frames', return_value=b"encapsulated_frames"):
         with patch('gantry.io_handlers.Image.fromarray') as mock_fromarray:
              mock_fromarray.return_value.save.side_effect = lambda fp, **kwargs: fp.write(b"j2k_bytes")
 
@@ -49,7 +54,7 @@ def test_compress_j2k_success(mock_dataset_compress):
 
 def test_compress_j2k_fallback_reconstruct(mock_dataset_compress):
     # No array provided, should reconstruct from ds.PixelData
-    with patch('gantry.io_handlers.encapsulate', return_value=b"encapsulated"):
+    with patch('gantry.io_handlers._encapsulate_frames', return_value=b"encapsulated"):
         with patch('gantry.io_handlers.Image.fromarray') as mock_fromarray:
             _compress_j2k(mock_dataset_compress, pixel_array=None)
 
@@ -61,7 +66,7 @@ def test_compress_j2k_frames(mock_dataset_compress):
     mock_dataset_compress.NumberOfFrames = 2
     mock_dataset_compress.PixelData = b'\x00' * 200 # 2 frames
 
-    with patch('gantry.io_handlers.encapsulate', return_value=b"encapsulated"):
+    with patch('gantry.io_handlers._encapsulate_frames', return_value=b"encapsulated"):
          with patch('gantry.io_handlers.Image.fromarray') as mock_fromarray:
              _compress_j2k(mock_dataset_compress, pixel_array=None)
              assert mock_fromarray.call_count == 2 # Called for each frame
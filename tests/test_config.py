@@ -1,18 +1,29 @@
 import pytest
 import json
 import os
+import _yaml_helpers as yaml_io
 from gantry.config_manager import ConfigLoader
 
-def test_load_valid_config(tmp_path):
+
+@pytest.fixture(scope="module")
+def write_config(tmp_path_factory):
+    """Writes `data` (YAML by default) under one directory shared by the module's tests."""
+    root = tmp_path_factory.mktemp("config")
+
+    def _write(name, data, dump=yaml_io.dump):
+        p = root / name
+        p.write_text(dump(data))
+        return str(p)
+    return _write
+
+# JSON is a subset of YAML, so legacy JSON rule files load through the same parser
+@pytest.mark.parametrize("ext, dump", [("yaml", yaml_io.dump), ("yml", yaml_io.dump), ("json", json.dumps)])
+def test_load_valid_config(write_config, ext, dump):
     data = {
         "version": "1.0",
         "machines": [{"serial_number": "SN1", "redaction_zones": []}]
     }
-    p = tmp_path / "valid.yaml"
-    import yaml
-    p.write_text(yaml.dump(data))
-
-    rules = ConfigLoader.load_redaction_rules(str(p))
+    rules = ConfigLoader.load_redaction_rules(write_config(f"valid.{ext}", data, dump))
     assert len(rules) == 1
     assert rules[0]["serial_number"] == "SN1"
 
@@ -21,35 +32,25 @@ def test_missing_file():
     with pytest.raises(FileNotFoundError):
         ConfigLoader.load_redaction_rules("/non/existent/path.yaml")
 
-def test_invalid_yaml(tmp_path):
-    p = tmp_path / "bad.yaml"
-    p.write_text("unclosed: { brace")
+@pytest.mark.parametrize("name, text", [("bad.yaml", "unclosed: { brace"), ("bad.json", '{"machines": [')])
+def test_invalid_yaml(tmp_path, name, text):
+    p = tmp_path / name
+    p.write_text(text)
 
     with pytest.raises(ValueError, match="Invalid YAML"):
         ConfigLoader.load_redaction_rules(str(p))
 
-def test_validation_logic(tmp_path):
-    import yaml
-    # 1. Missing SN
-    data = {"machines": [{"redaction_zones": []}]}
-    p = tmp_path / "bs1.yaml"
-    p.write_text(yaml.dump(data))
-    with pytest.raises(ValueError, match="Missing 'serial_number'"):
-        ConfigLoader.load_redaction_rules(str(p))
-
-    # 2. Invalid ROI Type
-    data = {"machines": [{"serial_number": "S", "redaction_zones": [{"roi": "bad"}]}]}
-    p = tmp_path / "bs2.yaml"
-    p.write_text(yaml.dump(data))
-    with pytest.raises(ValueError, match="ROI must be a list"):
-        ConfigLoader.load_redaction_rules(str(p))
-
-    # 3. Invalid ROI Range (Start > End)
-    data = {"machines": [{"serial_number": "S", "redaction_zones": [{"roi": [10, 5, 0, 10]}]}]}
-    p = tmp_path / "bs3.yaml"
-    p.write_text(yaml.dump(data))
-    with pytest.raises(ValueError, match="Invalid ROI logic"):
-        ConfigLoader.load_redaction_rules(str(p))
+@pytest.mark.parametrize("name, machine, match", [
+    ("no_sn", {"redaction_zones": []}, "Missing 'serial_number'"),
+    ("roi_type", {"serial_number": "S", "redaction_zones": [{"roi": "bad"}]}, "ROI must be a list"),
+    ("roi_len", {"serial_number": "S", "redaction_zones": [[0, 10, 0]]}, "ROI must be a list"),
+    ("roi_negative", {"serial_number": "S", "redaction_zones": [[-10, 50, 10, 50]]}, "non-negative"),
+    ("roi_range", {"serial_number": "S", "redaction_zones": [{"roi": [10, 5, 0, 10]}]}, "Invalid ROI logic"),
+])
+def test_validation_logic(write_config, name, machine, match):
+    p = write_config(f"{name}.yaml", {"machines": [machine]})
+    with pytest.raises(ValueError, match=match):
+        ConfigLoader.load_redaction_rules(p)
 
 def test_phi_config_default():
     # Calling with None should attempt to load default.
@@ -57,12 +58,13 @@ def test_phi_config_default():
     tags = ConfigLoader.load_phi_config(None)
     assert isinstance(tags, dict)
 
-def test_phi_config_override(tmp_path):
-    data = {"phi_tags": {"0010,0010": "PatientName"}}
-    p = tmp_path / "phi.yaml"
-    import yaml
-    p.write_text(yaml.dump(data))
+    # Defaults are cached, but each caller gets an independent copy
+    tags["9999,9999"] = "Injected"
+    assert "9999,9999" not in ConfigLoader.load_phi_config(None)
+    assert ConfigLoader.load_phi_config(None) == ConfigLoader.load_phi_config(None)
 
-    tags = ConfigLoader.load_phi_config(str(p))
+def test_phi_config_override(write_config):
+    data = {"phi_tags": {"0010,0010": "PatientName"}}
+    tags = ConfigLoader.load_phi_config(write_config("phi.yaml", data))
     assert "0010,0010" in tags
     assert tags["0010,0010"] == "PatientName"
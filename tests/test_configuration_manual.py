@@ -1,16 +1,16 @@
 import os
 import shutil
+import _yaml_helpers as yaml_io
 
 from gantry.session import DicomSession
 from gantry.configuration import GantryConfiguration
 
-# Cleanup previous runs
-if os.path.exists("test_config_api.db"):
-    os.remove("test_config_api.db")
+def test_configuration_api(tmp_path):
+    export_config = str(tmp_path / "test_export_config.yaml")
+    import_config = str(tmp_path / "test_import_config.yaml")
 
-def test_configuration_api():
     print("Initialize Session...")
-    s = DicomSession("test_config_api.db")
+    s = DicomSession(str(tmp_path / "test_config_api.db"))
 
     # 1. Test Initial State
     assert isinstance(s.configuration, GantryConfiguration)
@@ -46,16 +46,15 @@ def test_configuration_api():
     # 6. Test Config Export (Round Trip check)
     print("Testing Config Export...")
     s.configuration.add_rule("SERIAL_EXPORT", "Man", "Mod", [])
-    s.create_config("test_export_config.yaml")
+    s.create_config(export_config)
 
-    assert os.path.exists("test_export_config.yaml")
+    assert os.path.exists(export_config)
 
     # 7. Test Config Load
     print("Testing Config Load...")
     # Safe YAML modification
-    import yaml
-    with open("test_export_config.yaml", "r") as f:
-        data = yaml.safe_load(f)
+    with open(export_config, "r") as f:
+        data = yaml_io.load(f)
 
     if "machines" not in data:
         data["machines"] = []
@@ -67,11 +66,11 @@ def test_configuration_api():
         "redaction_zones": []
     })
 
-    with open("test_import_config.yaml", "w") as f:
-        yaml.dump(data, f)
+    with open(import_config, "w") as f:
+        yaml_io.dump(data, f)
 
 
-    s.load_config("test_import_config.yaml")
+    s.load_config(import_config)
 
     found = s.configuration.get_rule("LOADED_SERIAL")
     assert found is not None
@@ -81,18 +80,13 @@ def test_configuration_api():
     s.close()
 
 if __name__ == "__main__":
-    try:
-        test_configuration_api()
-    except Exception as e:
-        print(f"FAILED: {e}")
-        import traceback
-        traceback.print_exc()
-        exit(1)
-
-    # Cleanup
-    if os.path.exists("test_config_api.db"):
-        os.remove("test_config_api.db")
-    if os.path.exists("test_export_config.yaml"):
-        os.remove("test_export_config.yaml")
-    if os.path.exists("test_import_config.yaml"):
-        os.remove("test_import_config.yaml")
+    import pathlib
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            test_configuration_api(pathlib.Path(tmp))
+        except Exception as e:
+            print(f"FAILED: {e}")
+            import traceback
+            traceback.print_exc()
+            exit(1)
@@ -1,11 +1,71 @@
 
 import pytest
 import os
-import yaml
+import sys
+import contextlib
+import _yaml_helpers as yaml_io
 import stat
 from gantry.configuration import GantryConfiguration
 from gantry.session import DicomSession
 
+@contextlib.contextmanager
+def _readonly(path):
+    """Makes `path` read-only for the duration of the block, then restores its mode."""
+    old_mode = os.stat(path).st_mode
+    os.chmod(path, stat.S_IREAD)
+    try:
+        yield
+    finally:
+        os.chmod(path, old_mode)
+
+
+def _index(machines):
+    return {m["serial_number"]: m for m in machines}
+
+
+def test_rule_lookup_follows_direct_edits():
+    config = GantryConfiguration()
+    config.add_rule("SN1")
+    config.add_rule("SN2")
+    assert config.get_rule("SN2")["serial_number"] == "SN2"
+
+    # Direct list edits, as done by the session and automation code
+    config.rules.append({"serial_number": "SN3", "redaction_zones": []})
+    config.rules = config.rules + [{"serial_number": "SN1", "redaction_zones": [[1, 2, 3, 4]]}]
+    config.get_rule("SN2")["serial_number"] = "SN4"
+
+    assert config.get_rule("SN3") is config.rules[2]
+    assert config.get_rule("SN1") is config.rules[0]  # First match wins
+    assert config.get_rule("SN2") is None
+    assert config.get_rule("SN4") is config.rules[1]
+
+    # Same-length replacement of a slot, then a serial edited in place and
+    # looked up under its new value first
+    config.rules[2] = {"serial_number": "SN5", "redaction_zones": []}
+    assert config.get_rule("SN5") is config.rules[2]
+    assert config.get_rule("SN3") is None
+    config.rules[2]["serial_number"] = "SN6"
+    assert config.get_rule("SN6") is config.rules[2]
+    assert config.get_rule("SN5") is None
+    config.rules[2]["serial_number"] = "SN3"
+
+    assert config.delete_rule("SN1")
+    assert not config.delete_rule("SN1")
+    assert [r["serial_number"] for r in config.rules] == ["SN4", "SN3"]
+
+
+@pytest.fixture(scope="class")
+def shared_session(tmp_path_factory):
+    """
+    One session per test class: each test calls load_config(), which
+    replaces the configuration wholesale, so no state carries over.
+    """
+    db_path = str(tmp_path_factory.mktemp("config_persist") / "gantry_test.db")
+    session = DicomSession(persistence_file=db_path)
+    yield session
+    session.close()
+
+
 class TestConfigurationPersistence:
 
     @pytest.fixture
@@ -17,12 +77,11 @@ class TestConfigurationPersistence:
                 {"serial_number": "INIT001", "redaction_zones": []}
             ]
         }
-        p.write_text(yaml.dump(data))
+        p.write_text(yaml_io.dump(data))
         return str(p)
 
-    def test_save_on_add_rule(self, config_file, tmp_path):
-        db_path = str(tmp_path / "gantry_test.db")
-        session = DicomSession(persistence_file=db_path)
+    def test_save_on_add_rule(self, shared_session, config_file):
+        session = shared_session
         session.load_config(config_file)
 
         # Add a new rule
@@ -30,20 +89,17 @@ class TestConfigurationPersistence:
 
         # Verify persistence
         with open(config_file, 'r') as f:
-            data = yaml.safe_load(f)
+            data = yaml_io.load(f)
 
         machines = data.get("machines", [])
         assert len(machines) == 2
-        new_rule = next((m for m in machines if m["serial_number"] == "NEW002"), None)
+        new_rule = _index(machines).get("NEW002")
         assert new_rule is not None
         assert new_rule["manufacturer"] == "NewMan"
         assert new_rule["redaction_zones"] == [[0,10,0,10]]
 
-        session.close()
-
-    def test_save_on_update_rule(self, config_file, tmp_path):
-        db_path = str(tmp_path / "gantry_test_update.db")
-        session = DicomSession(persistence_file=db_path)
+    def test_save_on_update_rule(self, shared_session, config_file):
+        session = shared_session
         session.load_config(config_file)
 
         # Update existing rule
@@ -51,17 +107,14 @@ class TestConfigurationPersistence:
 
         # Verify persistence
         with open(config_file, 'r') as f:
-            data = yaml.safe_load(f)
+            data = yaml_io.load(f)
 
         machines = data.get("machines", [])
-        rule = next((m for m in machines if m["serial_number"] == "INIT001"), None)
+        rule = _index(machines).get("INIT001")
         assert rule["redaction_zones"] == [[50,60,50,60]]
 
-        session.close()
-
-    def test_save_on_delete_rule(self, config_file, tmp_path):
-        db_path = str(tmp_path / "gantry_test_del.db")
-        session = DicomSession(persistence_file=db_path)
+    def test_save_on_delete_rule(self, shared_session, config_file):
+        session = shared_session
         session.load_config(config_file)
 
         # Delete rule
@@ -69,16 +122,13 @@ class TestConfigurationPersistence:
 
         # Verify persistence
         with open(config_file, 'r') as f:
-            data = yaml.safe_load(f)
+            data = yaml_io.load(f)
 
         machines = data.get("machines", [])
         assert len(machines) == 0
 
-        session.close()
-
-    def test_save_on_phi_tag(self, config_file, tmp_path):
-        db_path = str(tmp_path / "gantry_test_phi.db")
-        session = DicomSession(persistence_file=db_path)
+    def test_save_on_phi_tag(self, shared_session, config_file):
+        session = shared_session
         session.load_config(config_file)
 
         # Add PHI tag
@@ -86,28 +136,23 @@ class TestConfigurationPersistence:
 
         # Verify persistence
         with open(config_file, 'r') as f:
-            data = yaml.safe_load(f)
+            data = yaml_io.load(f)
 
         phi = data.get("phi_tags", {})
         assert "0010,0010" in phi
         assert phi["0010,0010"]["action"] == "REPLACE"
         assert phi["0010,0010"]["replacement"] == "John Doe"
 
-        session.close()
-
-    def test_save_permission_error_handling(self, config_file, tmp_path, capsys):
+    @pytest.mark.skipif(sys.platform == "win32", reason="chmod cannot make files read-only on Windows")
+    def test_save_permission_error_handling(self, shared_session, config_file, capsys):
         """
         Ensures that if the file is not writable, the application doesn't crash
         and prints a warning (as per our implementation).
         """
-        db_path = str(tmp_path / "gantry_test_perm.db")
-        session = DicomSession(persistence_file=db_path)
+        session = shared_session
         session.load_config(config_file)
 
-        # Make config file read-only
-        os.chmod(config_file, stat.S_IREAD)
-
-        try:
+        with _readonly(config_file):
             # Attempt modification
             session.configuration.add_rule("ERR001", "ErrMan", "ErrModel")
 
@@ -121,9 +166,3 @@ class TestConfigurationPersistence:
             # we might see the print.
 
             assert "WARNING: Failed to auto-save configuration" in captured.out
-
-        finally:
-            # Restore permissions for cleanup
-            os.chmod(config_file, stat.S_IWUSR | stat.S_IREAD)
-
-        session.close()
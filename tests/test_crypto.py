@@ -68,3 +68,99 @@ def test_wrong_key(tmp_path):
 
     with pytest.raises(InvalidToken):
         e2.decrypt(token)
+
+def test_rfernet_tokens_interoperate(tmp_path):
+    """The rfernet-backed engine reads and writes standard Fernet tokens."""
+    pytest.importorskip("rfernet")
+    from cryptography.fernet import Fernet
+
+    key = KeyManager(str(tmp_path / "interop.key")).load_or_generate_key()
+    engine = CryptoEngine(key)
+
+    assert Fernet(key).decrypt(engine.encrypt(b"Msg")) == b"Msg"
+    assert engine.decrypt(Fernet(key).encrypt(b"Msg")) == b"Msg"
+
+@pytest.fixture
+def stub_rfernet(monkeypatch):
+    """
+    Installs a stand-in for the rfernet module with its API: str keys and tokens,
+    bytes payloads, and DecryptionError on bad tokens.
+    """
+    import types
+    from cryptography.fernet import Fernet
+
+    class DecryptionError(Exception):
+        pass
+
+    class StubFernet:
+        def __init__(self, key: str):
+            if not isinstance(key, str):
+                raise TypeError("key must be str")
+            self._fernet = Fernet(key.encode("ascii"))
+
+        def encrypt(self, data: bytes) -> str:
+            return self._fernet.encrypt(data).decode("ascii")
+
+        def decrypt(self, token: str) -> bytes:
+            if not isinstance(token, str):
+                raise TypeError("token must be str")
+            try:
+                return self._fernet.decrypt(token.encode("ascii"))
+            except InvalidToken:
+                raise DecryptionError("Decryption failed, token or key invalid.")
+
+    module = types.SimpleNamespace(Fernet=StubFernet, DecryptionError=DecryptionError)
+    monkeypatch.setattr("gantry.crypto.rfernet", module)
+    return module
+
+def test_rfernet_path_with_stub(tmp_path, stub_rfernet):
+    """The rfernet branch keeps bytes tokens and maps its errors to InvalidToken."""
+    from cryptography.fernet import Fernet
+
+    key = KeyManager(str(tmp_path / "stub.key")).load_or_generate_key()
+    engine = CryptoEngine(key)
+    assert isinstance(engine.fernet, stub_rfernet.Fernet)
+
+    token = engine.encrypt(b"Msg")
+    assert isinstance(token, bytes)
+    assert Fernet(key).decrypt(token) == b"Msg"
+    assert engine.decrypt(Fernet(key).encrypt(b"Msg")) == b"Msg"
+
+    bad_token = bytearray(token)
+    bad_token[-1] ^= 1
+    with pytest.raises(InvalidToken):
+        engine.decrypt(bytes(bad_token))
+    with pytest.raises(InvalidToken):
+        engine.decrypt(b"\xff" + token)
+    with pytest.raises(InvalidToken):
+        CryptoEngine(Fernet.generate_key()).decrypt(token)
+
+@pytest.mark.parametrize("ia32cap, masked", [
+    ("", False),
+    ("~0x200000000000000", True),
+    ("~0x200000000000000:0", True),
+    ("~0x1", False),
+    ("0x0", True),
+    ("not-a-number", False),
+])
+def test_aesni_env_mask(monkeypatch, ia32cap, masked):
+    from gantry.crypto import _aesni_masked_by_env
+    monkeypatch.setenv("OPENSSL_ia32cap", ia32cap)
+    assert _aesni_masked_by_env() is masked
+
+def test_key_reload_uses_cache_until_file_changes(tmp_path, monkeypatch):
+    key_file = tmp_path / "cached.key"
+    key = KeyManager(str(key_file)).load_or_generate_key()
+
+    # Unchanged file: served from the cache without reading it
+    def no_read(*args, **kwargs):
+        raise AssertionError("key file was re-read")
+    with monkeypatch.context() as m:
+        m.setattr("builtins.open", no_read)
+        assert KeyManager(str(key_file)).load_or_generate_key() == key
+
+    # Replaced file: the new key is picked up
+    new_key = b"x" * len(key)
+    key_file.write_bytes(new_key)
+    os.utime(key_file, ns=(0, 0))
+    assert KeyManager(str(key_file)).load_or_generate_key() == new_key
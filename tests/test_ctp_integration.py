@@ -46,7 +46,7 @@ class TestCTPParser:
             data = json.load(f)
             assert len(data.get("rules", [])) > 0
 
-    def test_cli_generates_yaml(self, tmp_path):
+    def test_cli_generates_yaml(self, tmp_path, monkeypatch):
         """
         Runs the parser utility and expects a YAML file.
         """
@@ -56,13 +56,13 @@ class TestCTPParser:
         with open(script_path, "w") as f:
             f.write(TEST_SCRIPT_CONTENT)
 
-        # Simulate running the tool (invoking the main block logic or using subprocess)
-        # Using subprocess to be true to CLI
-        import subprocess
+        # Run the CLI's __main__ block in-process, as `python -m gantry.utils.ctp_parser` would
+        import runpy
         import sys
+        import gantry.utils.ctp_parser as ctp_parser_module
 
-        cmd = [sys.executable, "-m", "gantry.utils.ctp_parser", str(script_path), str(output_path)]
-        subprocess.check_call(cmd)
+        monkeypatch.setattr(sys, "argv", ["ctp_parser", str(script_path), str(output_path)])
+        runpy.run_path(ctp_parser_module.__file__, run_name="__main__")
 
         assert os.path.exists(output_path)
 
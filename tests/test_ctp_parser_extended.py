@@ -2,6 +2,7 @@
 import sys
 import os
 import io
+import runpy
 import pytest
 from unittest.mock import patch, mock_open
 from gantry.utils.ctp_parser import CTPParser
@@ -60,35 +61,28 @@ def test_main_execution_success(tmp_path):
         # Let's use subprocess for the main block coverage
         pass
 
-def test_main_subprocess_execution(tmp_path):
-    import subprocess
+def _run_main(monkeypatch, *args):
+    """Runs the module's __main__ block in-process with `args` as the command line."""
+    monkeypatch.setattr(sys, "argv", ["ctp_parser", *args])
+    runpy.run_path(ctp_parser_module.__file__, run_name="__main__")
+
+def test_main_execution(tmp_path, monkeypatch, capsys):
     input_file = tmp_path / "test.script"
     output_file = tmp_path / "test.yaml"
     input_file.write_text(SAMPLE_SCRIPT)
 
-    # Get the python executable
-    python_exe = sys.executable
-    script_path = os.path.abspath(ctp_parser_module.__file__)
-
-    result = subprocess.run([python_exe, script_path, str(input_file), str(output_file)], capture_output=True, text=True)
-    assert result.returncode == 0
-    assert "Successfully converted" in result.stdout
+    _run_main(monkeypatch, str(input_file), str(output_file))
+    assert "Successfully converted" in capsys.readouterr().out
     assert output_file.exists()
 
-def test_main_subprocess_missing_args():
-    import subprocess
-    python_exe = sys.executable
-    script_path = os.path.abspath(ctp_parser_module.__file__)
-
-    result = subprocess.run([python_exe, script_path], capture_output=True, text=True)
-    assert result.returncode == 1
-    assert "Usage:" in result.stdout
-
-def test_main_subprocess_file_not_found():
-    import subprocess
-    python_exe = sys.executable
-    script_path = os.path.abspath(ctp_parser_module.__file__)
-
-    result = subprocess.run([python_exe, script_path, "nonexistent", "out.yaml"], capture_output=True, text=True)
-    assert result.returncode == 1
-    assert "Error: Input file" in result.stdout
+def test_main_missing_args(monkeypatch, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        _run_main(monkeypatch)
+    assert excinfo.value.code == 1
+    assert "Usage:" in capsys.readouterr().out
+
+def test_main_file_not_found(monkeypatch, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        _run_main(monkeypatch, "nonexistent", "out.yaml")
+    assert excinfo.value.code == 1
+    assert "Error: Input file" in capsys.readouterr().out
@@ -1,7 +1,8 @@
 import pytest
 import os
-import yaml
-from gantry.config_manager import load_unified_config
+import _yaml_helpers as yaml_io
+from unittest.mock import patch
+from gantry.config_manager import load_unified_config, ConfigLoader
 
 def test_load_custom_privacy_profile(tmp_path):
     """
@@ -17,7 +18,7 @@ def test_load_custom_privacy_profile(tmp_path):
     }
     profile_path = tmp_path / "my_custom_profile.yaml"
     with open(profile_path, "w") as f:
-        yaml.dump(custom_profile, f)
+        yaml_io.dump(custom_profile, f)
 
     # 2. Create a main config referencing the profile
     main_config = {
@@ -28,7 +29,7 @@ def test_load_custom_privacy_profile(tmp_path):
     }
     config_path = tmp_path / "main_config.yaml"
     with open(config_path, "w") as f:
-        yaml.dump(main_config, f)
+        yaml_io.dump(main_config, f)
 
     # 3. Load Unified Config
     config = load_unified_config(str(config_path))
@@ -56,7 +57,7 @@ def test_load_nonexistent_custom_profile(tmp_path, caplog):
     }
     config_path = tmp_path / "bad_config.yaml"
     with open(config_path, "w") as f:
-        yaml.dump(main_config, f)
+        yaml_io.dump(main_config, f)
 
     # Should log a warning but not crash
     config = load_unified_config(str(config_path))
@@ -66,3 +67,32 @@ def test_load_nonexistent_custom_profile(tmp_path, caplog):
 
     # Verify warning log
     assert "Unknown privacy profile reference" in caplog.text
+
+def test_custom_profile_cached_until_file_changes(tmp_path):
+    """
+    A custom profile file is parsed once per modification time; merging into
+    one config must not leak into the next load.
+    """
+    profile_path = tmp_path / "cached_profile.yaml"
+    with open(profile_path, "w") as f:
+        yaml_io.dump({"phi_tags": {"0010,0010": {"action": "REMOVE"}}}, f)
+    config_path = tmp_path / "main_config.yaml"
+    with open(config_path, "w") as f:
+        yaml_io.dump({"privacy_profile": str(profile_path),
+                      "phi_tags": {"0010,0020": {"action": "REPLACE"}}}, f)
+
+    with patch.object(ConfigLoader, "_load_yaml", wraps=ConfigLoader._load_yaml) as parse:
+        first = load_unified_config(str(config_path))
+        first["phi_tags"]["0010,0010"]["action"] = "KEEP"
+        second = load_unified_config(str(config_path))
+        assert parse.call_count == 1
+        assert second["phi_tags"]["0010,0010"]["action"] == "REMOVE"
+
+        # Rewriting the profile (new mtime) is picked up
+        with open(profile_path, "w") as f:
+            yaml_io.dump({"phi_tags": {"0010,0010": {"action": "EMPTY"}}}, f)
+        stat = os.stat(profile_path)
+        os.utime(profile_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        third = load_unified_config(str(config_path))
+        assert parse.call_count == 2
+        assert third["phi_tags"]["0010,0010"]["action"] == "EMPTY"
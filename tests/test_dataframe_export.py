@@ -3,13 +3,15 @@ import pandas as pd
 import os
 import sqlite3
 from gantry.session import DicomSession
-from gantry.entities import Patient, Study, Series, Instance
+from gantry.entities import Patient, Study, Series, Instance, Equipment
 from gantry.persistence import GantryJSONEncoder
 import json
+import datetime
 
-@pytest.fixture
-def session_with_data(tmp_path):
-    db_path = tmp_path / "gantry_test.db"
+@pytest.fixture(scope="module")
+def session_with_data(tmp_path_factory):
+    """Read-only for the tests below, so one populated session serves the module."""
+    db_path = tmp_path_factory.mktemp("dfexport") / "gantry_test.db"
     session = DicomSession(str(db_path))
 
     # Manually populate the database with some hierarchical data
@@ -29,14 +31,13 @@ def session_with_data(tmp_path):
     p.studies.append(st)
 
     session.store.patients = [p]
-    session.save() # This triggers the full save pipeline
-    session.persistence_manager.flush() # Wait for DB write
+    session.save(sync=True) # Committed on this thread before returning
 
     yield session
     session.close()
 
-def test_export_dataframe_basic(session_with_data):
-    df = session_with_data.export_dataframe()
+def test_export_dataframe_basic(session_with_data, tmp_path):
+    df = session_with_data.export_dataframe(str(tmp_path / "export_metadata.csv"))
     assert isinstance(df, pd.DataFrame)
     assert len(df) == 1
     assert df.iloc[0]['PatientID'] == "P1"
@@ -57,10 +58,15 @@ def test_export_dataframe_parquet(session_with_data, tmp_path):
     assert len(df_read) == 1
     assert df_read.iloc[0]['PatientID'] == "P1"
 
-def test_export_dataframe_expand_metadata(session_with_data):
+    pq = pytest.importorskip("pyarrow.parquet")
+    column = pq.ParquetFile(output_path).metadata.row_group(0).column(0)
+    assert column.compression == "SNAPPY"
+    assert any("DICT" in enc for enc in column.encodings)
+
+def test_export_dataframe_expand_metadata(session_with_data, tmp_path):
     # This requires us to modify the implementation to actually parse the JSON if expand_metadata=True
     # For now, let's assume we implement it or at least call it.
-    df = session_with_data.export_dataframe(expand_metadata=True)
+    df = session_with_data.export_dataframe(str(tmp_path / "export_metadata.csv"), expand_metadata=True)
 
     # If expansion works, we should see "SliceThickness" as a column or at least check logic
     # The current plan is to implement it, so let's assert it.
@@ -70,3 +76,62 @@ def test_export_dataframe_expand_metadata(session_with_data):
 
     assert 'SliceThickness' in df.columns
     assert df.iloc[0]['SliceThickness'] == 1.5
+
+def test_cohort_report_attribute_overrides(tmp_path):
+    """Expanded attributes override same-named basic columns only where present."""
+    session = DicomSession(str(tmp_path / "overrides.db"))
+    try:
+        p = Patient("P1", "Test Patient")
+        st = Study("ST1", "20230101")
+        se = Series("SE1", "CT", 1)
+        for uid, attrs in [("I1", {"Modality": "MR", "EchoTime": 12}), ("I2", {})]:
+            inst = Instance(uid, "1.2.840.123", 1)
+            inst.attributes = attrs
+            se.instances.append(inst)
+        st.series.append(se)
+        p.studies.append(st)
+        session.store.patients = [p]
+
+        df = session.get_cohort_report(expand_metadata=True)
+        assert list(df["Modality"]) == ["MR", "CT"]
+        assert df.iloc[0]["EchoTime"] == 12 and pd.isna(df.iloc[1]["EchoTime"])
+        assert list(df.columns[:7]) == ["PatientID", "PatientName", "StudyInstanceUID", "StudyDate",
+                                        "SeriesInstanceUID", "Modality", "SOPInstanceUID"]
+    finally:
+        session.close()
+
+def test_export_dataframe_from_db_matches_object_graph(tmp_path):
+    """The SQL export and the object walk give the same frame, dtypes and nulls included."""
+    session = DicomSession(str(tmp_path / "from_db.db"))
+    try:
+        p = Patient("P1", "Test Patient")
+        st = Study("ST1", datetime.date(2023, 1, 1))  # As import_folder builds it
+        st2 = Study("ST2", "20230102")
+        series = [Series("SE1", "CT", 1, equipment=Equipment("GE", "Revolution", None)),
+                  Series("SE2", "MR", 2),
+                  Series("SE3", "US", 3)]
+        for i, se in enumerate(series):
+            inst = Instance(f"I{i}", "1.2.840.123", 1)
+            se.instances.append(inst)
+        st.series.extend(series[:2])
+        st2.series.append(series[2])
+        p.studies.extend([st, st2])
+        session.store.patients = [p]
+        session.save(sync=True)
+
+        out = tmp_path / "cohort.csv"
+        db_df = session.export_dataframe(str(out), from_db=True)
+        pd.testing.assert_frame_equal(db_df, session.get_cohort_report())
+        assert db_df["StudyDate"].tolist() == [datetime.date(2023, 1, 1)] * 2 + ["20230102"]
+        assert db_df["DeviceSerial"].isna().tolist() == [True, False, False]
+        assert db_df["Manufacturer"].tolist() == ["GE", "", ""]
+
+        # No hidden save: the SQL path reports what was last saved
+        series[1].instances.append(Instance("I9", "1.2.840.123", 2))
+        assert len(session.export_dataframe(str(out), from_db=True)) == 3
+        assert len(session.export_dataframe(str(out))) == 4
+
+        with pytest.raises(ValueError):
+            session.export_dataframe(str(out), expand_metadata=True, from_db=True)
+    finally:
+        session.close()
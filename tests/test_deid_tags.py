@@ -56,3 +56,26 @@ def test_deid_tags_idempotency():
     # We only check for our specific code item count, assuming we are the only one adding it
     # But for a fresh instance it should be 1
     assert len(seq.items) == 1
+
+def test_deid_tags_restamp_leaves_entity_clean():
+    """Re-stamping an already stamped entity does not modify (re-dirty) it."""
+    inst = Instance("I1", "SOP1", 1)
+    svc = RemediationService()
+    svc.add_global_deid_tags(inst)
+
+    version = inst._mod_count
+    svc.add_global_deid_tags(inst)
+    assert inst._mod_count == version
+
+def test_deid_code_items_not_shared():
+    """Each stamped entity owns its code item; editing one leaves the others alone."""
+    svc = RemediationService()
+    a, b = Instance("I1", "SOP1", 1), Instance("I2", "SOP1", 2)
+    svc.add_global_deid_tags(a)
+    svc.add_global_deid_tags(b)
+
+    item_a = a.sequences["0012,0064"].items[0]
+    item_b = b.sequences["0012,0064"].items[0]
+    assert item_a is not item_b
+    item_a.set_attr("0008,0104", "Edited")
+    assert item_b.attributes["0008,0104"] == "Basic Application Confidentiality Profile"
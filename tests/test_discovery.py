@@ -1,30 +1,47 @@
+import sys
 import unittest
+from unittest.mock import MagicMock
+
+import pytest
 from gantry.discovery import ZoneDiscoverer
 
+
+@pytest.fixture
+def pandas_absent(monkeypatch):
+    """Makes `import pandas` raise ImportError, even if pandas is installed."""
+    monkeypatch.setitem(sys.modules, "pandas", None)
+
+
+@pytest.fixture
+def mock_pandas(monkeypatch, request):
+    """Installs a fresh MagicMock as pandas, exposed to TestCase methods as self.mock_pd."""
+    mock_pd = MagicMock()
+    monkeypatch.setitem(sys.modules, "pandas", mock_pd)
+    request.instance.mock_pd = mock_pd
+    return mock_pd
+
+
 class TestZoneDiscoverer(unittest.TestCase):
 
     def test_overlap_logic(self):
-        # [x, y, w, h]
-        b1 = [0, 0, 10, 10]
-
-        # Overlap
-        b2 = [5, 5, 10, 10] # Starts inside b1
-        self.assertTrue(ZoneDiscoverer._boxes_overlap(b1, b2, 0, 0), "Boxes should overlap")
-
-        # No overlap (Right)
-        b3 = [20, 0, 10, 10]
-        self.assertFalse(ZoneDiscoverer._boxes_overlap(b1, b3, 0, 0), "Boxes should NOT overlap")
-
-        # Touching (Should be false or true depending on strictness? Code says strict inequality)
-        # r1 < l2: 10 < 10 is False.
-        # r1 is b1[0]+b1[2] = 10.
-        # l2 is 10.
-        # 10 < 10 False.
-        # Logic is `not (r1 < l2 ...)`
-        # If they touch, `r1 == l2`, so `r1 < l2` is MATCH False.
-        # So they overlap.
-        b4 = [10, 0, 10, 10]
-        self.assertTrue(ZoneDiscoverer._boxes_overlap(b1, b4, 0, 0), "Touching boxes should overlap (merge edge)")
+        # Padding defaults to 0, so both call forms must agree
+        for pad in ((), (0, 0)):
+            with self.subTest(pad=pad):
+                # [x, y, w, h]
+                b1 = [0, 0, 10, 10]
+
+                # Overlap
+                b2 = [5, 5, 10, 10] # Starts inside b1
+                self.assertTrue(ZoneDiscoverer._boxes_overlap(b1, b2, *pad), "Boxes should overlap")
+
+                # No overlap (Right)
+                b3 = [20, 0, 10, 10]
+                self.assertFalse(ZoneDiscoverer._boxes_overlap(b1, b3, *pad), "Boxes should NOT overlap")
+
+                # Touching: the check is `not (r1 < l2 ...)` and r1 == l2 here,
+                # so touching boxes count as overlapping (merge edge).
+                b4 = [10, 0, 10, 10]
+                self.assertTrue(ZoneDiscoverer._boxes_overlap(b1, b4, *pad), "Touching boxes should overlap (merge edge)")
 
     def test_merge_simple(self):
         # Two overlapping boxes
@@ -75,6 +92,77 @@ class TestZoneDiscoverer(unittest.TestCase):
     def test_empty(self):
         self.assertEqual(ZoneDiscoverer._merge_overlapping_boxes([]), [])
 
+    def test_group_boxes_matches_pairwise_overlap(self):
+        # Clusters (and their order) match a flood fill over pairwise _boxes_overlap
+        import random
+        rng = random.Random(7)
+        boxes = [[rng.randrange(500), rng.randrange(500), rng.randrange(1, 40), rng.randrange(1, 20)]
+                 for _ in range(200)]
+        # A few wide banners, so the sweep window must reach far to the left
+        boxes += [[rng.randrange(500), rng.randrange(500), rng.randrange(100, 400), 8] for _ in range(5)]
+
+        expected, seen = [], set()
+        for i in range(len(boxes)):
+            if i in seen:
+                continue
+            seen.add(i)
+            cluster, queue = [i], [i]
+            while queue:
+                curr = queue.pop(0)
+                for j in range(len(boxes)):
+                    if j not in seen and ZoneDiscoverer._boxes_overlap(boxes[curr], boxes[j], 15, 5):
+                        seen.add(j)
+                        cluster.append(j)
+                        queue.append(j)
+            expected.append(cluster)
+
+        self.assertEqual(ZoneDiscoverer.group_boxes(boxes, pad_x=15, pad_y=5), expected)
+
+    def test_merge_matches_per_cluster_union(self):
+        import random
+        rng = random.Random(3)
+        boxes = [[rng.randrange(300), rng.randrange(300), rng.randrange(1, 40), rng.randrange(1, 20)]
+                 for _ in range(120)]
+
+        def union(members):
+            x1 = min(b[0] for b in members)
+            y1 = min(b[1] for b in members)
+            x2 = max(b[0] + b[2] for b in members)
+            y2 = max(b[1] + b[3] for b in members)
+            return [x1, y1, x2 - x1, y2 - y1]
+
+        expected = [union([boxes[i] for i in cluster])
+                    for cluster in ZoneDiscoverer.group_boxes(boxes, padding=4)]
+
+        merged = ZoneDiscoverer._merge_overlapping_boxes(boxes, padding=4)
+        self.assertEqual(merged, expected)
+        self.assertIsInstance(merged[0][0], int)  # Plain ints, safe to write to YAML
+        self.assertEqual(ZoneDiscoverer._union_box_list(boxes[:3]), union(boxes[:3]))
+
+    def test_flood_fill_kernel_matches_group_boxes(self):
+        # The Numba kernel (run here as plain Python) yields the same clusters as the numpy path
+        import random
+        from unittest.mock import patch
+        import numpy as np
+        from gantry import discovery
+
+        kernel = getattr(discovery._flood_fill_clusters, "py_func", discovery._flood_fill_clusters)
+        rng = random.Random(11)
+        boxes = [[rng.randrange(300), rng.randrange(300), rng.randrange(1, 40), rng.randrange(1, 20)]
+                 for _ in range(150)]
+        boxes += [[rng.randrange(300), rng.randrange(300), rng.randrange(100, 250), 8] for _ in range(4)]
+
+        with patch.object(discovery, "numba", None):
+            expected = ZoneDiscoverer.group_boxes(boxes, pad_x=15, pad_y=5)
+
+        arr = np.asarray(boxes)
+        left, top = arr[:, 0], arr[:, 1]
+        by_left = np.argsort(left, kind="stable")
+        members, starts = kernel(left, top, left + arr[:, 2], top + arr[:, 3],
+                                 by_left, left[by_left], arr[:, 2].max() + 15, 15, 5)
+        members, starts = members.tolist(), starts.tolist()
+        self.assertEqual([members[a:b] for a, b in zip(starts, starts[1:])], expected)
+
 class TestDiscoveryResult(unittest.TestCase):
     def test_iteration(self):
         from gantry.discovery import DiscoveryResult, DiscoveryCandidate
@@ -114,6 +202,43 @@ class TestDiscoveryResult(unittest.TestCase):
         self.assertEqual(len(filtered_conf), 1)
         self.assertEqual(filtered_conf.candidates[0].confidence, 0.9)
 
+    def test_filter_threshold_matches_python_comparison(self):
+        from gantry.discovery import DiscoveryResult, DiscoveryCandidate
+        confs = [0.9, 0.1, 0.3, 0.7, 0.9, 1.0, 0.0]
+        res = DiscoveryResult(
+            [DiscoveryCandidate(str(i), c, [0,0,1,1], i, "TEXT") for i, c in enumerate(confs)], len(confs))
+
+        for thresh in (0.0, 0.3, 0.9, 1.0, 2):
+            expected = [c for c in res.candidates if c.confidence >= thresh]
+            self.assertEqual(res.filter(thresh).candidates, expected)
+        self.assertEqual(len(DiscoveryResult([], 0).filter(0.5)), 0)
+
+        # Edits after a filter call are seen by the next one
+        res = DiscoveryResult([DiscoveryCandidate("A", 0.9, [0,0,1,1], 0, "TEXT"),
+                               DiscoveryCandidate("B", 0.1, [0,0,1,1], 1, "TEXT")], 2)
+        self.assertEqual(len(res.filter(0.5)), 1)
+        res.candidates[1].confidence = 0.95
+        self.assertEqual(len(res.filter(0.5)), 2)
+        res.candidates[0] = DiscoveryCandidate("C", 0.2, [0,0,1,1], 0, "TEXT")
+        self.assertEqual([c.text for c in res.filter(0.5)], ["B"])
+
+    def test_candidate_slots_and_box_column(self):
+        from gantry.discovery import DiscoveryResult, DiscoveryCandidate
+        c1 = DiscoveryCandidate("A", 0.9, [0,0,10,10], 0, "TEXT")
+        c2 = DiscoveryCandidate("B", 0.8, [20,30,5,6], 1, "TEXT")
+        self.assertFalse(hasattr(c1, "__dict__"))
+
+        res = DiscoveryResult([c1, c2], 2)
+        self.assertEqual(res._box_array().tolist(), [[0,0,10,10], [20,30,5,6]])
+        self.assertEqual(DiscoveryResult([], 0)._box_array().shape, (0, 4))
+
+        # Moving a box so the two overlap is seen by the next clustering call
+        self.assertEqual(len(res.inspect_clusters(pad_x=0, pad_y=0)), 2)
+        c2.box = [5, 5, 10, 10]
+        self.assertEqual(len(res.inspect_clusters(pad_x=0, pad_y=0)), 1)
+        res.candidates[1] = DiscoveryCandidate("C", 0.8, [50,50,5,5], 1, "TEXT")
+        self.assertEqual(len(res.inspect_clusters(pad_x=0, pad_y=0)), 2)
+
     def test_heatmap(self):
         from gantry.discovery import DiscoveryResult, DiscoveryCandidate
         # A 100x100 grid concept.
@@ -182,39 +307,32 @@ class TestDiscoveryResult(unittest.TestCase):
         total_count = sum(sum(row) for row in matrix)
         self.assertEqual(total_count, 1)
 
+    @pytest.mark.usefixtures("pandas_absent")
     def test_to_dataframe_pandas_missing(self):
-        # Mock sys.modules to simulate pandas missing if it happens to be installed
-        import sys
-        from unittest.mock import patch
-
         from gantry.discovery import DiscoveryResult
 
-        with patch.dict(sys.modules, {'pandas': None}):
-            res = DiscoveryResult([], 1)
-            with self.assertRaises(ImportError):
-                res.to_dataframe()
+        res = DiscoveryResult([], 1)
+        with self.assertRaises(ImportError):
+            res.to_dataframe()
 
+    @pytest.mark.usefixtures("mock_pandas")
     def test_to_dataframe_mock_success(self):
-        import sys
-        from unittest.mock import MagicMock, patch
         from gantry.discovery import DiscoveryResult, DiscoveryCandidate
 
-        mock_pd = MagicMock()
         mock_df = MagicMock()
-        mock_pd.DataFrame.return_value = mock_df
+        self.mock_pd.DataFrame.return_value = mock_df
 
-        with patch.dict(sys.modules, {'pandas': mock_pd}):
-            c1 = DiscoveryCandidate("A", 1.0, [0,0,0,0], 0, "TEXT")
-            res = DiscoveryResult([c1], 1)
+        c1 = DiscoveryCandidate("A", 1.0, [0,0,0,0], 0, "TEXT")
+        res = DiscoveryResult([c1], 1)
 
-            df = res.to_dataframe()
+        df = res.to_dataframe()
 
-            self.assertEqual(df, mock_df)
-            mock_pd.DataFrame.assert_called_once()
-            # Verify arg passed to DataFrame was a list of dicts
-            args, _ = mock_pd.DataFrame.call_args
-            data = args[0]
-            self.assertEqual(data[0]['text'], "A")
+        self.assertEqual(df, mock_df)
+        self.mock_pd.DataFrame.assert_called_once()
+        # Verify arg passed to DataFrame was a list of dicts
+        args, _ = self.mock_pd.DataFrame.call_args
+        data = args[0]
+        self.assertEqual(data[0]['text'], "A")
 
 
 if __name__ == '__main__':
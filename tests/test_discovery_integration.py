@@ -4,6 +4,7 @@ import os
 import shutil
 import tempfile
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from gantry.session import DicomSession
 # Ensure we can import the generator
 sys.path.insert(0, os.path.abspath('.'))
@@ -11,33 +12,37 @@ import scripts.generate_redaction_example as gen
 
 class TestDiscoveryIntegration(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
+        # Rendering the example images is the slow part; do it once for the class
+        cls.data_dir = None
+        if not gen.HAS_DEPS:
+            return
+
         # Seed for determinism
         import random
         random.seed(42)
-        try:
-            from faker import Faker
-            Faker.seed(42)
-        except ImportError:
-            pass
+        from faker import Faker
+        Faker.seed(42)
 
+        cls.data_root = tempfile.mkdtemp()
+        cls.data_dir = os.path.join(cls.data_root, "data")
+        gen.main(output_dir=cls.data_dir)  # Read-only for the tests below
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.data_dir:
+            shutil.rmtree(cls.data_root)
+
+    def setUp(self):
         if not gen.HAS_DEPS:
             self.skipTest("Requires 'pillow' and 'faker' which are not installed")
 
-        # Create temp environment
+        # Each test gets its own database over the shared generated data
         self.test_dir = tempfile.mkdtemp()
         self.db_path = os.path.join(self.test_dir, "test.db")
         self.session = DicomSession(self.db_path)
 
-        # Override generator path to output to temp dir
-        # The generator script is hardcoded to "test_data/redaction_examples"
-        # We'll just patch where we ingest from, but we have to let it write where it wants
-        # or monkeypatch it.
-        # Easier: Just run it, move files, or just ingest from the hardcoded path (if safe).
-        # Actually, let's just use the logic from reproduce_issue_v2.py
-
-        gen.main(output_dir=os.path.join(self.test_dir, "data")) # Generates data in the temp dir/data
-
     def tearDown(self):
         self.session.close()
         shutil.rmtree(self.test_dir)
@@ -48,7 +53,7 @@ class TestDiscoveryIntegration(unittest.TestCase):
         are merged into a single PROPER_NOUN zone using asymmetric clustering.
         """
         # 1. Ingest
-        self.session.ingest(os.path.join(self.test_dir, "data"))
+        self.session.ingest(self.data_dir)
 
         # 2. Identify Serial
         # We know the generator makes specific sets.
@@ -61,32 +66,38 @@ class TestDiscoveryIntegration(unittest.TestCase):
         found_merged_zone = False
         found_proper_noun = False
 
-        for eq in eqs:
-            serial = eq.device_serial_number
-            print(f"Scanning {serial} ({eq.manufacturer})...")
-
+        def discover(eq):
+            print(f"Scanning {eq.device_serial_number} ({eq.manufacturer})...")
             # Result is now a DiscoveryResult object
-            # We must group it to get zones
-            result = self.session.discover_redaction_zones(
-                serial,
+            return self.session.discover_redaction_zones(
+                eq.device_serial_number,
                 sample_size=10,
                 min_confidence=50.0
             )
-            zones = result.to_zones(pad_x=100, pad_y=10)
 
-            for z in zones:
-                z_type = z.get('type')
-                z_rect = z.get('zone')
-                width = z_rect[3] - z_rect[2]
-                print(f"  Zone: {z_rect} Type: {z_type} Width: {width} Examples: {z.get('examples')}")
-
-                if z_type == "PROPER_NOUN":
-                    found_proper_noun = True # At least one machine found a name
-                    if width > 250:
-                        found_merged_zone = True
-
-            if found_merged_zone:
-                break
+        # Serials cover disjoint instances and OCR runs out of process (tesseract),
+        # so scan them concurrently; results still arrive in equipment order
+        pool = ThreadPoolExecutor(max_workers=max(1, min(len(eqs), os.cpu_count() or 1)))
+        try:
+            for result in pool.map(discover, eqs):
+                # We must group it to get zones
+                zones = result.to_zones(pad_x=100, pad_y=10)
+
+                for z in zones:
+                    z_type = z.get('type')
+                    z_rect = z.get('zone')
+                    width = z_rect[3] - z_rect[2]
+                    print(f"  Zone: {z_rect} Type: {z_type} Width: {width} Examples: {z.get('examples')}")
+
+                    if z_type == "PROPER_NOUN":
+                        found_proper_noun = True # At least one machine found a name
+                        if width > 250:
+                            found_merged_zone = True
+
+                if found_merged_zone:
+                    break
+        finally:
+            pool.shutdown(cancel_futures=True)
 
         self.assertTrue(found_proper_noun, "Should detect at least one PROPER_NOUN zone across all machines")
         self.assertTrue(found_merged_zone, "Should detect a merged zone (Width > 250px)")
@@ -15,6 +15,8 @@ class TestZoneDiscovererNLP(unittest.TestCase):
         # 2. Heuristic (Capitalized Words)
         self.assertEqual(ZoneDiscoverer._classify_text("Hospital A"), "PROPER_NOUN_CANDIDATE")
         self.assertEqual(ZoneDiscoverer._classify_text("Dr. Smith"), "PROPER_NOUN_CANDIDATE")
+        self.assertEqual(ZoneDiscoverer._classify_text("- (Smith) ."), "PROPER_NOUN_CANDIDATE")
+        self.assertEqual(ZoneDiscoverer._classify_text("x.Y A. 3D"), "TEXT")  # Too short / not leading
 
         # 3. Text
         self.assertEqual(ZoneDiscoverer._classify_text("kvp: 120"), "TEXT") # Lowercase
@@ -42,6 +44,48 @@ class TestZoneDiscovererNLP(unittest.TestCase):
         self.assertEqual(result, "PROPER_NOUN")
         mock_model.assert_called_with("John Smith")
 
+    @patch('gantry.discovery.ZoneDiscoverer._nlp_model')
+    @patch('gantry.discovery.ZoneDiscoverer._nlp_model_failed', False)
+    def test_classify_texts_batches_nlp(self, mock_model):
+        def doc(label):
+            ent = MagicMock()
+            ent.label_ = label
+            d = MagicMock()
+            d.ents = [ent] if label else []
+            return d
+
+        mock_model.pipe.return_value = iter([doc("PERSON"), doc(None), doc("ORG")])
+
+        texts = ["John Smith", "Smith^John", "  ", "Hospital A", "acme corp"]
+        result = ZoneDiscoverer.classify_texts(texts)
+
+        self.assertEqual(result, ["PROPER_NOUN", "NAME_PATTERN", "TEXT", "PROPER_NOUN_CANDIDATE", "PROPER_NOUN"])
+        # Only texts not settled by rules reach spaCy, in a single pipe() call
+        mock_model.pipe.assert_called_once()
+        self.assertEqual(list(mock_model.pipe.call_args.args[0]), ["John Smith", "Hospital A", "acme corp"])
+        mock_model.assert_not_called()
+
+    @patch('gantry.discovery.ZoneDiscoverer._nlp_model')
+    @patch('gantry.discovery.ZoneDiscoverer._nlp_model_failed', False)
+    def test_classify_texts_caches_repeated_text(self, mock_model):
+        person = MagicMock()
+        person.label_ = "PERSON"
+        mock_model.return_value.ents = [person]
+
+        # Repeats within one call reach the model once
+        self.assertEqual(ZoneDiscoverer.classify_texts(["John Smith", " John Smith"]),
+                         ["PROPER_NOUN", "PROPER_NOUN"])
+        mock_model.assert_called_once_with("John Smith")
+
+        # ...and so do repeats in later calls
+        self.assertEqual(ZoneDiscoverer._classify_text("John Smith "), "PROPER_NOUN")
+        mock_model.assert_called_once()
+
+        # Without NLP the cached label no longer applies
+        with patch('gantry.discovery.ZoneDiscoverer._nlp_model', None), \
+                patch('gantry.discovery.ZoneDiscoverer._nlp_model_failed', True):
+            self.assertEqual(ZoneDiscoverer._classify_text("John Smith"), "PROPER_NOUN_CANDIDATE")
+
     def test_group_boxes_asymmetric(self):
         # Box 1: [0, 0, 10, 10] (Right x=10)
         # Box 2: [50, 0, 10, 10] (Left x=50). Gap = 40.
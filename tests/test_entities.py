@@ -1,5 +1,6 @@
 import numpy as np
 import pytest
+import pydicom
 from unittest.mock import patch
 from gantry.entities import Instance, Equipment
 
@@ -53,7 +54,7 @@ def test_lazy_loading(tmp_path):
 
         # Assert
         assert data.shape == (50, 50)
-        mock_read.assert_called_once_with(inst.file_path)
+        mock_read.assert_called_once_with(inst.file_path, defer_size="1 KB")
         # Verify it cached the result
         assert inst.pixel_array is not None
 
@@ -100,4 +101,82 @@ def test_photometric_defaults():
     inst3.set_pixel_data(np.zeros((10, 10, 3)))
     assert inst3.attributes["0028,0004"] == "RGB"
     # Also verify PlanarConfiguration is forced to 0 for RGB
-    assert inst3.attributes["0028,0006"] == 0
\ No newline at end of file
+    assert inst3.attributes["0028,0006"] == 0
+
+def test_entities_are_slotted():
+    """Hierarchy entities carry no per-object __dict__ and survive a pickle round-trip."""
+    import pickle
+    from gantry.entities import Patient, Study, Series
+
+    inst = Instance("1.2.3", "1.2.840.10008.5.1.4.1.1.2", 1)
+    inst.set_attr("0010,0010", "Doe^John")
+    se = Series("SE1", "CT", 1, instances=[inst])
+    st = Study("ST1", "20230101", series=[se])
+    pat = Patient("P1", "Doe^John", studies=[st])
+
+    for obj in (pat, st, se, inst):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.not_a_field = 1
+
+    restored = pickle.loads(pickle.dumps(pat))
+    r_inst = restored.studies[0].series[0].instances[0]
+    assert r_inst.sop_instance_uid == "1.2.3"
+    assert r_inst.attributes["0010,0010"] == "Doe^John"
+    assert r_inst._dirty == inst._dirty
+
+
+def _write_native_dicom(path, arr, bits_stored=None, planar=0):
+    from pydicom.dataset import Dataset, FileMetaDataset
+    from pydicom.uid import ExplicitVRLittleEndian, generate_uid
+
+    ds = Dataset()
+    ds.file_meta = FileMetaDataset()
+    ds.file_meta.TransferSyntaxUID = ExplicitVRLittleEndian
+    ds.file_meta.MediaStorageSOPClassUID = "1.2.840.10008.5.1.4.1.1.7"
+    ds.file_meta.MediaStorageSOPInstanceUID = generate_uid()
+    ds.SOPClassUID = ds.file_meta.MediaStorageSOPClassUID
+    ds.SOPInstanceUID = ds.file_meta.MediaStorageSOPInstanceUID
+
+    frames = arr.shape[0] if arr.ndim == 4 or (arr.ndim == 3 and arr.shape[-1] not in (3, 4)) else 1
+    samples = arr.shape[-1] if arr.ndim == 4 or (arr.ndim == 3 and arr.shape[-1] in (3, 4)) else 1
+    ds.Rows, ds.Columns = arr.shape[-3:-1] if samples > 1 else arr.shape[-2:]
+    ds.SamplesPerPixel = samples
+    if frames > 1:
+        ds.NumberOfFrames = frames
+    if samples > 1:
+        ds.PlanarConfiguration = planar
+    ds.PhotometricInterpretation = "RGB" if samples > 1 else "MONOCHROME2"
+    ds.BitsAllocated = arr.itemsize * 8
+    ds.BitsStored = bits_stored or ds.BitsAllocated
+    ds.HighBit = ds.BitsStored - 1
+    ds.PixelRepresentation = int(arr.dtype.kind == "i")
+    ds.PixelData = arr.tobytes()
+    ds.save_as(path, enforce_file_format=True)
+
+
+@pytest.mark.parametrize("arr, bits_stored, mapped", [
+    (np.arange(64 * 64, dtype=np.uint16).reshape(64, 64), None, True),
+    (np.arange(-2000, 2000, dtype=np.int16).reshape(4, 25, 40), None, True),
+    (np.arange(32 * 32 * 3, dtype=np.uint8).reshape(32, 32, 3) % 251, None, True),
+    (np.arange(64 * 64, dtype=np.uint16).reshape(64, 64) | 0xF000, 12, False),  # Masked by decoder
+])
+def test_lazy_loading_maps_native_pixels(tmp_path, arr, bits_stored, mapped):
+    """Uncompressed pixels are memory-mapped copy-on-write and match pydicom's decoding."""
+    import mmap
+
+    path = str(tmp_path / "native.dcm")
+    _write_native_dicom(path, arr, bits_stored)
+    on_disk = open(path, "rb").read()
+
+    inst = Instance(sop_instance_uid="1.2.3", file_path=path)
+    data = inst.get_pixel_data()
+
+    assert np.array_equal(data, pydicom.dcmread(path).pixel_array)
+    base = data
+    while isinstance(base, np.ndarray):
+        base = base.base
+    assert isinstance(base, mmap.mmap) == mapped
+
+    data[...] = 0  # Redaction-style in-place edit stays in memory
+    assert open(path, "rb").read() == on_disk
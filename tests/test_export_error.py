@@ -49,3 +49,28 @@ def test_export_command_set_error(tmp_path):
     assert len(files) == 1
     # Instance Number is 1 -> 0001.dcm
     assert files[0].name == "0001.dcm"
+
+def test_export_failure_leaves_no_partial_file(tmp_path):
+    """A dataset that fails to serialize must not leave a file behind."""
+    import numpy as np
+    from unittest.mock import patch
+    from pydicom.dataset import Dataset
+    from gantry.io_handlers import ExportContext, _export_instance_worker
+
+    inst = Instance("I1", "1.2.840.10008.5.1.4.1.1.7", 1)
+    inst.set_pixel_data(np.zeros((4, 4), dtype=np.uint8))
+    out_path = tmp_path / "export" / "P1" / "I1.dcm"
+    ctx = ExportContext(instance=inst, output_path=str(out_path), patient_attributes={},
+                        study_attributes={}, series_attributes={})
+
+    def fail_midway(self, fp, *args, **kwargs):
+        with open(fp, "wb") as f:
+            f.write(b"\x00" * 128)  # Partial preamble, then an encoding error
+        raise ValueError("cannot encode element")
+
+    with patch("gantry.validation.IODValidator.validate", return_value=[]), \
+         patch.object(Dataset, "save_as", fail_midway):
+        result = _export_instance_worker(ctx)
+
+    assert isinstance(result, ValueError)
+    assert [p for p in (tmp_path / "export").rglob("*") if p.is_file()] == []
@@ -14,15 +14,7 @@ def session(tmp_path):
     os.environ["GANTRY_FORCE_THREADS"] = "1"
 
     # Setup session with temp DB directory
-    sess = DicomSession()
-    db_path = tmp_path / "test_gantry.db"
-    sess.persistence_manager.db_path = str(db_path)
-    # Re-init store backend on session AND persistence manager
-    new_store = SqliteStore(str(db_path))
-    sess.persistence_manager.store_backend = new_store
-    sess.store_backend = new_store
-    # Clear in-memory store
-    sess.store.patients = []
+    sess = DicomSession(str(tmp_path / "test_gantry.db"))
     return sess
 
 @pytest.mark.parametrize("use_file_db", [True, False])
@@ -174,8 +166,7 @@ def test_export_parquet(session, tmp_path):
     se.instances.append(inst)
 
     session.store.patients.append(p)
-    session.save()
-    session.persistence_manager.flush()
+    session.save(sync=True)
 
     # 2. Export
     out_file = tmp_path / "data.parquet"
@@ -123,10 +123,7 @@ class TestNewFeatures(unittest.TestCase):
             # 2. Init Session
             # We use a file-based DB to trigger potential persistence logic,
             # though auto-key logic is in __init__
-            if os.path.exists("test_auto_key.db"):
-                os.remove("test_auto_key.db")
-
-            s = DicomSession("test_auto_key.db")
+            s = DicomSession(os.path.join(self.test_dir, "test_auto_key.db"))
 
             # 3. Verify Reversibility Service is active
             self.assertIsNotNone(s.reversibility_service)
@@ -148,8 +145,5 @@ class TestNewFeatures(unittest.TestCase):
             elif os.path.exists(key_path):
                 os.remove(key_path)
 
-            if os.path.exists("test_auto_key.db"):
-                os.remove("test_auto_key.db")
-
 if __name__ == "__main__":
     unittest.main()
@@ -31,9 +31,10 @@ def test_reproduce_no_pixel_data_crash(tmp_path):
 
     # 2. Ingest
     session = DicomSession(":memory:")
-    session.ingest(str(tmp_path))
+    n_ingested = session.ingest(str(tmp_path))
 
     assert len(session.store.patients) == 1
+    assert n_ingested == 1
 
     # 3. Export - Should NOT Crash
     export_dir = tmp_path / "export"
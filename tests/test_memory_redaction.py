@@ -6,25 +6,16 @@ import numpy as np
 from gantry.session import DicomSession
 from gantry.entities import Instance, Patient, Study, Series, Equipment
 
-TEST_DB = "test_memory_redaction.db"
-
 @pytest.fixture
-def clean_env():
-    if os.path.exists(TEST_DB): os.remove(TEST_DB)
-    sidecar = TEST_DB.replace(".db", "_pixels.bin")
-    if os.path.exists(sidecar): os.remove(sidecar)
-
-    yield
-
-    if os.path.exists(TEST_DB): os.remove(TEST_DB)
-    if os.path.exists(sidecar): os.remove(sidecar)
+def db_path(tmp_path):
+    return str(tmp_path / "test_memory_redaction.db")
 
-def test_redaction_memory_swap(clean_env):
+def test_redaction_memory_swap(db_path):
     """
     Verifies that redaction immediately offloads modified pixels to the sidecar,
     allowing pixel_array to be cleared from memory (None).
     """
-    sess = DicomSession(TEST_DB)
+    sess = DicomSession(db_path)
 
     # 1. Create a simulated patient with 10 instances
     # Each instance has 100x100 pixels
@@ -100,6 +100,61 @@ def test_incremental_delete(store):
     patients = store.load_all()
     assert len(patients[0].studies[0].series[0].instances) == 2
 
+def test_batched_save_multiple_patients(store):
+    """Many patients in one save_all: every level lands and deletions stay scoped per series."""
+    patients = [create_mock_patient(f"P{n}", f"S{n}", f"SE{n}", count=3) for n in range(20)]
+    store.save_all(patients)
+
+    # Drop one instance from a single series only
+    patients[7].studies[0].series[0].instances.pop()
+    store.save_all(patients)
+
+    loaded = {p.patient_id: p for p in store.load_all()}
+    assert len(loaded) == 20
+    counts = {pid: len(p.studies[0].series[0].instances) for pid, p in loaded.items()}
+    assert counts.pop("P7") == 2
+    assert set(counts.values()) == {3}
+
 def test_persistence_resiliency(store):
     """Ensure partial saves don't corrupt DB (transaction test implicitly via sqlite)"""
     pass
+
+def test_connection_pragmas(tmp_path):
+    """Per-connection PRAGMAs are applied on every connection; durable selects FULL sync."""
+    fast = SqliteStore(str(tmp_path / "fast.db"))
+    with fast._get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    fast.stop()
+
+    durable = SqliteStore(str(tmp_path / "durable.db"), durable=True)
+    with durable._get_connection() as conn:
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+    durable.stop()
+
+def test_connection_reused_per_thread(store):
+    """File-backed stores pool one connection per thread; nested use gets its own."""
+    with store._get_connection() as outer:
+        with store._get_connection() as inner:
+            assert inner is not outer
+    with store._get_connection() as again:
+        assert again is outer
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parallel_prepare_preserves_rows(store, monkeypatch, workers):
+    """Instance rows prepared on the thread pool land in order with their own pixels."""
+    monkeypatch.setattr("gantry.persistence._PREPARE_MAX_WORKERS", workers)
+    monkeypatch.setattr("gantry.persistence._PREPARE_PARALLEL_MIN", 1)
+
+    p = create_mock_patient(count=12)
+    for i, inst in enumerate(p.studies[0].series[0].instances):
+        inst.set_pixel_data(np.full((32, 32), i, dtype=np.uint8))
+    store.save_all([p])
+
+    assert not any(inst._dirty for inst in p.studies[0].series[0].instances)
+    loaded = store.load_patient("P1").studies[0].series[0].instances
+    by_uid = {inst.sop_instance_uid: inst for inst in loaded}
+    assert len(by_uid) == 12
+    for i in range(12):
+        assert (by_uid[f"SE1.{i}"].get_pixel_data() == i).all()
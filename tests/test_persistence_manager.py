@@ -2,6 +2,7 @@
 Tests for the PersistenceManager class.
 """
 import time
+import threading
 import os
 import pytest
 from gantry.persistence_manager import PersistenceManager
@@ -117,3 +118,75 @@ def test_flush_recover_from_crash(pm):
     assert len(pm.store_backend.saved_patients) == 1
     assert pm.store_backend.saved_patients[0].patient_id == "P_CRASH"
 
+
+def test_coalesces_queued_saves(pm):
+    """Snapshots queued while a save is in flight are merged into one save_all call."""
+    gate = threading.Event()
+    calls = []
+    original = pm.store_backend.save_all
+
+    def slow_save(patients):
+        calls.append(len(patients))
+        gate.wait(timeout=5)
+        original(patients)
+
+    pm.store_backend.save_all = slow_save
+
+    shared = Patient("P0", "Shared")
+    pm.save_async([shared])
+    while not calls:
+        time.sleep(0.01)
+
+    # Worker is blocked in the first save; queue up more snapshots
+    for i in range(1, 5):
+        pm.save_async([shared, Patient(f"P{i}", "Queued")])
+
+    gate.set()
+    pm.flush()
+
+    assert calls == [1, 5]
+    ids = [p.patient_id for p in pm.store_backend.saved_patients]
+    assert sorted(ids) == ["P0", "P0", "P1", "P2", "P3", "P4"]
+
+
+def test_flush_bulk_saves_backlog_in_one_call(pm):
+    """flush_bulk() drains the queue on the calling thread into a single save_all."""
+    pm.shutdown()
+
+    calls = []
+    original = pm.store_backend.save_all
+
+    def counting_save(patients):
+        calls.append(len(patients))
+        original(patients)
+
+    pm.store_backend.save_all = counting_save
+
+    shared = Patient("P0", "Shared")
+    for i in range(1, 5):
+        pm.queue.put([shared, Patient(f"P{i}", "Queued")])
+
+    pm.flush_bulk()
+
+    assert calls == [5]
+    assert pm.queue.empty()
+    assert not pm.thread.is_alive()  # Nothing was left for a worker to do
+
+
+def test_save_sync_commits_after_queued_saves(pm):
+    """save_sync() drains earlier async snapshots, then saves on the calling thread."""
+    saver_threads = []
+    original = pm.store_backend.save_all
+
+    def recording_save(patients):
+        saver_threads.append(threading.current_thread())
+        original(patients)
+
+    pm.store_backend.save_all = recording_save
+
+    pm.save_async([Patient("P1", "Queued")])
+    pm.save_sync([Patient("P2", "Direct")])
+
+    ids = [p.patient_id for p in pm.store_backend.saved_patients]
+    assert ids == ["P1", "P2"]
+    assert saver_threads[-1] is threading.current_thread()
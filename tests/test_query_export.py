@@ -61,8 +61,7 @@ def session_for_query(tmp_path, monkeypatch):
     # Ingest them
     session.ingest(str(tmp_path))
 
-    session.save()
-    session.persistence_manager.flush()
+    session.save(sync=True)
 
     # Attach UIDs to session for tests to access
     session.test_uids = uids
@@ -94,7 +93,7 @@ def test_export_dataframe_subset(session_for_query, tmp_path):
     mr_uid = session_for_query.test_uids['MR']
 
     # Get DF, filter for MR
-    df = session_for_query.export_dataframe(expand_metadata=True)
+    df = session_for_query.export_dataframe(str(tmp_path / "export_metadata.csv"), expand_metadata=True)
     subset_df = df[df['Modality'] == 'MR']
 
     session_for_query.export(str(out_dir), subset=subset_df, show_progress=False)
@@ -5,15 +5,14 @@ from gantry.session import DicomSession
 from gantry.services import RedactionService
 from gantry.entities import Instance, Patient, Study, Series
 
-def test_redaction_result_application_logic():
+def test_redaction_result_application_logic(tmp_path):
     """
     Regression Test for UID Mismatch Bug.
     Verifies that RedactionService results can be correctly applied to instances
     even if the Worker thread/process changes the SOP Instance UID (regenerate_uid).
     """
     # Setup
-    db_path = "debug_redact_test.db"
-    if os.path.exists(db_path): os.remove(db_path)
+    db_path = str(tmp_path / "debug_redact_test.db")
     session = DicomSession(db_path)
 
     try:
@@ -52,7 +51,9 @@ def test_redaction_result_application_logic():
 
     finally:
         session.close()
-        if os.path.exists(db_path): os.remove(db_path)
 
 if __name__ == "__main__":
-    test_redaction_result_application_logic()
+    import pathlib
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_redaction_result_application_logic(pathlib.Path(tmp))
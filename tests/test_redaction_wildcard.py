@@ -2,6 +2,7 @@
 import unittest
 import os
 import shutil
+import tempfile
 import pydicom
 import numpy as np
 from pydicom.dataset import Dataset, FileDataset
@@ -14,14 +15,11 @@ print(f"DEBUG: gantry loaded from: {gantry.__file__}")
 
 class TestWildcardRedaction(unittest.TestCase):
     def setUp(self):
-        self.test_dir = "test_data_wildcard"
-        self.output_dir = "test_output_wildcard"
-        self.db_path = "test_wildcard.db"
-
-        # Clean up
-        if os.path.exists(self.test_dir): shutil.rmtree(self.test_dir)
-        if os.path.exists(self.output_dir): shutil.rmtree(self.output_dir)
-        if os.path.exists(self.db_path): os.remove(self.db_path)
+        self.tmp_dir = tempfile.mkdtemp()
+        self.test_dir = os.path.join(self.tmp_dir, "test_data_wildcard")
+        self.output_dir = os.path.join(self.tmp_dir, "test_output_wildcard")
+        self.db_path = os.path.join(self.tmp_dir, "test_wildcard.db")
+        self.config_path = os.path.join(self.tmp_dir, "test_wildcard.yaml")
 
         os.makedirs(self.test_dir)
 
@@ -36,11 +34,7 @@ class TestWildcardRedaction(unittest.TestCase):
 
     def tearDown(self):
         self.sess.close()
-        if os.path.exists(self.test_dir): shutil.rmtree(self.test_dir)
-        if os.path.exists(self.output_dir): shutil.rmtree(self.output_dir)
-        if os.path.exists(self.db_path): os.remove(self.db_path)
-        # Cleanup potential temp files
-        if os.path.exists("test_wildcard.yaml"): os.remove("test_wildcard.yaml")
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
 
     def create_dummy_dicom(self, folder, filename, serial_number):
         ds = Dataset()
@@ -85,7 +79,7 @@ machines:
     redaction_zones:
       - [0, 5, 0, 5]
 """
-        with open("test_wildcard.yaml", "w") as f:
+        with open(self.config_path, "w") as f:
             f.write(config_content)
 
         # Verify Store Content
@@ -99,7 +93,7 @@ machines:
                     print(f"      Series: {se.series_instance_uid} (SN: {sn}) - Instances: {len(se.instances)}")
 
         # 2. Load and Apply
-        self.sess.load_config("test_wildcard.yaml")
+        self.sess.load_config(self.config_path)
         self.sess.redact()
         self.sess.save(sync=True)
 
@@ -9,16 +9,9 @@ TEST_DB = "test_reporting.db"
 REPORT_FILE = "test_report.md"
 
 @pytest.fixture
-def clean_env():
-    if os.path.exists(TEST_DB):
-        os.remove(TEST_DB)
-    if os.path.exists(REPORT_FILE):
-        os.remove(REPORT_FILE)
-    yield
-    if os.path.exists(TEST_DB):
-        os.remove(TEST_DB)
-    if os.path.exists(REPORT_FILE):
-        os.remove(REPORT_FILE)
+def clean_env(tmp_path, monkeypatch):
+    """Runs the test from tmp_path, so the DB, its WAL files and the report land there."""
+    monkeypatch.chdir(tmp_path)
 
 def test_compliance_reporting_flow(clean_env):
     # 1. Init Session
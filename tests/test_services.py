@@ -23,6 +23,8 @@ def test_redaction_service(dummy_patient):
 
     # Original pixel check (top left is 0)
     inst = store.patients[0].studies[0].series[0].instances[0]
+    # The fixture array is shared and read-only; take a private copy
+    inst.pixel_array = inst.pixel_array.copy()
     # Set a value to verify it gets cleared
     inst.pixel_array[20, 20] = 500
 
@@ -2,6 +2,7 @@ import unittest
 import concurrent.futures
 from unittest.mock import MagicMock, patch
 from gantry.session import DicomSession
+from gantry.entities import Patient, Study, Series, Instance
 from gantry.parallel import run_parallel
 import time
 import os
@@ -32,6 +33,7 @@ class TestSharedExecutorLifecycle(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             executor.submit(sum, [1, 2])
 
+    @patch('gantry.io_handlers._SERIAL_INGEST_MAX', 0)  # Small imports skip the pool
     @patch('gantry.io_handlers.run_parallel')
     @patch('os.path.isfile')
     @patch('os.path.isdir')
@@ -56,6 +58,21 @@ class TestSharedExecutorLifecycle(unittest.TestCase):
         self.assertIn('executor', kwargs)
         self.assertEqual(kwargs['executor'], self.session._executor)
 
+    @patch('gantry.io_handlers.run_parallel')
+    @patch('gantry.io_handlers.ingest_worker')
+    @patch('os.path.isfile')
+    @patch('os.path.isdir')
+    def test_small_ingest_parses_inline(self, mock_isdir, mock_isfile, mock_worker, mock_run_parallel):
+        """Imports below the serial threshold are parsed in-process, without the pool."""
+        mock_isfile.return_value = True
+        mock_isdir.return_value = False
+        mock_worker.return_value = (None, None, None, None, None, "not dicom")
+
+        self.session.ingest("dummy_file.dcm")
+
+        mock_worker.assert_called_once_with("dummy_file.dcm")
+        self.assertFalse(mock_run_parallel.called)
+
     @patch('gantry.io_handlers.run_parallel')
     @patch('gantry.session.DicomSession.save')
     def test_export_uses_executor(self, mock_save, mock_run_parallel):
@@ -65,18 +82,11 @@ class TestSharedExecutorLifecycle(unittest.TestCase):
         mock_run_parallel.return_value = []
 
         # Construct Object Graph to make total_instances > 0
-        p = MagicMock()
-        p.patient_id = "P1"
-        st = MagicMock()
-        se = MagicMock()
-        inst = MagicMock()
-        inst.instance_number = 1
-        inst.sop_instance_uid = "1.2.3.4.5"
-
-        # Link them
-        p.studies = [st]
-        st.series = [se]
-        se.instances = [inst]
+        # (real entities rather than a MagicMock tree: cheaper, and typos fail loudly)
+        inst = Instance("1.2.3.4.5", "1.2.840.10008.5.1.4.1.1.7", 1)
+        se = Series("SE1", "OT", 1, instances=[inst])
+        st = Study("ST1", None, series=[se])
+        p = Patient("P1", "Test", studies=[st])
 
         # Add to store
         self.session.store.patients.append(p)
@@ -107,6 +117,7 @@ class TestSharedExecutorLifecycle(unittest.TestCase):
             passed_executor = kwargs.get('executor')
             self.assertNotEqual(passed_executor, self.session._executor)
 
+    @patch('gantry.io_handlers._SERIAL_INGEST_MAX', 0)
     @patch('gantry.io_handlers.run_parallel')
     @patch('os.path.isfile')
     def test_consistency_across_calls(self, mock_isfile, mock_run):
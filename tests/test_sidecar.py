@@ -52,6 +52,21 @@ def test_sidecar_manager_basics(clean_env):
     out2 = mgr.read_frame(off2, len2, compression='zlib')
     assert out2 == data2
 
+def test_sidecar_deferred_sync(clean_env, monkeypatch):
+    """Frames written with sync=False are readable at once and fsynced together by sync()."""
+    mgr = SidecarManager(TEST_PIXELS)
+    calls = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (calls.append(fd), real_fsync(fd)))
+
+    offsets = [mgr.write_frame(bytes([i]) * 100, sync=False) for i in range(5)]
+    assert calls == []
+    assert mgr.read_frame(*offsets[3]) == bytes([3]) * 100
+
+    mgr.sync()
+    mgr.sync()  # Nothing new: no-op
+    assert len(calls) == 1
+
 def test_session_sidecar_persistence(clean_env):
     """Test full integration with DicomSession."""
     session = DicomSession(TEST_DB)
@@ -5,7 +5,7 @@ from pydicom.dataset import Dataset, FileMetaDataset
 from pydicom.sequence import Sequence
 from gantry import Session
 from gantry.entities import Instance
-from gantry.io_handlers import populate_attrs, process_sequence
+from gantry.io_handlers import populate_attrs, process_sequence, _share_tag_keys
 from gantry.privacy import PhiInspector, PhiFinding
 
 def test_sr_recursive_indexing():
@@ -107,3 +107,43 @@ def test_phi_inspector_deep_scan():
     assert f.value == "Patient has history of diabetes."
     assert f.remediation_proposal.new_value == "ANONYMIZED"
     assert f.entity == deep_item # Crucial: Point to deep item, not root instance
+
+def test_populate_attrs_shares_tag_keys():
+    """Instances populated from the same tags share one key string per tag."""
+    ds = Dataset()
+    ds.PatientName = "Test^Patient"
+    ds.add_new((0x0009, 0x10AB), "LO", "private")
+
+    a = Instance("1.2.3", "1.2.840.10008.5.1.4.1.1.7", 1)
+    b = Instance("1.2.4", "1.2.840.10008.5.1.4.1.1.7", 2)
+    populate_attrs(ds, a)
+    populate_attrs(ds, b)
+
+    assert "0009,10ab" in a.attributes
+    key_a = next(k for k in a.attributes if k == "0009,10ab")
+    key_b = next(k for k in b.attributes if k == "0009,10ab")
+    assert key_a is key_b
+
+def test_share_tag_keys_after_pickling():
+    """Instances pickled back from a worker are re-keyed onto the shared strings."""
+    import pickle
+    ds = Dataset()
+    ds.PatientName = "Test^Patient"
+    nested = Dataset()
+    nested.TextValue = "nested"
+    ds.ContentSequence = Sequence([nested])
+
+    local = Instance("1.2.3", "1.2.840.10008.5.1.4.1.1.7", 1)
+    populate_attrs(ds, local)
+    remote = Instance("1.2.4", "1.2.840.10008.5.1.4.1.1.7", 2)
+    populate_attrs(ds, remote)
+    remote = pickle.loads(pickle.dumps(remote))
+
+    def key(d, k):
+        return next(x for x in d if x == k)
+
+    _share_tag_keys(remote)
+    assert key(remote.attributes, "0010,0010") is key(local.attributes, "0010,0010")
+    assert key(remote.sequences, "0040,a730") is key(local.sequences, "0040,a730")
+    nested_attrs = remote.sequences["0040,a730"].items[0].attributes
+    assert key(nested_attrs, "0040,a160") is key(local.sequences["0040,a730"].items[0].attributes, "0040,a160")
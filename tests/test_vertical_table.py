@@ -1,4 +1,6 @@
 import os
+import shutil
+import tempfile
 import unittest
 import threading
 import concurrent.futures
@@ -6,9 +8,8 @@ from gantry.persistence import SqliteStore
 
 class TestVerticalTable(unittest.TestCase):
     def setUp(self):
-        self.db_path = "test_vertical.db"
-        if os.path.exists(self.db_path):
-            os.remove(self.db_path)
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "test_vertical.db")
 
         # Create store
         self.store = SqliteStore(self.db_path)
@@ -27,10 +28,7 @@ class TestVerticalTable(unittest.TestCase):
 
     def tearDown(self):
         self.store.stop() # Stop audit thread
-        if os.path.exists(self.db_path):
-            os.remove(self.db_path)
-        if os.path.exists(self.db_path.replace(".db", "_pixels.bin")):
-            os.remove(self.db_path.replace(".db", "_pixels.bin"))
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
 
     def test_vertical_roundtrip(self):
         """Verify that we can save and load attributes correctly."""
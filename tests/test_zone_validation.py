@@ -36,3 +36,34 @@ def test_zone_validation_flexible_format(tmp_path):
     }
     with pytest.raises(ValueError, match="Invalid zone format"):
         ConfigLoader._validate_rule(invalid_rule, 2)
+
+@pytest.mark.parametrize("n_zones", [4, 100])
+def test_zone_validation_reports_first_bad_zone(n_zones):
+    """
+    The first failing zone (in order) is reported with its reason, whether the
+    value checks run per zone or vectorized for large zone lists.
+    """
+    def rule(zones):
+        return {"serial_number": "SN", "redaction_zones": zones}
+
+    good = [[0, 10, 0, 10]] * n_zones
+    ConfigLoader._validate_rule(rule(good), 0)
+
+    zones = list(good)
+    zones[1] = [0, 10, 20, 10]
+    zones[2] = [-1, 10, 0, 10]
+    with pytest.raises(ValueError, match=r"Zone #1: Invalid ROI logic"):
+        ConfigLoader._validate_rule(rule(zones), 0)
+
+    zones[1] = {"roi": [0, -5, 0, 10]}
+    with pytest.raises(ValueError, match=r"Zone #1: ROI values must be non-negative"):
+        ConfigLoader._validate_rule(rule(zones), 0)
+
+    # A value error before a malformed zone wins; a malformed zone before any value error wins
+    zones[1] = [0, 10, 0, 10]
+    zones[-1] = "bad"
+    with pytest.raises(ValueError, match=r"Zone #2: ROI values must be non-negative"):
+        ConfigLoader._validate_rule(rule(zones), 0)
+    zones[2] = [0, 10, 0, 10]
+    with pytest.raises(ValueError, match=rf"Zone #{n_zones - 1}: Invalid zone format"):
+        ConfigLoader._validate_rule(rule(zones), 0)